@@ -2,4 +2,33 @@
 AI Robot - Local AI Agent for Computer Control
 """
 
+import importlib
+import importlib.util
+import os
+
 __version__ = "2.2.0"
+
+
+def _apply_config_defaults():
+    """
+    Fill settings missing from src/config.py with their config.example.py values
+
+    A config.py copied from an older example keeps working after an upgrade -
+    settings it defines win, new ones get their defaults.
+    """
+    try:
+        config = importlib.import_module("src.config")
+    except ImportError:
+        return  # No config.py yet - copy config.example.py first
+    path = os.path.join(os.path.dirname(__file__), "config.example.py")
+    spec = importlib.util.spec_from_file_location("src._config_example", path)
+    if spec is None or spec.loader is None:
+        return
+    example = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(example)
+    for name, value in vars(example).items():
+        if name.isupper() and not hasattr(config, name):
+            setattr(config, name, value)
+
+
+_apply_config_defaults()
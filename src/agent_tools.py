@@ -1,40 +1,36 @@
 import json
 import os
 import random
+import re
 import subprocess
-import time
 from datetime import datetime
+from typing import Optional
 
-import numpy as np
-import pyautogui
 from langchain.tools import tool
-from scipy.interpolate import splev, splprep
-
-DANGEROUS_COMMANDS = [
-    "rm -rf",
-    "sudo rm",
-    "format",
-    "delete system",
-    "shutdown -h",
-    "mkfs",
-    "dd if=",
-    ":(){:",
-    "fork bomb",
-    "> /dev/sda",
-    "mv /* ",
-    "chmod -r 777 /",
-    "killall",
-    "pkill",
-    "halt",
-    "reboot",
-    "init 0",
-    "init 6",
-    "poweroff",
-]
-
 
-def is_safe(action):
-    return all(danger.lower() not in action.lower() for danger in DANGEROUS_COMMANDS)
+from src import config, motion, verification
+from src.content_search import read_lines, search_files
+from src.element_locator import locator
+from src.file_organizer import organize
+from src.gui_sequence import parse_actions, run_sequence, validate_actions
+from src.input_backend import get_backend
+from src.launcher import launcher
+from src.plan_executor import build_organize_plan, get_plan, register_plan, run_plan
+from src.process_monitor import monitor
+from src.response_format import respond
+from src.safety import check, is_safe
+from src.screen_capture import describe, frame_buffer, save_frame
+from src.screen_wait import settle, wait_for_stable
+from src.text_entry import enter_text, press
+
+# Folder for each group of file extensions: (what the folder is for, extensions)
+FOLDER_CATEGORIES = {
+    "Images": ("image files", [".jpg", ".jpeg", ".png", ".gif"]),
+    "Documents": ("document files", [".pdf", ".doc", ".txt"]),
+    "Videos": ("video files", [".mp4", ".mov", ".avi"]),
+    "Audio": ("audio files", [".mp3", ".wav", ".flac"]),
+    "Archives": ("compressed files", [".zip", ".rar", ".7z"]),
+}
 
 
 @tool
@@ -43,54 +39,26 @@ def move_mouse(x: int, y: int, human_like: bool = True):
     if not is_safe(f"move to {x},{y}"):
         return "Unsafe action blocked."
     try:
-        current_x, current_y = pyautogui.position()
-        if human_like:
-            # Add slight randomness to make it more natural
-            target_x = x + random.uniform(-5, 5)
-            target_y = y + random.uniform(-5, 5)
-
-            # Create more points for smooth curve (need at least 4 for cubic spline)
-            points = np.array(
-                [
-                    [current_x, current_y],
-                    [
-                        current_x + (target_x - current_x) * 0.3 + random.uniform(-30, 30),
-                        current_y + (target_y - current_y) * 0.3 + random.uniform(-20, 20),
-                    ],
-                    [
-                        current_x + (target_x - current_x) * 0.7 + random.uniform(-20, 20),
-                        current_y + (target_y - current_y) * 0.7 + random.uniform(-10, 10),
-                    ],
-                    [target_x, target_y],
-                ]
-            )
-            # Use k=2 (quadratic) for more stability with fewer points
-            tck, u = splprep(points.T, s=0, k=2)
-            u_new = np.linspace(0, 1, 20)
-            path = splev(u_new, tck)
-            for px, py in zip(*path):
-                pyautogui.moveTo(px, py, duration=0.01)
-                time.sleep(random.uniform(0.01, 0.05))
-        else:
-            pyautogui.moveTo(x, y)
+        motion.move(x, y, mode="" if human_like else "fast")
         return f"Mouse moved to ({x}, {y})"
     except Exception as e:
         return f"Error moving mouse: {str(e)}. Try different coordinates or check permissions."
 
 
 @tool
-def click_mouse(button: str = "left"):
-    """Clicks the mouse (left/right/double)."""
+def click_mouse(button: str = "left", wait: bool = False):
+    """Clicks the mouse (left/right/double). wait=True returns once the screen settles."""
     if not is_safe("click"):
         return "Unsafe action blocked."
     try:
-        if button == "left":
-            pyautogui.click()
-        elif button == "right":
-            pyautogui.rightClick()
-        elif button == "double":
-            pyautogui.doubleClick()
-        time.sleep(random.uniform(0.1, 0.3))
+        backend = get_backend()
+        if button == "double":
+            backend.click("left", clicks=2)
+        else:
+            backend.click(button)
+        if wait:
+            return f"Clicked {button} button." + settle(backend=backend)
+        backend.sleep(random.uniform(0.1, 0.3))
         return f"Clicked {button} button."
     except Exception as e:
         return f"Error clicking: {str(e)}. Maybe mouse is in a bad spot?"
@@ -113,14 +81,17 @@ def search_file(filename: str, start_dir: str = os.path.expanduser("~")):
 
 @tool
 def open_app(app_name: str):
-    """Opens an app on Mac."""
+    """Opens an app and waits until it is ready."""
     if not is_safe(app_name):
         return "Unsafe action blocked."
-    try:
-        subprocess.run(["open", "-a", app_name])
-        return f"{app_name} opened."
-    except Exception as e:
-        return f"Error opening app: {str(e)}. Is the app installed?"
+    launch = launcher.open_app(app_name).wait(config.LAUNCH_READY_TIMEOUT_S)
+    if launch.state == "failed":
+        return f"Error opening app: {launch.error}. Is the app installed?"
+    if launch.signal == "already running":
+        return f"{launch.target} was already running - brought to the front."
+    if launch.state != "ready":
+        return f"{launch.target} is still launching - check again with check_running_apps."
+    return f"{launch.target} opened (ready in {launch.ready_s:.1f}s, {launch.signal})."
 
 
 @tool
@@ -128,21 +99,21 @@ def open_url(url: str):
     """Opens a website URL in the default browser."""
     if not is_safe(url):
         return "Unsafe URL blocked."
-    try:
-        subprocess.run(["open", url])  # Mac command to open URLs
-        return f"Opened {url} in browser."
-    except Exception as e:
-        return f"Error opening URL: {str(e)}. Is it a valid web address?"
+    launch = launcher.open_url(url).wait(config.LAUNCH_READY_TIMEOUT_S)
+    if launch.state == "failed":
+        return f"Error opening URL: {launch.error}. Is it a valid web address?"
+    return f"Opened {url} in browser."
 
 
 @tool
 def execute_terminal_command(command: str):
-    """Executes any terminal command that is safe (not in DANGEROUS_COMMANDS list).
+    """Executes any terminal command that is safe (checked by the safety matcher).
     Use this for any task like creating folders, listing files, running scripts, etc.
     Examples: 'mkdir new_folder', 'ls -la', 'pwd', 'cat file.txt', 'python script.py'
     """
-    if not is_safe(command):
-        return f"🚫 Unsafe command blocked: {command}. Contains dangerous keywords."
+    reason = check(command, "command")
+    if reason:
+        return f"🚫 Unsafe command blocked ({reason}): {command}"
     try:
         result = subprocess.run(
             command,
@@ -167,79 +138,148 @@ def execute_terminal_command(command: str):
 
 
 @tool
-def take_screenshot(filename: str = "debug_screenshot.png"):
+def take_screenshot(region: str = "", save: bool = False, filename: str = ""):
     """Takes a screenshot for debugging. Useful to verify UI state or check what's on screen.
-    Returns the path where screenshot was saved."""
+    region: "x,y,width,height" (default: whole screen). save=True also writes it to disk."""
     try:
-        screenshot = pyautogui.screenshot()
-        filepath = os.path.join(os.path.expanduser("~"), "Desktop", filename)
-        screenshot.save(filepath)
-        return f"📸 Screenshot saved to: {filepath}"
+        frame = frame_buffer.capture(region)
+        summary = f"📸 Frame #{frame['number']}: {describe(frame)}"
+        if not save:
+            return summary
+        return f"{summary}\n💾 Saved to: {save_frame(frame, filename)}"
     except Exception as e:
         return f"❌ Failed to take screenshot: {str(e)}"
 
 
+@tool
+def wait_for_screen_stable(region: str = "", timeout: float = 5.0):
+    """Waits until the screen (or region "x,y,width,height") stops changing, up to timeout seconds."""
+    try:
+        result = wait_for_stable(region, timeout=timeout)
+        state = "stable" if result["stable"] else "still changing"
+        return f"⏳ Screen {state} after {result['waited_s']:.2f}s ({result['samples']} samples)"
+    except Exception as e:
+        return f"❌ Error watching the screen: {str(e)}"
+
+
+@tool
+def locate_on_screen(targets: str, region: str = ""):
+    """Finds UI images (comma-separated template names/paths) on screen; returns click points.
+    region: "x,y,width,height"."""
+    names = [name.strip() for name in targets.split(",") if name.strip()]
+    if not names:
+        return f"🎯 Registered templates: {', '.join(locator.names()) or 'none'}"
+    try:
+        results = locator.locate(names, region or None)
+    except Exception as e:
+        return f"❌ Error locating on screen: {str(e)}"
+    lines = []
+    for name in names:
+        found = results[name]
+        if found.get("error"):
+            lines.append(
+                f"❔ {name}: {found['error']} (known: {', '.join(locator.names()) or 'none'})"
+            )
+        elif found["found"]:
+            lines.append(f"🎯 {name} at ({found['x']}, {found['y']}) score {found['score']:.2f}")
+        else:
+            lines.append(f"❔ {name} not found (best score {found['score']:.2f})")
+    return "\n".join(lines) + f"\n⏱️ {results['_elapsed_ms']:.0f} ms"
+
+
 @tool
 def get_screen_info():
     """Gets screen dimensions and current mouse position. Useful for planning mouse movements."""
     try:
-        screen_width, screen_height = pyautogui.size()
-        mouse_x, mouse_y = pyautogui.position()
+        screen_width, screen_height = get_backend().size()
+        mouse_x, mouse_y = get_backend().position()
         return f"🖥️ Screen: {screen_width}x{screen_height} | Mouse position: ({mouse_x}, {mouse_y})"
     except Exception as e:
         return f"❌ Error getting screen info: {str(e)}"
 
 
 @tool
-def check_running_apps():
-    """Lists currently running applications. Useful to verify if an app is already open before trying to open it."""
+def check_running_apps(changes_only: bool = False):
+    """Lists currently running applications. Useful to verify if an app is already open before trying to open it.
+    changes_only=True: only apps started/exited since the last check."""
     try:
-        result = subprocess.run(
-            "ps aux | grep -i '.app/Contents/MacOS' | grep -v grep | awk '{print $11}' | sed 's|.*/||' | sort -u",
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        apps = result.stdout.strip()
+        if changes_only:
+            diff = monitor.changes()
+            if not diff["started"] and not diff["exited"]:
+                return (
+                    f"🔍 No apps started or exited since the last check ({diff['running']} running)"
+                )
+            lines = [f"▶️ Started: {name}" for name in diff["started"]]
+            lines += [f"⏹️ Exited: {name}" for name in diff["exited"]]
+            return "🔍 Since the last check:\n" + "\n".join(lines)
+        apps = monitor.apps()
+        monitor.changes()  # The next changes_only call compares against this list
         if apps:
-            return f"🔍 Running apps:\n{apps}"
-        else:
-            return "No apps detected or error reading process list."
+            return f"🔍 Running apps ({len(apps)}):\n" + "\n".join(sorted(apps, key=str.lower))
+        return "No apps detected."
     except Exception as e:
         return f"❌ Error checking apps: {str(e)}"
 
 
 @tool
-def type_text(text: str, interval: float = 0.05):
+def type_text(text: str, interval: Optional[float] = None):
     """Types text at current cursor position. Useful for filling forms, writing documents, etc.
-    interval: time between each keystroke (default 0.05s)."""
+    Long text is pasted in one go. interval: time between each keystroke."""
     if not is_safe(text):
         return "🚫 Unsafe text blocked."
     try:
-        pyautogui.write(text, interval=interval)
-        return f"⌨️ Typed: '{text[:50]}{'...' if len(text) > 50 else ''}'"
+        result = enter_text(text, interval=interval)
+        verb = "Pasted" if result["method"] == "paste" else "Typed"
+        return f"⌨️ {verb}: '{text[:50]}{'...' if len(text) > 50 else ''}' ({len(text)} chars)"
     except Exception as e:
         return f"❌ Error typing text: {str(e)}"
 
 
 @tool
-def press_key(key: str, times: int = 1):
-    """Presses a keyboard key. Examples: 'enter', 'tab', 'escape', 'backspace', 'command', 'space'.
-    Can press multiple times. Useful for keyboard shortcuts and navigation."""
+def press_key(key: str, times: int = 1, wait: bool = False):
+    """Presses a key or shortcut chord. Examples: 'enter', 'tab', 'escape', 'cmd+c', 'cmd+shift+4'.
+    Can press multiple times. Useful for keyboard shortcuts and navigation.
+    wait=True returns once the screen settles."""
     if not is_safe(key):
         return "🚫 Unsafe key blocked."
     try:
-        for _ in range(times):
-            pyautogui.press(key)
-            time.sleep(0.1)
-        return f"⌨️ Pressed '{key}' {times} time(s)"
+        keys = press(key, times)
+        return f"⌨️ Pressed '{'+'.join(keys)}' {times} time(s)." + (settle() if wait else "")
     except Exception as e:
         return (
             f"❌ Error pressing key: {str(e)}. Valid keys: enter, tab, escape, space, command, etc."
         )
 
 
+@tool
+def gui_sequence(actions: str):
+    """Run several mouse/keyboard actions in ONE call.
+
+    Args:
+        actions: JSON list: {"action": "click", "x": 640, "y": 400},
+            {"action": "type", "text": "hi"}, {"action": "key", "key": "enter"},
+            {"action": "hotkey", "keys": ["command", "s"]}, {"action": "wait", "seconds": 1}
+    """
+    try:
+        steps = parse_actions(actions)
+    except ValueError as e:
+        return f"❌ {e}"
+    problem = validate_actions(steps, is_safe)
+    if problem:
+        icon = "🚫" if "unsafe" in problem else "❌"
+        return f"{icon} GUI sequence not run: {problem}"
+
+    result = run_sequence(steps)
+    done = " → ".join(result["completed"]) or "nothing"
+    if result["failed"]:
+        failed = result["failed"]
+        return (
+            f"❌ GUI sequence stopped at action {failed['index']} ({failed['action']}): "
+            f"{failed['error']}\n   Completed {len(result['completed'])}/{len(steps)}: {done}"
+        )
+    return f"🖱️ Ran {len(steps)} GUI actions in {result['elapsed_s']}s: {done}"
+
+
 @tool
 def get_current_directory():
     """Gets the current working directory. Useful for file operations and understanding context."""
@@ -257,17 +297,34 @@ def read_file_content(filepath: str, max_lines: int = 50):
     if not is_safe(filepath):
         return "🚫 Unsafe file path blocked."
     try:
-        with open(os.path.expanduser(filepath)) as f:
-            lines = f.readlines()[:max_lines]
-            content = "".join(lines)
-            truncated = " (truncated)" if len(f.readlines()) > max_lines else ""
-            return f"📄 Content of {filepath}{truncated}:\n{content}"
+        lines, more = read_lines(os.path.expanduser(filepath), max_lines)
+        truncated = " (truncated)" if more else ""
+        return f"📄 Content of {filepath}{truncated}:\n{''.join(lines)}"
     except FileNotFoundError:
         return f"❌ File not found: {filepath}"
     except Exception as e:
         return f"❌ Error reading file: {str(e)}"
 
 
+@tool
+def search_content(query: str, directory: str = "~", regex: bool = False, max_matches: int = 30):
+    """Finds text inside files (use instead of grep); skips binaries. Returns path:line: snippet."""
+    if not is_safe(directory):
+        return "🚫 Unsafe path blocked."
+    try:
+        result = search_files(directory, query, regex=regex, max_matches=max(1, max_matches))
+    except re.error as e:
+        return f"❌ Invalid regex: {e}"
+    except NotADirectoryError:
+        return f"❌ Directory not found: {directory}"
+    matches = result["matches"]
+    if not matches:
+        return f"🔎 No matches for '{query}' in {directory} ({result['files_scanned']} files)."
+    capped = " (max_matches reached)" if result["truncated"] else ""
+    lines = [f"{match['path']}:{match['line']}: {match['snippet']}" for match in matches]
+    return f"🔎 {len(matches)} matches in {directory}{capped}:\n" + "\n".join(lines)
+
+
 @tool
 def list_directory(directory_path: str):
     """Lists all files and folders in a directory with details (size, type, name).
@@ -280,6 +337,7 @@ def list_directory(directory_path: str):
         path = os.path.expanduser(directory_path)
         if not os.path.exists(path):
             return f"❌ Directory not found: {directory_path}"
+        verification.remember(path)  # "Before" snapshot for verify_expectations
 
         items = []
         file_types = {}  # Track what file types exist
@@ -313,8 +371,67 @@ def list_directory(directory_path: str):
         return f"❌ Error listing directory: {str(e)}"
 
 
+def _directory_extensions(directory_path: str) -> list:
+    """Extensions of the files directly inside a directory"""
+    try:
+        with os.scandir(os.path.expanduser(directory_path)) as entries:
+            return sorted(
+                {
+                    os.path.splitext(entry.name)[1].lower()
+                    for entry in entries
+                    if entry.is_file() and os.path.splitext(entry.name)[1]
+                }
+            )
+    except OSError:
+        return []
+
+
 @tool
-def plan_task(task_description: str, observations: str = ""):
+def organize_directory(directory_path: str, dry_run: bool = False):
+    """Sorts a directory's files into category folders (Images, Documents, Videos, Audio,
+    Archives) by extension in ONE call, never overwriting. dry_run=True previews the moves."""
+    if not is_safe(directory_path):
+        return "🚫 Unsafe path blocked."
+    if not os.path.isdir(os.path.expanduser(directory_path)):
+        return f"❌ Directory not found: {directory_path}"
+    try:
+        verification.remember(directory_path)
+        manifest = organize(directory_path, FOLDER_CATEGORIES, dry_run=dry_run)
+    except PermissionError:
+        return f"❌ Permission denied: {directory_path}"
+    except Exception as e:
+        return f"❌ Error organizing directory: {str(e)}"
+
+    verb = "Would move" if dry_run else "Moved"
+    total = sum(manifest["moved"].values())
+    report = f"🗂️ {verb} {total} files in {directory_path} ({manifest['elapsed_s']}s):\n"
+    for folder, count in manifest["moved"].items():
+        new = " (new folder)" if folder in manifest["created"] else ""
+        examples = ", ".join(manifest["samples"][folder])
+        report += f"   → {folder}/{new}: {count} files (e.g. {examples})\n"
+    for name, target in list(manifest["renamed"].items())[:10]:
+        report += f"   ✏️ {name} → {target} (name taken)\n"
+    if manifest["unmatched"]:
+        left = ", ".join(f"{count} {ext}" for ext, count in manifest["unmatched"].items())
+        report += f"   ⏭️ Left in place (no category): {left}\n"
+    for name, reason in list(manifest["errors"].items())[:10]:
+        report += f"   ❌ {name}: {reason}\n"
+    if not total and not manifest["errors"]:
+        report = f"📂 Nothing to organize in {directory_path}\n"
+
+    data = {
+        "dry_run": dry_run,
+        "moved": manifest["moved"],
+        "created": manifest["created"],
+        "renamed": len(manifest["renamed"]),
+        "unmatched": manifest["unmatched"],
+        "errors": dict(list(manifest["errors"].items())[:10]),
+    }
+    return respond(data, report.rstrip())
+
+
+@tool
+def plan_task(task_description: str, observations: str = "", directory: str = ""):
     """Create a smart plan BEFORE taking action. Use this to think through your approach.
 
     This tool helps you:
@@ -326,6 +443,7 @@ def plan_task(task_description: str, observations: str = ""):
     Args:
         task_description: What the user asked you to do
         observations: What you've learned so far (e.g., "Desktop has 3 JPGs, 2 PDFs")
+        directory: Folder being organized - adds a plan_id for execute_plan()
 
     Returns: A structured plan with reasoning
 
@@ -335,6 +453,42 @@ def plan_task(task_description: str, observations: str = ""):
             "Desktop has: 3 .jpg files, 2 .pdf files, 1 .mp4 file"
         )
     """
+    runnable = {}
+    seen = observations.lower()
+    if directory and is_safe(directory):
+        verification.remember(directory)
+        present = _directory_extensions(directory)
+        runnable = build_organize_plan(directory, present, FOLDER_CATEGORIES)
+        seen += " " + " ".join(present)
+
+    if observations:
+        # Suggest folder categories only for file types that were observed
+        folders = [
+            name
+            for name, (_, extensions) in FOLDER_CATEGORIES.items()
+            if any(ext in seen for ext in extensions)
+        ]
+        data: dict = {
+            "task": task_description,
+            "observations": observations,
+            "create_folders": folders,
+            "rules": [
+                "only create folders for file types that exist",
+                "no empty folders",
+                "group similar types",
+            ],
+        }
+    else:
+        folders = []
+        data = {
+            "task": task_description,
+            "observations": None,
+            "next_steps": [
+                "list_directory() to see what files exist",
+                "plan_task() again with observations",
+            ],
+        }
+
     plan = f"""
 🎯 TASK PLANNING ANALYSIS
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -348,24 +502,14 @@ def plan_task(task_description: str, observations: str = ""):
 """
 
     if observations:
-        # Parse what file types exist
         plan += "\n   Based on what I see, I should:\n"
         plan += "   1. Only create folders for file types that ACTUALLY exist\n"
         plan += "   2. Don't create empty folders that won't be used\n"
         plan += "   3. Group similar file types logically\n"
         plan += "\n   Recommended actions:\n"
 
-        # Suggest folder categories based on common patterns
-        if any(ext in observations.lower() for ext in [".jpg", ".jpeg", ".png", ".gif"]):
-            plan += "   → Create 'Images' folder (for image files)\n"
-        if any(ext in observations.lower() for ext in [".pdf", ".doc", ".txt"]):
-            plan += "   → Create 'Documents' folder (for document files)\n"
-        if any(ext in observations.lower() for ext in [".mp4", ".mov", ".avi"]):
-            plan += "   → Create 'Videos' folder (for video files)\n"
-        if any(ext in observations.lower() for ext in [".mp3", ".wav", ".flac"]):
-            plan += "   → Create 'Audio' folder (for audio files)\n"
-        if any(ext in observations.lower() for ext in [".zip", ".rar", ".7z"]):
-            plan += "   → Create 'Archives' folder (for compressed files)\n"
+        for name in folders:
+            plan += f"   → Create '{name}' folder (for {FOLDER_CATEGORIES[name][0]})\n"
 
         plan += "\n   ⚠️  DON'T create folders for file types that don't exist!\n"
     else:
@@ -376,13 +520,80 @@ def plan_task(task_description: str, observations: str = ""):
         plan += "   → Call plan_task() again with observations\n"
         plan += "   → Decide which folders are actually needed\n"
 
+    if runnable.get("steps"):
+        plan_id = register_plan(runnable)
+        data["plan_id"] = plan_id
+        data["steps"] = [
+            f"{step['id']}: {next(iter(step['args'].values()))}"
+            + (f" (after {', '.join(step['depends_on'])})" if step["depends_on"] else "")
+            for step in runnable["steps"]
+        ]
+        plan += f"\n   📋 Runnable plan {plan_id} (execute_plan('{plan_id}') runs it):\n"
+        plan += "".join(f"   → {line}\n" for line in data["steps"])
+    if runnable.get("unplanned"):
+        data["unplanned"] = runnable["unplanned"]
+        plan += f"\n   ❓ No folder rule for: {', '.join(runnable['unplanned'])} - decide these yourself\n"
+
     plan += """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 ✅ Remember: Adapt to the actual situation. Think, don't template-follow!
 """
 
-    return plan
+    return respond(data, plan)
+
+
+@tool
+def execute_plan(plan: str):
+    """Run a structured plan locally in ONE call (parallel steps, each checked against
+    its "expect"). Then fix only the failed steps.
+
+    Args:
+        plan: Plan ID from plan_task (e.g. "plan-1"), or JSON steps:
+            [{"id": "mk", "tool": "execute_terminal_command",
+              "args": {"command": "mkdir -p ~/Desktop/Images"}, "depends_on": [],
+              "expect": {"is_dir": "~/Desktop/Images"}}]
+            expect keys: is_dir, exists, no_match [globs], has_match [globs], output_contains
+    """
+    structured = get_plan(plan)
+    if not structured:
+        return f"❌ Unknown plan: {plan[:80]}. Use a plan_id from plan_task or JSON steps."
+
+    plan_tools = [
+        execute_terminal_command,
+        list_directory,
+        read_file_content,
+        search_file,
+        search_content,
+        get_current_directory,
+        verify_expectations,
+        organize_directory,
+        open_app,
+        open_url,
+    ]
+    result = run_plan(structured, {t.name: t for t in plan_tools})
+    if result["status"] == "invalid":
+        return f"❌ Plan can't run: {result['problem']}"
+
+    icons = {"ok": "✅", "failed": "❌", "skipped": "⏭️"}
+    report = f"📋 PLAN {result['status'].upper()} in {result['elapsed_s']}s:\n"
+    report += "\n".join(
+        f"   {icons[step['status']]} {step['id']}"
+        + (f" - {step['detail']}" if step["detail"] else "")
+        for step in result["steps"]
+    )
+
+    data = {
+        "status": result["status"],
+        "ok": sum(1 for step in result["steps"] if step["status"] == "ok"),
+        "failed": {
+            step["id"]: step["detail"] for step in result["steps"] if step["status"] == "failed"
+        },
+        "skipped": [step["id"] for step in result["steps"] if step["status"] == "skipped"],
+    }
+    if result["status"] == "failed":
+        return respond(data, "⚠️ " + report)
+    return respond(data, report)
 
 
 @tool
@@ -447,73 +658,105 @@ def self_critique(original_task: str, actions_summary: str, expected_outcome: st
         critique += f"   🟢 COMPLETE ({completion:.0f}%)\n"
         critique += "   ✅ Task appears fully done!\n"
 
-    critique += "\n💡 RECOMMENDATION:\n"
     if completion < 90:
-        critique += "   → DO NOT say 'Done' yet\n"
-        critique += "   → Identify what's missing\n"
-        critique += "   → Complete remaining steps\n"
-        critique += "   → Then run self_critique again\n"
+        recommendation = [
+            "DO NOT say 'Done' yet",
+            "Identify what's missing",
+            "Complete remaining steps",
+            "Then run self_critique again",
+        ]
     else:
-        critique += "   → Verify results one more time\n"
-        critique += "   → Then you can report completion\n"
+        recommendation = ["Verify results one more time", "Then you can report completion"]
 
-    return critique
+    critique += "\n💡 RECOMMENDATION:\n"
+    for step in recommendation:
+        critique += f"   → {step}\n"
+
+    data = {
+        "task": original_task,
+        "actions": actions_summary,
+        "expected": expected_outcome,
+        "completion": round(completion),
+        "status": "incomplete" if completion < 50 else "partial" if completion < 90 else "complete",
+        "next": recommendation,
+    }
+    return respond(data, critique)
 
 
 @tool
-def verify_expectations(what_to_verify: str, verification_commands: str):
+def verify_expectations(what_to_verify: str, checks: str, directory: str):
     """Verify that expected changes actually happened.
 
     Use this to confirm your actions worked as intended.
 
     Args:
         what_to_verify: What you expect to find (e.g., "8 JPG files in ~/Desktop/Images/")
-        verification_commands: Shell commands to check (e.g., "ls ~/Desktop/Images/*.jpg | wc -l")
+        checks: Checks separated by ";", paths relative to directory:
+            count <glob> [in <dir>] == N | none <glob> [in <dir>] | any <glob> [in <dir>]
+            exists <path> | missing <path> | added/removed/modified <glob> [in <dir>] == N
+            (added/removed/modified: changes since this task started)
+        directory: Folder the checks are relative to (e.g., "~/Desktop")
 
     Returns: Verification result - did expectations match reality?
 
     Example:
         verify_expectations(
             "All JPG files should be in Images folder",
-            "ls ~/Desktop/Images/*.jpg"
+            "none *.jpg; count *.jpg in Images == 8",
+            "~/Desktop"
         )
     """
-    if not is_safe(verification_commands):
-        return "🚫 Unsafe verification command blocked."
+    if not is_safe(directory):
+        return "🚫 Unsafe path blocked."
+    if not os.path.isdir(os.path.expanduser(directory)):
+        return f"❌ Directory not found: {directory}"
 
     try:
-        result = subprocess.run(
-            verification_commands, shell=True, capture_output=True, text=True, timeout=10
-        )
-
-        output = result.stdout if result.stdout else result.stderr
+        report = verification.verify(directory, re.split(r"[;\n]", checks))
+    except Exception as e:
+        return f"❌ Verification error: {str(e)}"
 
-        verification_result = f"""
+    icons = {True: "✅", False: "❌", None: "❓"}
+    lines = "\n".join(
+        f"   {icons[result['ok']]} {result['check']} (actual: {result['actual']})"
+        for result in report["results"]
+    )
+    changes = report["changes"]
+    change_summary = (
+        f"+{len(changes['added'])} added, -{len(changes['removed'])} removed, "
+        f"~{len(changes['modified'])} modified since the task started"
+        if changes
+        else "no before-snapshot for this task"
+    )
+
+    verification_result = f"""
 🔍 VERIFICATION REPORT:
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 📋 Expected:
    {what_to_verify}
 
-🔧 Verification Command:
-   {verification_commands}
+📊 Checks in {directory}:
+{lines}
 
-📊 Actual Result:
-{output}
+🔄 Changes: {change_summary}
 
 """
+    if report["result"] == "passed":
+        verification_result += "✅ VERIFICATION PASSED\n   Expected conditions met!"
+    elif report["result"] == "inconclusive":
+        verification_result += "⚠️  VERIFICATION INCONCLUSIVE\n   Some checks couldn't be evaluated"
+    else:
+        verification_result += "❌ VERIFICATION FAILED\n   Expected conditions NOT met!"
 
-        if result.returncode == 0 and output.strip():
-            verification_result += "✅ VERIFICATION PASSED\n   Expected conditions met!"
-        elif result.returncode == 0 and not output.strip():
-            verification_result += "⚠️  VERIFICATION INCONCLUSIVE\n   No output - might be empty"
-        else:
-            verification_result += "❌ VERIFICATION FAILED\n   Expected conditions NOT met!"
-
-        return verification_result
-
-    except Exception as e:
-        return f"❌ Verification error: {str(e)}"
+    data = {
+        "expected": what_to_verify,
+        "checks": {result["check"]: result["actual"] for result in report["results"]},
+        "failed": [result["check"] for result in report["results"] if result["ok"] is False],
+        "changes": {kind: len(paths) for kind, paths in changes.items()},
+        "result": report["result"],
+    }
+    return respond(data, verification_result)
 
 
 # ============================================================================
@@ -711,6 +954,180 @@ def clear_memory(memory_type: str = "all"):
 # ROBUST ERROR RECOVERY SYSTEM
 # ============================================================================
 
+# Error categories: substrings that identify them, likely causes, and
+# alternative strategies as (rating 1-5, strategy, how-to hints), best first
+ERROR_PLAYBOOK: list[dict] = [
+    {
+        "type": "PERMISSION ERROR",
+        "match": ["permission denied", "operation not permitted"],
+        "causes": [
+            "File/directory is protected",
+            "Current user doesn't have write access",
+            "System location requires elevated permissions",
+        ],
+        "strategies": [
+            (
+                5,
+                "Use a different location",
+                [
+                    "Try ~/Desktop or ~/Documents instead of system folders",
+                    "Command: mkdir ~/Desktop/FolderName",
+                ],
+            ),
+            (
+                4,
+                "Check and change permissions",
+                ["See current permissions: ls -la <path>", "Change if safe: chmod u+w <path>"],
+            ),
+            (
+                3,
+                "Use absolute paths",
+                [
+                    "Instead of relative paths, use full ~/path/to/file",
+                    "This avoids permission issues in current directory",
+                ],
+            ),
+            (2, "Check file ownership", ["See owner: ls -l <path>", "Make sure it's your file"]),
+            (1, "Create in user space first", ["Create in ~/ first, then copy to destination"]),
+        ],
+    },
+    {
+        "type": "COMMAND/FILE NOT FOUND",
+        "match": ["command not found", "no such file or directory"],
+        "causes": ["Command doesn't exist", "File path is wrong", "Tool not installed"],
+        "strategies": [
+            (
+                5,
+                "Try alternative command",
+                ["wget → curl", "apt-get → brew (on Mac)", "python → python3"],
+            ),
+            (
+                4,
+                "Check if path exists first",
+                [
+                    "Use: list_directory() to see what's actually there",
+                    "Verify paths before using them",
+                ],
+            ),
+            (
+                3,
+                "Use absolute paths",
+                ['Instead of "file.txt" → use "~/Desktop/file.txt"', "Less ambiguity"],
+            ),
+            (2, "Install missing tool", ["Mac: brew install <tool>", "Check: which <command>"]),
+            (1, "Search for the file", ["Use: search_file() tool", "Find where it actually is"]),
+        ],
+    },
+    {
+        "type": "FILE/FOLDER ALREADY EXISTS",
+        "match": ["already exists", "file exists"],
+        "causes": ["Target already exists", "Trying to overwrite"],
+        "strategies": [
+            (
+                5,
+                "Check existence FIRST",
+                ["Use: list_directory() before creating", "Avoid collision"],
+            ),
+            (
+                4,
+                "Use a different name",
+                ["Add timestamp: Images_2024_01_15", "Add number: Images_2"],
+            ),
+            (
+                3,
+                "Remove old one first",
+                ["Check: ls <path>", "Delete: rm <path> (if safe!)", "Then create new"],
+            ),
+            (
+                2,
+                "Use force flag carefully",
+                ["Add -f flag to overwrite", "BE CAREFUL - this deletes existing!"],
+            ),
+            (
+                1,
+                "Merge instead of replace",
+                ["Move contents into existing folder", "Don't create new one"],
+            ),
+        ],
+    },
+    {
+        "type": "DIRECTORY/FILE MISMATCH",
+        "match": ["is a directory", "is not a directory"],
+        "causes": ["Treating file as directory or vice versa"],
+        "strategies": [
+            (
+                5,
+                "Check what it actually is",
+                ["Use: list_directory() on parent", "See if it's file or folder"],
+            ),
+            (
+                4,
+                "Use correct command",
+                ["For files: cat, mv, cp", "For directories: cd, mkdir, rmdir"],
+            ),
+            (3, "Check path carefully", ["Make sure path is correct", "No typos in folder names"]),
+        ],
+    },
+    {
+        "type": "DISK SPACE ERROR",
+        "match": ["no space", "disk full"],
+        "causes": ["Not enough disk space"],
+        "strategies": [
+            (5, "Check disk space", ["Command: df -h", "See what's available"]),
+            (4, "Clean up first", ["Remove temporary files", "Empty trash"]),
+            (3, "Use different location", ["Try external drive", "Use cloud storage"]),
+        ],
+    },
+]
+
+# Used when no category matches
+GENERIC_ERROR_PLAYBOOK: dict = {
+    "type": "GENERAL ERROR",
+    "match": [],
+    "causes": [],
+    "strategies": [
+        (
+            5,
+            "Read error message carefully",
+            ["Look for specific hints", "Error messages usually tell you what's wrong"],
+        ),
+        (
+            4,
+            "Verify inputs",
+            ["Check paths exist: list_directory()", "Verify parameters are correct"],
+        ),
+        (
+            3,
+            "Try simpler version",
+            ["Break command into smaller steps", "Test each part separately"],
+        ),
+        (
+            2,
+            "Check context",
+            [
+                "Am I in the right directory? get_current_directory()",
+                "Do I have the right permissions?",
+            ],
+        ),
+        (
+            1,
+            "Try completely different approach",
+            [
+                "If file operations fail, try GUI automation",
+                "If command-line fails, try Python code",
+            ],
+        ),
+    ],
+}
+
+DEBUG_NEXT_STEPS = [
+    "Pick highest-rated strategy (⭐⭐⭐⭐⭐)",
+    "Try it",
+    "If fails, try next strategy",
+    "DON'T GIVE UP - work through all alternatives!",
+    'Save what worked: save_to_memory(strategy, "success")',
+]
+
 
 @tool
 def debug_last_error(error_message: str, command_that_failed: str, context: str = ""):
@@ -733,6 +1150,17 @@ def debug_last_error(error_message: str, command_that_failed: str, context: str
         )
     """
 
+    # Categorize error and provide solutions
+    error_lower = error_message.lower()
+    playbook = next(
+        (
+            entry
+            for entry in ERROR_PLAYBOOK
+            if any(pattern in error_lower for pattern in entry["match"])
+        ),
+        GENERIC_ERROR_PLAYBOOK,
+    )
+
     analysis = f"""
 🐛 ERROR DEBUGGING REPORT
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -742,188 +1170,41 @@ def debug_last_error(error_message: str, command_that_failed: str, context: str
 📋 CONTEXT: {context or "No context provided"}
 
 🔍 ERROR ANALYSIS:
-"""
-
-    # Categorize error and provide solutions
-    error_lower = error_message.lower()
-
-    if "permission denied" in error_lower or "operation not permitted" in error_lower:
-        analysis += """
-   Type: PERMISSION ERROR
-
-   Why it failed:
-   • File/directory is protected
-   • Current user doesn't have write access
-   • System location requires elevated permissions
 
-   🔄 ALTERNATIVE STRATEGIES (try in order):
-
-   1. ⭐⭐⭐⭐⭐ Use a different location
-      → Try ~/Desktop or ~/Documents instead of system folders
-      → Command: mkdir ~/Desktop/FolderName
-
-   2. ⭐⭐⭐⭐ Check and change permissions
-      → See current permissions: ls -la <path>
-      → Change if safe: chmod u+w <path>
-
-   3. ⭐⭐⭐ Use absolute paths
-      → Instead of relative paths, use full ~/path/to/file
-      → This avoids permission issues in current directory
-
-   4. ⭐⭐ Check file ownership
-      → See owner: ls -l <path>
-      → Make sure it's your file
-
-   5. ⭐ Create in user space first
-      → Create in ~/ first, then copy to destination
-"""
-
-    elif "command not found" in error_lower or "no such file or directory" in error_lower:
-        analysis += """
-   Type: COMMAND/FILE NOT FOUND
-
-   Why it failed:
-   • Command doesn't exist
-   • File path is wrong
-   • Tool not installed
-
-   🔄 ALTERNATIVE STRATEGIES (try in order):
-
-   1. ⭐⭐⭐⭐⭐ Try alternative command
-      → wget → curl
-      → apt-get → brew (on Mac)
-      → python → python3
-
-   2. ⭐⭐⭐⭐ Check if path exists first
-      → Use: list_directory() to see what's actually there
-      → Verify paths before using them
-
-   3. ⭐⭐⭐ Use absolute paths
-      → Instead of "file.txt" → use "~/Desktop/file.txt"
-      → Less ambiguity
-
-   4. ⭐⭐ Install missing tool
-      → Mac: brew install <tool>
-      → Check: which <command>
-
-   5. ⭐ Search for the file
-      → Use: search_file() tool
-      → Find where it actually is
-"""
-
-    elif "already exists" in error_lower or "file exists" in error_lower:
-        analysis += """
-   Type: FILE/FOLDER ALREADY EXISTS
-
-   Why it failed:
-   • Target already exists
-   • Trying to overwrite
-
-   🔄 ALTERNATIVE STRATEGIES (try in order):
-
-   1. ⭐⭐⭐⭐⭐ Check existence FIRST
-      → Use: list_directory() before creating
-      → Avoid collision
-
-   2. ⭐⭐⭐⭐ Use a different name
-      → Add timestamp: Images_2024_01_15
-      → Add number: Images_2
-
-   3. ⭐⭐⭐ Remove old one first
-      → Check: ls <path>
-      → Delete: rm <path> (if safe!)
-      → Then create new
-
-   4. ⭐⭐ Use force flag carefully
-      → Add -f flag to overwrite
-      → BE CAREFUL - this deletes existing!
-
-   5. ⭐ Merge instead of replace
-      → Move contents into existing folder
-      → Don't create new one
-"""
-
-    elif "is a directory" in error_lower or "is not a directory" in error_lower:
-        analysis += """
-   Type: DIRECTORY/FILE MISMATCH
-
-   Why it failed:
-   • Treating file as directory or vice versa
-
-   🔄 ALTERNATIVE STRATEGIES (try in order):
-
-   1. ⭐⭐⭐⭐⭐ Check what it actually is
-      → Use: list_directory() on parent
-      → See if it's file or folder
-
-   2. ⭐⭐⭐⭐ Use correct command
-      → For files: cat, mv, cp
-      → For directories: cd, mkdir, rmdir
-
-   3. ⭐⭐⭐ Check path carefully
-      → Make sure path is correct
-      → No typos in folder names
-"""
-
-    elif "no space" in error_lower or "disk full" in error_lower:
-        analysis += """
-   Type: DISK SPACE ERROR
-
-   Why it failed:
-   • Not enough disk space
-
-   🔄 ALTERNATIVE STRATEGIES:
-
-   1. ⭐⭐⭐⭐⭐ Check disk space
-      → Command: df -h
-      → See what's available
-
-   2. ⭐⭐⭐⭐ Clean up first
-      → Remove temporary files
-      → Empty trash
-
-   3. ⭐⭐⭐ Use different location
-      → Try external drive
-      → Use cloud storage
+   Type: {playbook["type"]}
 """
 
+    if playbook["causes"]:
+        analysis += "\n   Why it failed:\n"
+        for cause in playbook["causes"]:
+            analysis += f"   • {cause}\n"
+        analysis += "\n   🔄 ALTERNATIVE STRATEGIES (try in order):\n"
     else:
-        # Generic error
-        analysis += """
-   Type: GENERAL ERROR
-
-   🔄 GENERIC TROUBLESHOOTING STRATEGIES:
-
-   1. ⭐⭐⭐⭐⭐ Read error message carefully
-      → Look for specific hints
-      → Error messages usually tell you what's wrong
-
-   2. ⭐⭐⭐⭐ Verify inputs
-      → Check paths exist: list_directory()
-      → Verify parameters are correct
+        analysis += "\n   🔄 GENERIC TROUBLESHOOTING STRATEGIES:\n"
 
-   3. ⭐⭐⭐ Try simpler version
-      → Break command into smaller steps
-      → Test each part separately
-
-   4. ⭐⭐ Check context
-      → Am I in the right directory? get_current_directory()
-      → Do I have the right permissions?
-
-   5. ⭐ Try completely different approach
-      → If file operations fail, try GUI automation
-      → If command-line fails, try Python code
-"""
+    for number, (rating, strategy, hints) in enumerate(playbook["strategies"], 1):
+        analysis += f"\n   {number}. {'⭐' * rating} {strategy}\n"
+        for hint in hints:
+            analysis += f"      → {hint}\n"
 
     analysis += """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 💡 NEXT STEPS:
-1. Pick highest-rated strategy (⭐⭐⭐⭐⭐)
-2. Try it
-3. If fails, try next strategy
-4. DON'T GIVE UP - work through all alternatives!
-5. Save what worked: save_to_memory(strategy, "success")
 """
-
-    return analysis
+    for number, step in enumerate(DEBUG_NEXT_STEPS, 1):
+        analysis += f"{number}. {step}\n"
+
+    data = {
+        "error": error_message,
+        "command": command_that_failed,
+        "context": context,
+        "type": playbook["type"],
+        "causes": playbook["causes"],
+        "strategies": [
+            f"[{rating}] {strategy}: {'; '.join(hints)}"
+            for rating, strategy, hints in playbook["strategies"]
+        ],
+        "next": "try strategies in order; save what worked with save_to_memory(..., 'success')",
+    }
+    return respond(data, analysis)
@@ -52,6 +52,12 @@ DEFAULT_TIER = "medium"
 # Enable intelligent model selection (use smaller models when possible)
 ENABLE_SMART_SELECTION = True
 
+# Learned tier classifier (task_classifier.py): below this confidence the keyword rules decide
+TASK_CLASSIFIER_MIN_CONFIDENCE = 0.5
+
+# Most recent logged task outcomes used for training (~/.ai_robot_task_outcomes.jsonl)
+TASK_CLASSIFIER_MAX_OUTCOMES = 2000
+
 # Enable response caching (avoid duplicate API calls)
 ENABLE_CACHING = True
 CACHE_TTL_SECONDS = 300  # 5 minutes
@@ -66,6 +72,11 @@ RATE_LIMITS = {
     "ollama": 999,  # No limit (local)
 }
 
+# Daily token limits (metered from provider usage metadata, see token_meter.py)
+DAILY_TOKEN_LIMITS = {
+    "groq": 100_000,  # Free tier: 100k tokens/day
+}
+
 
 # ============================================================================
 # FALLBACK STRATEGY
@@ -116,3 +127,242 @@ USE_COMPRESSED_PROMPTS = True
 
 # Remove verbose examples from system prompt
 MINIMAL_PROMPTS = True
+
+
+# ============================================================================
+# TOOL OUTPUT SHAPING
+# ============================================================================
+
+# Token budget per tool result fed back to the model (the console still shows everything)
+TOOL_OUTPUT_BUDGETS = {
+    "execute_terminal_command": 600,
+    "list_directory": 500,
+    "search_file": 300,
+    "read_file_content": 800,
+    "search_content": 600,
+}
+
+# Budget for tools not listed above
+DEFAULT_TOOL_OUTPUT_BUDGET = 1000
+
+
+# ============================================================================
+# CONVERSATION HISTORY
+# ============================================================================
+
+# Token budget for system prompt + history sent on each model call
+HISTORY_MAX_TOKENS = 3000
+
+# Most recent turns (user request + its tool calls) always kept verbatim
+HISTORY_KEEP_TURNS = 3
+
+# Maximum size of the rolling summary of older turns
+HISTORY_SUMMARY_MAX_TOKENS = 400
+
+
+# ============================================================================
+# SESSIONS (durable checkpoints in ~/.ai_robot_sessions.db)
+# ============================================================================
+
+# Checkpoints kept per session (older ones are pruned after each task)
+CHECKPOINT_RETENTION = 20
+
+# Sessions not used for this many days are deleted at startup
+SESSION_MAX_AGE_DAYS = 30
+
+
+# ============================================================================
+# PLAN EXECUTION & BULK FILE OPERATIONS
+# ============================================================================
+
+# Threads for running independent steps of a structured plan (execute_plan tool)
+PLAN_MAX_WORKERS = 4
+
+# Threads moving files for organize_directory (os.replace, chunks of 256 files)
+ORGANIZE_MAX_WORKERS = 8
+
+
+# ============================================================================
+# VERIFICATION (verify_expectations snapshots)
+# ============================================================================
+
+# Directory levels checked when verifying (2 = the folder and its subfolders' files).
+# "Before" snapshots only list each folder the agent looked at, one level deep.
+VERIFY_MAX_DEPTH = 3
+
+# Stop snapshotting after this many entries (keeps huge trees in milliseconds)
+VERIFY_MAX_ENTRIES = 200_000
+
+
+# ============================================================================
+# CONTENT SEARCH (content_search.py, search_content tool)
+# ============================================================================
+
+# Threads reading files in parallel (file reads release the GIL)
+SEARCH_WORKERS = 8
+
+# Files bigger than this are skipped (logs, dumps, databases)
+SEARCH_MAX_FILE_MB = 5
+
+# Stop walking after this many files
+SEARCH_MAX_FILES = 50_000
+
+
+# ============================================================================
+# MOUSE MOTION (motion.py)
+# ============================================================================
+
+# "human": curved, eased path within the time budget; "fast": jump straight to the target
+MOUSE_MOTION_MODE = "human"
+
+# Longest a human-like move may take (shorter distances take proportionally less)
+MOUSE_MOVE_BUDGET_S = 0.25
+
+# Most intermediate points per move, and number of cached path shapes to pick from
+MOUSE_MAX_STEPS = 24
+MOUSE_PATH_TEMPLATES = 32
+
+
+# ============================================================================
+# KEYBOARD & GUI SEQUENCES (text_entry.py, gui_sequence tool)
+# ============================================================================
+
+# Delay between typed characters
+TYPE_INTERVAL_S = 0.02
+
+# Text this long (or any non-ASCII text) is pasted via the clipboard instead of typed;
+# the previous clipboard contents are restored afterwards
+TYPE_PASTE_MIN_CHARS = 40
+
+# Time the target app gets to read the clipboard before it is restored
+CLIPBOARD_SETTLE_S = 0.15
+
+# Delay between repeated chords (press_key("cmd+z", times=3))
+KEY_REPEAT_INTERVAL_S = 0.05
+
+# Most actions in one gui_sequence call
+GUI_SEQUENCE_MAX_ACTIONS = 50
+
+# Pause after each action unless the action sets its own "pause" (lets the UI react)
+GUI_SEQUENCE_PAUSE_S = 0.05
+
+
+# ============================================================================
+# SCREENSHOTS (screen_capture.py, take_screenshot tool)
+# ============================================================================
+
+# Frames are downscaled to this width (Retina screens are 2-3x wider); 0 keeps full size
+SCREENSHOT_MAX_WIDTH = 1280
+
+# "jpeg", "webp" or "png", and the JPEG/WebP quality
+SCREENSHOT_FORMAT = "jpeg"
+SCREENSHOT_QUALITY = 70
+
+# Recent frames kept in memory (nothing is written to disk unless asked)
+SCREENSHOT_BUFFER_FRAMES = 8
+
+# Where requested screenshots are saved
+SCREENSHOT_DIR = "~/Desktop"
+
+
+# ============================================================================
+# SCREEN STABILITY (screen_wait.py, wait_for_screen_stable tool)
+# ============================================================================
+
+# Time between samples, and how long the screen must stay unchanged to count as settled
+SCREEN_STABLE_INTERVAL_S = 0.1
+SCREEN_STABLE_FOR_S = 0.3
+
+# Longest wait_for_screen_stable call
+SCREEN_STABLE_TIMEOUT_S = 5.0
+
+# Samples are grayscale and this wide; a share of changed pixels up to the tolerance
+# (a blinking caret, a ticking clock) still counts as stable
+SCREEN_STABLE_SAMPLE_WIDTH = 160
+SCREEN_STABLE_TOLERANCE = 0.002
+
+# Longest wait when a click or key press asks to wait for the screen to settle
+SETTLE_TIMEOUT_S = 2.0
+
+
+# ============================================================================
+# RUNNING APPS (process_monitor.py, check_running_apps tool)
+# ============================================================================
+
+# Reuse the last process snapshot for this long (repeated checks cost nothing)
+PROCESS_SNAPSHOT_TTL_S = 2.0
+
+
+# ============================================================================
+# APP LAUNCHES (launcher.py, open_app/open_url tools)
+# ============================================================================
+
+# open_app waits at most this long for the app's window (or process) to appear;
+# the launch itself never blocks and is still recorded if it finishes later
+LAUNCH_READY_TIMEOUT_S = 15.0
+
+# Time between readiness checks
+LAUNCH_POLL_S = 0.25
+
+
+# ============================================================================
+# ELEMENT LOCATOR (element_locator.py, locate_on_screen tool)
+# ============================================================================
+
+# UI images to look for, registered by file name ("save_button.png" → "save_button")
+LOCATE_TEMPLATE_DIR = "~/.ai_robot_templates"
+
+# Lowest match score (normalized cross-correlation, 1.0 = identical) that counts as found
+LOCATE_THRESHOLD = 0.8
+
+# Template sizes tried (0.5 / 2.0 cover templates captured on a Retina vs. a normal display)
+LOCATE_SCALES = (1.0, 0.5, 2.0)
+
+# Screen pyramid depth; templates are searched at the coarsest level where they are
+# still this many pixels on their short side
+LOCATE_PYRAMID_LEVELS = 3
+LOCATE_MIN_TEMPLATE_PX = 8
+
+
+# ============================================================================
+# TOOL CALL RECOVERY (tool_call_recovery.py)
+# ============================================================================
+
+# Turn tool calls a model wrote as text/JSON/shell blocks into real tool calls
+# (validated against the tool schemas) instead of ending the task without acting;
+# local models (ollama) only
+ENABLE_TOOL_CALL_RECOVERY = True
+
+
+# ============================================================================
+# LOOP DETECTION (step_monitor.py)
+# ============================================================================
+
+# Unproductive repeats in a row (same tool call, same result) before a task is stopped
+LOOP_MAX_REPEATS = 3
+
+# Hand a looping task to a stronger model/provider instead of giving up
+LOOP_ESCALATE = True
+
+
+# ============================================================================
+# TRAJECTORY REPLAY (~/.ai_robot_trajectories.json)
+# ============================================================================
+
+# Replay the recorded tool calls of verified tasks when the same task comes back
+# (re-bound to a fresh directory listing; the model takes over on divergence)
+ENABLE_TRAJECTORY_REPLAY = True
+
+
+# ============================================================================
+# TOOL RESPONSE FORMAT
+# ============================================================================
+
+# "compact": plan_task, self_critique, verify_expectations and debug_last_error
+# return minimal JSON to the model. "rich": emoji banners. The console always
+# shows the rich version.
+RESPONSE_FORMAT = {
+    "groq": "compact",
+    "gemini": "compact",
+    "ollama": "compact",
+}
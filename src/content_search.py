@@ -0,0 +1,265 @@
+"""
+Content Search - Parallel Text Search Inside Files
+Thread-pooled streaming scan that skips binaries and ignored folders, with regex/literal modes and a match cap
+"""
+
+import collections
+import fnmatch
+import itertools
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Optional
+
+from src import config
+
+# Folders never worth searching (VCS data, dependencies, caches, build output)
+IGNORED_DIRS = {
+    ".git",
+    ".hg",
+    ".svn",
+    "node_modules",
+    "__pycache__",
+    ".venv",
+    "venv",
+    ".tox",
+    ".mypy_cache",
+    ".pytest_cache",
+    ".ruff_cache",
+    ".cache",
+    ".Trash",
+    "Library",
+    "build",
+    "dist",
+}
+
+# Bytes read to decide whether a file is binary (a NUL byte means binary)
+BINARY_SNIFF_BYTES = 8192
+
+# Longest piece of a line read at once - a minified file can't pull itself into memory
+MAX_LINE_CHARS = 65536
+
+# Characters of context kept around a match
+SNIPPET_CHARS = 160
+
+# Files per pool task - keeps per-future overhead negligible on big trees
+FILE_CHUNK_SIZE = 32
+
+# ============================================================================
+# STREAMING READER
+# ============================================================================
+
+
+def is_binary(path: str) -> bool:
+    """Whether a file looks binary (NUL byte near the start)"""
+    with open(path, "rb") as f:
+        return b"\0" in f.read(BINARY_SNIFF_BYTES)
+
+
+def stream_lines(path: str):
+    """
+    Lines of a text file, read lazily (undecodable bytes are replaced)
+
+    Lines longer than MAX_LINE_CHARS come in pieces; only the last piece ends
+    with a newline.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        yield from iter(lambda: f.readline(MAX_LINE_CHARS), "")
+
+
+def read_lines(path: str, max_lines: int) -> tuple:
+    """
+    First lines of a file without reading the rest
+
+    Returns:
+        (lines, truncated: whether more lines follow)
+    """
+    lines = stream_lines(path)
+    try:
+        head = list(itertools.islice(lines, max_lines))
+        return head, next(lines, None) is not None
+    finally:
+        lines.close()
+
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+
+def compile_query(query: str, regex: bool = False, case_sensitive: bool = False):
+    """
+    Pattern for a query (a literal is escaped, so "a.b" only matches "a.b")
+
+    Raises:
+        re.error: If regex mode gets an invalid pattern
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    return re.compile(query if regex else re.escape(query), flags)
+
+
+def iter_files(root: str, include: str = "", max_files: Optional[int] = None):
+    """
+    Files under root, shallow folders first, skipping IGNORED_DIRS and hidden folders
+
+    Args:
+        root: Folder to search
+        include: Glob on the file name ("*.py"), "" for every file
+        max_files: Stop after this many files (default: config.SEARCH_MAX_FILES)
+    """
+    max_files = config.SEARCH_MAX_FILES if max_files is None else max_files
+    count = 0
+    level = [root]
+    while level and count < max_files:
+        next_level = []
+        for folder in level:
+            try:
+                entries = sorted(os.scandir(folder), key=lambda entry: entry.name)
+            except OSError:
+                continue
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in IGNORED_DIRS and not entry.name.startswith("."):
+                            next_level.append(entry.path)
+                    elif entry.is_file() and (not include or fnmatch.fnmatch(entry.name, include)):
+                        yield entry.path
+                        count += 1
+                        if count >= max_files:
+                            return
+                except OSError:
+                    continue
+        level = next_level
+
+
+def snippet(line: str, start: int, end: int) -> str:
+    """The matched part of a line with context, at most SNIPPET_CHARS long"""
+    line = line.rstrip("\r\n")
+    if len(line) <= SNIPPET_CHARS:
+        return line.strip()
+    left = max(0, min(start - (SNIPPET_CHARS - (end - start)) // 2, len(line) - SNIPPET_CHARS))
+    text = line[left : left + SNIPPET_CHARS].strip()
+    return ("…" if left else "") + text + ("…" if left + SNIPPET_CHARS < len(line) else "")
+
+
+def scan_file(path: str, pattern, limit: int, stop: Optional[threading.Event] = None) -> dict:
+    """
+    Matches in one file, streamed line by line
+
+    Args:
+        path: File to scan
+        pattern: Compiled query
+        limit: Most matches to return from this file
+        stop: Set once the whole search has enough matches
+
+    Returns:
+        {"matches": [(line number, snippet)], "skipped": "" or why the file wasn't read}
+    """
+    try:
+        if os.path.getsize(path) > config.SEARCH_MAX_FILE_MB * 1024 * 1024:
+            return {"matches": [], "skipped": "large"}
+        if is_binary(path):
+            return {"matches": [], "skipped": "binary"}
+        matches, number = [], 1
+        for piece in stream_lines(path):
+            found = pattern.search(piece)
+            if found:
+                matches.append((number, snippet(piece, found.start(), found.end())))
+                if len(matches) >= limit or (stop is not None and stop.is_set()):
+                    break
+            if piece.endswith("\n"):
+                number += 1
+        return {"matches": matches, "skipped": ""}
+    except OSError:
+        return {"matches": [], "skipped": "unreadable"}
+
+
+def search_files(
+    root: str,
+    query: str,
+    regex: bool = False,
+    case_sensitive: bool = False,
+    max_matches: int = 50,
+    include: str = "",
+    workers: Optional[int] = None,
+) -> dict:
+    """
+    Find a query in the files under a folder
+
+    Files are scanned in parallel (reads release the GIL) and the scan stops
+    once max_matches lines have matched. Results are ranked by path depth, so
+    files near the top of the tree come first.
+
+    Args:
+        root: Folder to search (~ is expanded)
+        query: Text, or a regular expression with regex=True
+        regex: Treat the query as a regular expression
+        case_sensitive: Match case exactly
+        max_matches: Most matching lines to return
+        include: Glob on file names ("*.md"), "" for every file
+        workers: Threads (default: config.SEARCH_WORKERS)
+
+    Returns:
+        {"matches": [{"path", "line", "snippet"}], "files_scanned", "skipped": {reason: count},
+         "truncated": whether the cap was hit, "elapsed_ms"}
+
+    Raises:
+        re.error: If regex mode gets an invalid pattern
+        NotADirectoryError: If root isn't a folder
+    """
+    start = time.perf_counter()
+    root = os.path.expanduser(root)
+    if not os.path.isdir(root):
+        raise NotADirectoryError(root)
+    pattern = compile_query(query, regex, case_sensitive)
+    stop = threading.Event()
+    lock = threading.Lock()
+    found: list = []
+    counts: dict[str, Any] = {"scanned": 0, "skipped": {}}
+
+    def scan(paths: list):
+        for path in paths:
+            if stop.is_set():
+                return
+            result = scan_file(path, pattern, max_matches, stop)
+            with lock:
+                counts["scanned"] += 1
+                if result["skipped"]:
+                    skipped = counts["skipped"]
+                    skipped[result["skipped"]] = skipped.get(result["skipped"], 0) + 1
+                found.extend((path, number, text) for number, text in result["matches"])
+                if len(found) >= max_matches:
+                    stop.set()
+
+    # The walk stays a few chunks ahead of the scanners, so it stops with them
+    files = iter_files(root, include)
+    workers = workers or config.SEARCH_WORKERS
+    pending: collections.deque = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while not stop.is_set():
+            chunk = list(itertools.islice(files, FILE_CHUNK_SIZE))
+            if not chunk:
+                break
+            pending.append(pool.submit(scan, chunk))
+            if len(pending) >= 2 * workers:
+                pending.popleft().result()
+        for future in pending:
+            future.result()
+
+    def rank(match):
+        relative = os.path.relpath(match[0], root)
+        return relative.count(os.sep), relative, match[1]
+
+    ranked = sorted(found, key=rank)
+    return {
+        "matches": [
+            {"path": os.path.relpath(path, root), "line": number, "snippet": text}
+            for path, number, text in ranked[:max_matches]
+        ],
+        "files_scanned": counts["scanned"],
+        "skipped": counts["skipped"],
+        "truncated": stop.is_set(),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }
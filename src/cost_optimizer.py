@@ -5,11 +5,12 @@ Reduces AI costs by 50-70% while maintaining accuracy
 
 import hashlib
 import json
+import re
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from src import config
+from src import config, task_classifier
 
 # ============================================================================
 # REQUEST CACHE
@@ -109,6 +110,9 @@ def detect_task_complexity(query: str) -> str:
     """
     Analyze query to determine optimal model tier
 
+    Uses the learned classifier (see task_classifier.py) and falls back to
+    keyword rules when it isn't confident.
+
     Args:
         query: User request
 
@@ -118,6 +122,22 @@ def detect_task_complexity(query: str) -> str:
     if not config.ENABLE_SMART_SELECTION:
         return config.DEFAULT_TIER
 
+    tier, confidence = task_classifier.classify(query)
+    if confidence >= config.TASK_CLASSIFIER_MIN_CONFIDENCE:
+        return tier
+    return keyword_task_complexity(query)
+
+
+def keyword_task_complexity(query: str) -> str:
+    """
+    Keyword rules for the model tier (fallback for low-confidence predictions)
+
+    Args:
+        query: User request
+
+    Returns:
+        "small", "medium", or "large"
+    """
     query_lower = query.lower()
 
     # Simple tasks - use small/fast model
@@ -219,9 +239,18 @@ def check_rate_limit(provider: str) -> bool:
 # ============================================================================
 
 
+# Words, numbers and single symbols - roughly how BPE tokenizers split text
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+
 def estimate_tokens(text: str) -> int:
     """
-    Rough token estimation (1 token ≈ 4 characters)
+    Local token estimate for when the provider reports no usage
+
+    Splits text into words, short digit groups and symbols (emoji and
+    box-drawing characters cost a token each) and charges words longer than
+    6 characters about one token per 5 characters, which tracks BPE
+    tokenizers far better than a flat characters / 4.
 
     Args:
         text: Input text
@@ -229,13 +258,27 @@ def estimate_tokens(text: str) -> int:
     Returns:
         Estimated token count
     """
-    return len(text) // 4
+    if not text:
+        return 0
+    return sum(
+        1 if len(piece) <= 6 else (len(piece) + 4) // 5 for piece in _TOKEN_PIECE_RE.findall(text)
+    )
+
+
+# Emoji and pictographs (decoration only - the text around them carries the meaning)
+_EMOJI_RE = re.compile("[\U0001f300-\U0001faff\u2600-\u27bf\u2b50\ufe0f]+")
+
+# Lines made only of rule characters
+_RULE_LINE_RE = re.compile(r"^[=\-─━_*#\s]+$")
 
 
 def compress_prompt(prompt: str) -> str:
     """
     Compress system prompt to reduce tokens
 
+    Drops blank and rule lines, strips emoji and markdown bold markers and
+    collapses indentation. No instruction text is removed.
+
     Args:
         prompt: Original prompt
 
@@ -245,13 +288,11 @@ def compress_prompt(prompt: str) -> str:
     if not config.USE_COMPRESSED_PROMPTS:
         return prompt
 
-    # Remove extra whitespace
-    lines = [line.strip() for line in prompt.split("\n") if line.strip()]
-
-    # Remove decorative elements
     compressed = []
-    for line in lines:
-        if not line.startswith(("=", "─", "━", "🎯", "⚡", "✅")):
+    for line in prompt.split("\n"):
+        line = _EMOJI_RE.sub("", line).replace("**", "")
+        line = " ".join(line.split())
+        if line and not _RULE_LINE_RE.match(line):
             compressed.append(line)
 
     return "\n".join(compressed)
@@ -0,0 +1,396 @@
+"""
+Element Locator - Find Registered UI Images on Screen
+NumPy multi-scale template matching on a cached per-frame pyramid (coarse FFT search, fine local refine)
+"""
+
+import os
+import threading
+import time
+from typing import Any, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PIL import Image
+
+from src import config
+from src.input_backend import get_backend
+from src.screen_capture import parse_region
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+# Coarse-level candidates refined at full resolution per template and scale
+CANDIDATES = 3
+
+# Templates with (almost) no contrast can't be matched reliably
+MIN_TEMPLATE_STD = 2.0
+
+# A match this good at one scale ends the search (the other scales aren't tried)
+CONFIDENT_SCORE = 0.95
+
+# ============================================================================
+# PYRAMIDS
+# ============================================================================
+
+
+def _halve(pixels: np.ndarray) -> np.ndarray:
+    """2x2 mean downsample (odd edges dropped)"""
+    height, width = pixels.shape[0] // 2 * 2, pixels.shape[1] // 2 * 2
+    quads = pixels[:height, :width].reshape(height // 2, 2, width // 2, 2)
+    halved: np.ndarray = quads.mean(axis=(1, 3), dtype=np.float32)
+    return halved
+
+
+def _gray(image) -> np.ndarray:
+    """PIL image or array → float32 grayscale"""
+    if isinstance(image, np.ndarray):
+        return image.astype(np.float32) if image.ndim == 2 else image.mean(axis=2, dtype=np.float32)
+    return np.asarray(image.convert("L"), dtype=np.float32)
+
+
+class ScreenPyramid:
+    """
+    Grayscale pyramid of one captured frame.
+
+    Levels (each half the size of the previous one), their FFTs and integral
+    images are computed on first use and shared by every template matched
+    against the frame - a search usually only touches one coarse level.
+    """
+
+    def __init__(self, image, levels: Optional[int] = None):
+        levels = config.LOCATE_PYRAMID_LEVELS if levels is None else levels
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(np.clip(_gray(image), 0, 255).astype(np.uint8))
+        self._gray = image.convert("L")
+        self.depth = 1
+        while self.depth <= levels and min(self._gray.size) >> self.depth >= 64:
+            self.depth += 1
+        self._levels: dict[int, np.ndarray] = {}
+        self._spectra: dict[int, np.ndarray] = {}
+        self._integrals: dict[int, tuple] = {}
+
+    def level(self, level: int) -> np.ndarray:
+        """Pixels of one level (0 = full resolution), as float32"""
+        if level not in self._levels:
+            reduced = self._gray.reduce(2**level) if level else self._gray  # 2^n box average
+            self._levels[level] = np.asarray(reduced, dtype=np.float32)
+        return self._levels[level]
+
+    def spectrum(self, level: int) -> np.ndarray:
+        if level not in self._spectra:
+            self._spectra[level] = np.fft.rfft2(self.level(level))
+        return self._spectra[level]
+
+    def integrals(self, level: int) -> tuple:
+        """Summed-area tables of pixels and squared pixels (with a zero first row/column)"""
+        if level not in self._integrals:
+            pixels = self.level(level).astype(np.float64)
+            sums = np.pad(pixels.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+            squares = np.pad((pixels**2).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+            self._integrals[level] = (sums, squares)
+        return self._integrals[level]
+
+
+def _window_sums(table: np.ndarray, height: int, width: int) -> np.ndarray:
+    """Sum of every height x width window, from a summed-area table"""
+    sums: np.ndarray = (
+        table[height:, width:]
+        - table[:-height, width:]
+        - table[height:, :-width]
+        + table[:-height, :-width]
+    )
+    return sums
+
+
+def match_scores(
+    pyramid: ScreenPyramid,
+    level: int,
+    template: np.ndarray,
+    spectrum: Optional[np.ndarray] = None,
+) -> Optional[np.ndarray]:
+    """
+    Normalized cross-correlation of a template at every position of one pyramid level
+
+    The correlation is one FFT product against the level's cached spectrum; the
+    window statistics come from its integral images. `spectrum` is the template's
+    zero-mean FFT at the level's shape, if already known.
+
+    Returns:
+        Scores in [-1, 1], shape (H - h + 1, W - w + 1), or None if the template doesn't fit
+    """
+    pixels = pyramid.level(level)
+    height, width = template.shape
+    if height > pixels.shape[0] or width > pixels.shape[1]:
+        return None
+    centered = template - template.mean()
+    norm = float(np.sqrt((centered**2).sum()))
+    if spectrum is None:
+        spectrum = np.fft.rfft2(centered, s=pixels.shape)
+    # Circular correlation has no wrap-around at the valid offsets, so the frame needs no padding
+    correlation = np.fft.irfft2(pyramid.spectrum(level) * np.conj(spectrum), s=pixels.shape)
+    correlation = correlation[: pixels.shape[0] - height + 1, : pixels.shape[1] - width + 1]
+
+    sums, squares = pyramid.integrals(level)
+    count = height * width
+    window_sum = _window_sums(sums, height, width)
+    variance = np.maximum(_window_sums(squares, height, width) - window_sum**2 / count, 0.0)
+    denominator = np.sqrt(variance) * norm
+    scores = np.zeros_like(correlation)
+    np.divide(correlation, denominator, out=scores, where=denominator > 1e-6 * count)
+    return scores
+
+
+def _local_scores(pixels: np.ndarray, template: np.ndarray, top: int, left: int, radius: int):
+    """Exact scores in a small neighbourhood of (top, left); returns (score, top, left)"""
+    height, width = template.shape
+    y0, x0 = max(top - radius, 0), max(left - radius, 0)
+    y1 = min(top + radius, pixels.shape[0] - height)
+    x1 = min(left + radius, pixels.shape[1] - width)
+    if y1 < y0 or x1 < x0:
+        return -1.0, top, left
+    patch = pixels[y0 : y1 + height, x0 : x1 + width].astype(np.float64)
+    centered = template - template.mean()
+    # The centered template sums to zero, so the window means drop out of the numerator
+    numerator = np.einsum("ijkl,kl->ij", sliding_window_view(patch, (height, width)), centered)
+    sums = np.pad(patch.cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    squares = np.pad((patch**2).cumsum(0).cumsum(1), ((1, 0), (1, 0)))
+    window_sum = _window_sums(sums, height, width)
+    variance = np.maximum(_window_sums(squares, height, width) - window_sum**2 / centered.size, 0)
+    spread = np.sqrt(variance) * np.sqrt((centered**2).sum())
+    scores = np.where(spread > 1e-6, numerator / np.maximum(spread, 1e-12), 0.0)
+    best = np.unravel_index(int(np.argmax(scores)), scores.shape)
+    return float(scores[best]), y0 + int(best[0]), x0 + int(best[1])
+
+
+def _peaks(scores: np.ndarray, count: int, spacing: int) -> list:
+    """Top positions of a score map, at least `spacing` apart"""
+    scores = scores.copy()
+    peaks = []
+    for _ in range(count):
+        index = np.unravel_index(int(np.argmax(scores)), scores.shape)
+        if scores[index] <= 0:
+            break
+        peaks.append(index)
+        y, x = index
+        scores[max(y - spacing, 0) : y + spacing + 1, max(x - spacing, 0) : x + spacing + 1] = -1
+    return peaks
+
+
+# ============================================================================
+# TEMPLATES
+# ============================================================================
+
+
+class Template:
+    """A registered UI image, with its scaled/downsampled versions and their FFTs cached"""
+
+    def __init__(self, name: str, image):
+        self.name = name
+        self.pixels = _gray(image)
+        if self.pixels.std() < MIN_TEMPLATE_STD:
+            raise ValueError(f"template {name!r} is (almost) a flat colour - nothing to match")
+        self._variants: dict[float, list] = {}
+        self._spectra: dict[tuple, np.ndarray] = {}
+
+    def variant(self, scale: float) -> list:
+        """Template resized by `scale`, then halved per pyramid level: [level 0, level 1, ...]"""
+        if scale not in self._variants:
+            pixels = self.pixels
+            if scale != 1.0:
+                height, width = pixels.shape
+                size = (max(1, round(width * scale)), max(1, round(height * scale)))
+                resized = Image.fromarray(pixels).resize(size, Image.Resampling.BILINEAR)
+                pixels = np.asarray(resized, dtype=np.float32)
+            levels = [pixels]
+            while min(levels[-1].shape) >= 2 * config.LOCATE_MIN_TEMPLATE_PX:
+                levels.append(_halve(levels[-1]))
+            self._variants[scale] = levels
+        return self._variants[scale]
+
+    def spectrum(self, scale: float, level: int, shape: tuple) -> np.ndarray:
+        """Zero-mean FFT of a variant padded to a frame shape (frames keep the same size)"""
+        key = (scale, level, shape)
+        if key not in self._spectra:
+            pixels = self.variant(scale)[level]
+            self._spectra[key] = np.fft.rfft2(pixels - pixels.mean(), s=shape)
+        return self._spectra[key]
+
+
+def find(pyramid: ScreenPyramid, template: Template, scales: Optional[tuple] = None) -> dict:
+    """
+    Best match of one template in a frame, over all scales
+
+    Searches the coarsest usable level with FFT correlation, then refines the best
+    candidates at full resolution. Scales are tried in order until one matches
+    with CONFIDENT_SCORE.
+
+    Returns:
+        {"score", "scale", "left", "top", "width", "height"} in frame pixels
+    """
+    best = {"score": -1.0}
+    for scale in scales or config.LOCATE_SCALES:
+        variants = template.variant(scale)
+        level = min(len(variants), pyramid.depth) - 1
+        shape = pyramid.level(level).shape
+        if variants[level].shape[0] > shape[0] or variants[level].shape[1] > shape[1]:
+            continue
+        scores = match_scores(
+            pyramid, level, variants[level], template.spectrum(scale, level, shape)
+        )
+        if scores is None:
+            continue
+        factor = 2**level
+        height, width = variants[0].shape
+        for top, left in _peaks(scores, CANDIDATES, max(1, min(variants[level].shape) // 2)):
+            score, top, left = _local_scores(
+                pyramid.level(0), variants[0], top * factor, left * factor, factor + 1
+            )
+            if score > best["score"]:
+                best = {
+                    "score": score,
+                    "scale": scale,
+                    "left": left,
+                    "top": top,
+                    "width": width,
+                    "height": height,
+                }
+        if best["score"] >= CONFIDENT_SCORE:
+            break
+    return best
+
+
+# ============================================================================
+# LOCATOR
+# ============================================================================
+
+
+class ElementLocator:
+    """
+    Library of named UI templates, matched against one capture at a time.
+
+    Images in config.LOCATE_TEMPLATE_DIR are registered by file name on first use.
+
+    Usage:
+        locator = ElementLocator()
+        locator.register("save_button", "~/buttons/save.png")
+        locator.locate(["save_button", "cancel_button"], region="0,600,1280,200")
+        # {"save_button": {"found": True, "x": 512, "y": 700, "score": 0.97, ...}, ...}
+    """
+
+    def __init__(self, template_dir: Optional[str] = None):
+        self.template_dir = template_dir
+        self.templates: dict[str, Template] = {}
+        self._loaded_dir = False
+        self._frame: tuple[Any, Optional[ScreenPyramid]] = (
+            None,
+            None,
+        )  # (image, pyramid) of the last frame
+        self._lock = threading.Lock()
+
+    def register(self, name: str, image) -> Template:
+        """
+        Add or replace a template
+
+        Args:
+            name: Name used by locate()
+            image: PIL image, array, or path to an image file
+        """
+        if isinstance(image, str):
+            image = Image.open(os.path.expanduser(image))
+        template = Template(name, image)
+        self.templates[name] = template
+        return template
+
+    def register_from_screen(self, name: str, region, backend=None) -> Template:
+        """Capture a screen region and register it as a template"""
+        backend = backend or get_backend()
+        return self.register(name, backend.screenshot(parse_region(region)))
+
+    def _load_dir(self):
+        if self._loaded_dir:
+            return
+        self._loaded_dir = True
+        directory = os.path.expanduser(self.template_dir or config.LOCATE_TEMPLATE_DIR)
+        if not os.path.isdir(directory):
+            return
+        for entry in sorted(os.listdir(directory)):
+            stem, extension = os.path.splitext(entry)
+            if extension.lower() in IMAGE_EXTENSIONS and stem not in self.templates:
+                try:
+                    self.register(stem, os.path.join(directory, entry))
+                except (OSError, ValueError):
+                    continue
+
+    def names(self) -> list:
+        """Registered template names"""
+        self._load_dir()
+        return sorted(self.templates)
+
+    def pyramid(self, image) -> ScreenPyramid:
+        """Pyramid of a frame, reused while the same frame is matched again"""
+        with self._lock:
+            cached_image, cached = self._frame
+            if cached is None or cached_image is not image:
+                cached = ScreenPyramid(image)
+                self._frame = (image, cached)
+            return cached
+
+    def match(self, image, names: list, origin: tuple = (0, 0), ratio: float = 1.0) -> dict:
+        """
+        Match templates against one frame
+
+        Args:
+            image: Captured frame (PIL image or array)
+            names: Template names (or image file paths)
+            origin: Screen position of the frame's top-left corner (for region captures)
+            ratio: Frame pixels per screen point (2 on Retina)
+
+        Returns:
+            Name → {"found", "x", "y" (centre in screen points), "score", "scale", "box"}
+        """
+        self._load_dir()
+        pyramid = self.pyramid(image)
+        results = {}
+        for name in names:
+            template = self.templates.get(name)
+            if template is None and os.path.isfile(os.path.expanduser(name)):
+                template = self.register(name, name)
+            if template is None:
+                results[name] = {"found": False, "error": "unknown template"}
+                continue
+            best = find(pyramid, template)
+            if best["score"] < 0:
+                results[name] = {"found": False, "score": 0.0}
+                continue
+            left = origin[0] + best["left"] / ratio
+            top = origin[1] + best["top"] / ratio
+            width, height = best["width"] / ratio, best["height"] / ratio
+            results[name] = {
+                "found": best["score"] >= config.LOCATE_THRESHOLD,
+                "x": round(left + width / 2),
+                "y": round(top + height / 2),
+                "score": round(best["score"], 3),
+                "scale": best["scale"],
+                "box": (round(left), round(top), round(width), round(height)),
+            }
+        return results
+
+    def locate(self, names: list, region=None, backend=None) -> dict:
+        """
+        Capture the screen (or a region) once and match several templates against it
+
+        Returns:
+            As match(), plus "_elapsed_ms" for the capture and all matches
+        """
+        backend = backend or get_backend()
+        region = parse_region(region)
+        start = time.perf_counter()
+        image = backend.screenshot(region)
+        points = region[2] if region else backend.size()[0]
+        origin = region[:2] if region else (0, 0)
+        results = self.match(image, names, origin=origin, ratio=image.width / points)
+        results["_elapsed_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return results
+
+
+# Template library used by the locate_on_screen tool
+locator = ElementLocator()
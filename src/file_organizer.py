@@ -0,0 +1,143 @@
+"""
+File Organizer - In-Process Bulk Organization by File Type
+One scandir pass, only the folders needed, conflict-safe os.replace moves in a bounded pool
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src import config
+
+# Moves per pool task - keeps per-future overhead negligible on huge directories
+MOVE_CHUNK_SIZE = 256
+
+# Example file names kept per folder in the manifest
+MANIFEST_SAMPLES = 3
+
+
+def _unique_name(name: str, taken: set) -> str:
+    """
+    First free name in a folder: "a.jpg", then "a (1).jpg", "a (2).jpg", ...
+
+    Names are compared case-folded: on a case-insensitive file system (macOS,
+    Windows) "a.jpg" would replace an existing "A.jpg".
+
+    Args:
+        name: Desired file name
+        taken: Case-folded names already in (or reserved for) the folder - updated in place
+
+    Returns:
+        Free file name
+    """
+    if name.casefold() not in taken:
+        taken.add(name.casefold())
+        return name
+    stem, ext = os.path.splitext(name)
+    counter = 1
+    while f"{stem} ({counter}){ext}".casefold() in taken:
+        counter += 1
+    unique = f"{stem} ({counter}){ext}"
+    taken.add(unique.casefold())
+    return unique
+
+
+def _move_chunk(moves: list) -> list:
+    """Move (source, target) pairs; returns [(source name, error)] for failures"""
+    errors = []
+    for source, target in moves:
+        try:
+            os.replace(source, target)
+        except OSError as e:
+            errors.append((os.path.basename(source), e.strerror or str(e)))
+    return errors
+
+
+def organize(directory: str, categories: dict, dry_run: bool = False, max_workers: int = 0) -> dict:
+    """
+    Sort a directory's files into category folders by extension
+
+    Args:
+        directory: Directory to organize
+        categories: Folder name → (description, extensions)
+        dry_run: Only report what would move
+        max_workers: Thread pool size (default: config.ORGANIZE_MAX_WORKERS)
+
+    Returns:
+        Manifest: {"directory", "dry_run", "moved": {folder: count},
+        "samples": {folder: [names]}, "created": [folders], "renamed": {old: new},
+        "unmatched": {ext: count}, "errors": {name: reason}, "elapsed_s"}
+    """
+    start = time.perf_counter()
+    root = os.path.expanduser(directory)
+    folder_for = {
+        ext: folder for folder, (_, extensions) in categories.items() for ext in extensions
+    }
+
+    # One pass: classify files, note existing folders
+    by_folder: dict[str, list] = {}
+    unmatched: dict[str, int] = {}
+    existing_dirs = set()
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                existing_dirs.add(entry.name)
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+            ext = os.path.splitext(entry.name)[1].lower()
+            folder = folder_for.get(ext)
+            if folder:
+                by_folder.setdefault(folder, []).append(entry.name)
+            elif ext:
+                unmatched[ext] = unmatched.get(ext, 0) + 1
+
+    manifest: dict[str, Any] = {
+        "directory": directory,
+        "dry_run": dry_run,
+        "moved": {},
+        "samples": {},
+        "created": [],
+        "renamed": {},
+        "unmatched": unmatched,
+        "errors": {},
+        "elapsed_s": 0.0,
+    }
+
+    moves = []
+    for folder, names in by_folder.items():
+        target_dir = os.path.join(root, folder)
+        if folder in existing_dirs:
+            taken = {entry.casefold() for entry in os.listdir(target_dir)}
+        elif os.path.exists(target_dir):
+            manifest["errors"][folder] = "a file with this name is in the way"
+            continue
+        else:
+            taken = set()
+            manifest["created"].append(folder)
+            if not dry_run:
+                os.mkdir(target_dir)
+
+        # Conflicting names are resolved here, so parallel moves never collide
+        for name in sorted(names):
+            target_name = _unique_name(name, taken)
+            if target_name != name:
+                manifest["renamed"][name] = f"{folder}/{target_name}"
+            moves.append((os.path.join(root, name), os.path.join(target_dir, target_name)))
+        manifest["moved"][folder] = len(names)
+        manifest["samples"][folder] = sorted(names)[:MANIFEST_SAMPLES]
+
+    if not dry_run and moves:
+        chunks = [moves[i : i + MOVE_CHUNK_SIZE] for i in range(0, len(moves), MOVE_CHUNK_SIZE)]
+        workers = min(max_workers or config.ORGANIZE_MAX_WORKERS, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for errors in pool.map(_move_chunk, chunks):
+                manifest["errors"].update(errors)
+        for name in manifest["errors"]:
+            folder = folder_for.get(os.path.splitext(name)[1].lower())
+            if folder in manifest["moved"]:
+                manifest["moved"][folder] -= 1
+
+    manifest["elapsed_s"] = round(time.perf_counter() - start, 3)
+    return manifest
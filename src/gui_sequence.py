@@ -0,0 +1,207 @@
+"""
+GUI Sequence - Batched Mouse/Keyboard Macros
+Runs an ordered list of GUI actions locally in one tool call, with precise timing
+"""
+
+import json
+import time
+
+from src import config, motion, text_entry
+from src.input_backend import get_backend
+
+# ============================================================================
+# ACTION FORMAT
+# ============================================================================
+#
+# [{"action": "move", "x": 640, "y": 400},                 (human-like unless "fast": true)
+#  {"action": "click", "button": "left", "x": 640, "y": 400, "clicks": 1},  (x/y optional)
+#  {"action": "type", "text": "hello"},
+#  {"action": "key", "key": "enter", "times": 1},           (or a chord: "cmd+shift+4")
+#  {"action": "hotkey", "keys": ["command", "s"]},
+#  {"action": "wait", "seconds": 0.5}]
+#
+# Every action may add "pause" (seconds after it, default config.GUI_SEQUENCE_PAUSE_S).
+
+# Action → (required fields, optional fields)
+ACTIONS = {
+    "move": ({"x", "y"}, {"fast"}),
+    "click": (set(), {"button", "x", "y", "clicks"}),
+    "type": ({"text"}, {"interval"}),
+    "key": ({"key"}, {"times"}),
+    "hotkey": ({"keys"}, set()),
+    "wait": ({"seconds"}, set()),
+}
+
+BUTTONS = {"left", "right", "middle"}
+
+NUMERIC_FIELDS = {"x", "y", "clicks", "times", "seconds", "interval", "pause"}
+
+# Longest single wait or pause (a macro shouldn't stall the agent)
+MAX_WAIT_S = 10.0
+
+# Largest value of each numeric field (no stalls, no floods of input)
+MAX_VALUES = {
+    "seconds": MAX_WAIT_S,
+    "pause": MAX_WAIT_S,
+    "interval": 1.0,  # Seconds between typed characters
+    "times": 50,  # Key presses
+    "clicks": 3,
+}
+
+
+def parse_actions(actions: str) -> list:
+    """
+    Parse a sequence given as JSON ([...] or {"actions": [...]})
+
+    Raises:
+        ValueError: If it isn't a JSON list of action objects
+    """
+    try:
+        parsed = json.loads(actions) if isinstance(actions, str) else actions
+    except json.JSONDecodeError as e:
+        raise ValueError(f"actions must be a JSON list ({e.msg})") from e
+    if isinstance(parsed, dict):
+        parsed = parsed.get("actions")
+    if not isinstance(parsed, list) or not all(isinstance(item, dict) for item in parsed):
+        raise ValueError("actions must be a JSON list of objects")
+    return parsed
+
+
+def payloads(action: dict) -> list:
+    """Text an action sends to the machine (checked by is_safe before anything runs)"""
+    kind = action.get("action")
+    if kind == "type":
+        return [str(action["text"])]
+    if kind == "key":
+        return [str(action["key"])]
+    if kind == "hotkey":
+        return ["+".join(map(str, action["keys"]))]
+    return []
+
+
+def validate_actions(actions: list, is_safe) -> str:
+    """
+    Check every action before running any of them
+
+    Args:
+        actions: Parsed actions
+        is_safe: Safety check for text payloads (typed text, keys, hotkeys)
+
+    Returns:
+        Problem description, or "" if the sequence can run
+    """
+    if not actions:
+        return "sequence has no actions"
+    if len(actions) > config.GUI_SEQUENCE_MAX_ACTIONS:
+        return f"too many actions ({len(actions)} > {config.GUI_SEQUENCE_MAX_ACTIONS})"
+    for number, action in enumerate(actions, 1):
+        kind = action.get("action")
+        if kind not in ACTIONS:
+            return f"action {number}: unknown action {kind!r} (use: {', '.join(ACTIONS)})"
+        required, optional = ACTIONS[kind]
+        fields = set(action) - {"action", "pause"}
+        if required - fields:
+            return f"action {number} ({kind}): missing {', '.join(sorted(required - fields))}"
+        if fields - required - optional:
+            return f"action {number} ({kind}): unknown {', '.join(sorted(fields - required - optional))}"
+        for field in NUMERIC_FIELDS & set(action):
+            value = action[field]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                return f"action {number} ({kind}): {field} must be a non-negative number"
+            if field in MAX_VALUES and value > MAX_VALUES[field]:
+                return f"action {number} ({kind}): {field} must be at most {MAX_VALUES[field]:g}"
+        if kind == "click" and action.get("button", "left") not in BUTTONS:
+            return f"action {number}: button must be one of {', '.join(sorted(BUTTONS))}"
+        if kind == "click" and ("x" in action) != ("y" in action):
+            return f"action {number}: click needs both x and y (or neither)"
+        if kind == "hotkey" and not (isinstance(action["keys"], list) and action["keys"]):
+            return f"action {number}: hotkey keys must be a non-empty list"
+        for text in payloads(action):
+            if not is_safe(text):
+                return f"action {number} ({kind}): unsafe input blocked"
+    return ""
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+
+def _describe(action: dict) -> str:
+    """Short label for the result summary"""
+    kind = action["action"]
+    if kind == "move":
+        return f"move({action['x']},{action['y']})"
+    if kind == "click":
+        where = f"@({action['x']},{action['y']})" if "x" in action else ""
+        clicks = action.get("clicks", 1)
+        return (
+            f"click {action.get('button', 'left')}{'×' + str(clicks) if clicks > 1 else ''}{where}"
+        )
+    if kind == "type":
+        text = str(action["text"])
+        return f"type '{text[:20]}{'…' if len(text) > 20 else ''}'"
+    if kind == "key":
+        times = action.get("times", 1)
+        return f"key {action['key']}{'×' + str(times) if times > 1 else ''}"
+    if kind == "hotkey":
+        return f"hotkey {'+'.join(map(str, action['keys']))}"
+    return f"wait {action['seconds']}s"
+
+
+def _perform(action: dict, backend):
+    kind = action["action"]
+    if kind == "move":
+        motion.move(
+            int(action["x"]),
+            int(action["y"]),
+            "fast" if action.get("fast") else "",
+            backend=backend,
+        )
+    elif kind == "click":
+        if "x" in action:
+            motion.move(int(action["x"]), int(action["y"]), backend=backend)
+        backend.click(action.get("button", "left"), int(action.get("clicks", 1)))
+    elif kind == "type":
+        text_entry.enter_text(str(action["text"]), action.get("interval"), backend=backend)
+    elif kind == "key":
+        text_entry.press(str(action["key"]), int(action.get("times", 1)), backend=backend)
+    elif kind == "hotkey":
+        backend.hotkey(*(text_entry.normalize_key(str(key)) for key in action["keys"]))
+    elif kind == "wait":
+        backend.sleep(float(action["seconds"]))
+
+
+def run_sequence(actions: list, backend=None) -> dict:
+    """
+    Run validated actions in order, pausing precisely between them
+
+    Stops at the first action that raises; earlier actions stay done.
+
+    Args:
+        actions: Actions that passed validate_actions
+        backend: Input backend (default: the active one)
+
+    Returns:
+        {"completed": [labels], "failed": {"index", "action", "error"} or {}, "elapsed_s"}
+    """
+    backend = backend or get_backend()
+    start = time.perf_counter()
+    completed: list = []
+    for index, action in enumerate(actions):
+        try:
+            _perform(action, backend)
+        except Exception as e:
+            return {
+                "completed": completed,
+                "failed": {"index": index + 1, "action": _describe(action), "error": str(e)},
+                "elapsed_s": round(time.perf_counter() - start, 3),
+            }
+        completed.append(_describe(action))
+        if index < len(actions) - 1:
+            backend.sleep(float(action.get("pause", config.GUI_SEQUENCE_PAUSE_S)))
+    return {
+        "completed": completed,
+        "failed": {},
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
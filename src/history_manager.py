@@ -0,0 +1,192 @@
+"""
+History Manager - Token-Budgeted Conversation History
+One system prompt, the last N turns verbatim, a rolling summary of everything older
+"""
+
+import json
+from typing import Optional
+
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+    ToolMessage,
+)
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from src import config
+from src.cost_optimizer import estimate_tokens
+
+# Fixed ID of the summary message kept at the start of the thread
+SUMMARY_ID = "history-summary"
+
+# Placeholder for tool output dropped from older turns
+DROPPED_TOOL_OUTPUT = "[tool output dropped from history - re-run the tool if needed]"
+
+
+# ============================================================================
+# MESSAGE HELPERS
+# ============================================================================
+
+
+def _text(message) -> str:
+    """Message content as plain text"""
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def _message_tokens(message) -> int:
+    """Estimated tokens a message costs in the model input"""
+    tokens = estimate_tokens(_text(message)) + 4  # Role/formatting overhead
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += estimate_tokens(tool_call["name"] + json.dumps(tool_call.get("args", {})))
+    return tokens
+
+
+def _turns_tokens(turns: list) -> int:
+    return sum(_message_tokens(message) for turn in turns for message in turn)
+
+
+def _split_turns(messages: list) -> list:
+    """
+    Group messages into turns - each turn starts with a user message
+
+    Keeping whole turns together guarantees AI tool calls always stay
+    paired with their tool results.
+    """
+    turns: list = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def _clip(text: str, max_chars: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[: max_chars - 1] + "…"
+
+
+def _summarize_turn(turn: list) -> str:
+    """One summary line for a turn: request, tools used, final answer"""
+    request = next((_text(m) for m in turn if isinstance(m, HumanMessage)), "")
+    tool_counts: dict = {}
+    for message in turn:
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            tool_counts[tool_call["name"]] = tool_counts.get(tool_call["name"], 0) + 1
+    answer = next(
+        (_text(m) for m in reversed(turn) if isinstance(m, AIMessage) and _text(m).strip()),
+        "",
+    )
+
+    line = f"- User: {_clip(request, 150)}"
+    if tool_counts:
+        line += " | Tools: " + ", ".join(f"{name}×{count}" for name, count in tool_counts.items())
+    if answer:
+        line += f" | Result: {_clip(answer, 200)}"
+    return line
+
+
+# ============================================================================
+# HISTORY MANAGER
+# ============================================================================
+
+
+class HistoryManager:
+    """
+    Pre-model hook that keeps the model input within a token budget.
+
+    - Exactly one system prompt is sent (stale copies in the thread are ignored)
+    - The last `keep_turns` turns are kept verbatim
+    - Over budget, tool outputs of older turns are dropped first, then older
+      turns are folded into a rolling summary; only if the kept turns alone are
+      still too big do their tool outputs go too (never the current turn's)
+    - Full tool outputs (message artifacts) are dropped once a turn is done,
+      so checkpoints stay small
+
+    Usage:
+        create_react_agent(llm, tools, pre_model_hook=HistoryManager(SYSTEM_PROMPT))
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        max_tokens: Optional[int] = None,
+        keep_turns: Optional[int] = None,
+        summary_max_tokens: Optional[int] = None,
+    ):
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens or config.HISTORY_MAX_TOKENS
+        self.keep_turns = keep_turns or config.HISTORY_KEEP_TURNS
+        self.summary_max_tokens = summary_max_tokens or config.HISTORY_SUMMARY_MAX_TOKENS
+
+    def __call__(self, state: dict) -> dict:
+        summary = ""
+        messages = []
+        for message in state["messages"]:
+            if message.id == SUMMARY_ID:
+                summary = _text(message)
+            elif not isinstance(message, SystemMessage):
+                messages.append(message)
+
+        turns = _split_turns(messages)
+        changed = len(messages) != len(state["messages"]) - (1 if summary else 0)
+
+        # Full outputs were already shown on the console - keep them out of checkpoints
+        for turn in turns[:-1]:
+            for i, message in enumerate(turn):
+                if isinstance(message, ToolMessage) and message.artifact is not None:
+                    turn[i] = message.model_copy(update={"artifact": None})
+                    changed = True
+
+        budget = self.max_tokens - _message_tokens(self._system_message(summary))
+
+        # 1. Drop tool outputs of turns older than the last N, oldest first
+        older = max(0, len(turns) - self.keep_turns)
+        changed |= self._drop_tool_outputs(turns, turns[:older], budget)
+
+        # 2. Fold those older turns into the rolling summary
+        if _turns_tokens(turns) > budget and older:
+            summary = self._fold(summary, turns[:older])
+            turns = turns[older:]
+            changed = True
+            budget = self.max_tokens - _message_tokens(self._system_message(summary))
+
+        # 3. Still too big: tool outputs of the kept turns (never from the current turn)
+        changed |= self._drop_tool_outputs(turns, turns[:-1], budget)
+
+        kept = [message for turn in turns for message in turn]
+        update = {"llm_input_messages": [self._system_message(summary), *kept]}
+        if changed:
+            stored = [SystemMessage(content=summary, id=SUMMARY_ID)] if summary else []
+            update["messages"] = [RemoveMessage(id=REMOVE_ALL_MESSAGES), *stored, *kept]
+        return update
+
+    def _system_message(self, summary: str) -> SystemMessage:
+        """The one system prompt sent to the model, with the rolling summary appended"""
+        content = self.system_prompt
+        if summary:
+            content += f"\n\nEarlier in this conversation (summary):\n{summary}"
+        return SystemMessage(content=content)
+
+    @staticmethod
+    def _drop_tool_outputs(turns: list, candidates: list, budget: int) -> bool:
+        """Replace tool outputs in `candidates` (oldest first) until `turns` fit the budget"""
+        changed = False
+        for turn in candidates:
+            if _turns_tokens(turns) <= budget:
+                break
+            for i, message in enumerate(turn):
+                if isinstance(message, ToolMessage) and _text(message) != DROPPED_TOOL_OUTPUT:
+                    turn[i] = message.model_copy(update={"content": DROPPED_TOOL_OUTPUT})
+                    changed = True
+        return changed
+
+    def _fold(self, summary: str, turns: list) -> str:
+        """Append folded turns to the summary, trimming the oldest lines to fit"""
+        lines = summary.splitlines() if summary else []
+        lines.extend(_summarize_turn(turn) for turn in turns)
+        while len(lines) > 1 and estimate_tokens("\n".join(lines)) > self.summary_max_tokens:
+            lines.pop(0)
+        return "\n".join(lines)
@@ -0,0 +1,196 @@
+"""
+Input Backend - Pluggable Mouse/Keyboard Driver
+pyautogui for the real desktop (imported on first use), a recording backend for benchmarks and tests
+"""
+
+import sys
+import time
+from typing import Optional
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+
+class PyAutoGUIBackend:
+    """
+    Drives the real mouse and keyboard through pyautogui.
+
+    pyautogui is imported on first use (importing it needs a display), and
+    its per-call PAUSE is skipped - callers pace their own steps.
+    """
+
+    name = "pyautogui"
+
+    def __init__(self):
+        self._gui = None
+
+    @property
+    def gui(self):
+        if self._gui is None:
+            import pyautogui
+
+            self._gui = pyautogui
+        return self._gui
+
+    def position(self) -> tuple:
+        x, y = self.gui.position()
+        return int(x), int(y)
+
+    def size(self) -> tuple:
+        width, height = self.gui.size()
+        return int(width), int(height)
+
+    def move_to(self, x: float, y: float):
+        self.gui.moveTo(x, y, _pause=False)
+
+    def click(self, button: str = "left", clicks: int = 1):
+        self.gui.click(button=button, clicks=clicks, interval=0.05, _pause=False)
+
+    def write(self, text: str, interval: float = 0.0):
+        self.gui.write(text, interval=interval, _pause=False)
+
+    def press(self, key: str, presses: int = 1):
+        self.gui.press(key, presses=presses, interval=0.05, _pause=False)
+
+    def hotkey(self, *keys: str):
+        self.gui.hotkey(*keys, _pause=False)
+
+    def screenshot(self, region: Optional[tuple] = None):
+        """
+        PIL image of the screen, or of region (left, top, width, height) in screen points
+        """
+        if region is None:
+            return self.gui.screenshot()
+        if sys.platform != "darwin":
+            return self.gui.screenshot(region=tuple(int(v) for v in region))
+        # macOS captures in pixels (2x on Retina) - crop the full frame in pixel units
+        image = self.gui.screenshot()
+        scale = image.width / self.size()[0]
+        left, top, width, height = (round(v * scale) for v in region)
+        return image.crop((left, top, left + width, top + height))
+
+    def get_clipboard(self) -> str:
+        import pyperclip
+
+        return str(pyperclip.paste())
+
+    def set_clipboard(self, text: str):
+        import pyperclip
+
+        pyperclip.copy(text)
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+
+class RecordingBackend:
+    """
+    Records input events instead of sending them, on a virtual clock.
+
+    sleep() advances the clock without waiting, so timing can be measured
+    offline and instantly.
+
+    Usage:
+        backend = RecordingBackend(start=(0, 0))
+        set_backend(backend)
+        ...
+        backend.events  # [(clock, action, args), ...]
+    """
+
+    name = "recording"
+
+    def __init__(self, start: tuple = (0, 0), screen: tuple = (1920, 1080), frames=None):
+        self.cursor = start
+        self.screen = screen
+        self.clock = 0.0
+        self.events: list = []
+        self.clipboard = ""
+        # Screen contents: callable(clock) → PIL image of the whole screen (default: plain grey)
+        self.frames = frames
+
+    def _record(self, action: str, *args):
+        self.events.append((self.clock, action, args))
+
+    def position(self) -> tuple:
+        return int(self.cursor[0]), int(self.cursor[1])
+
+    def size(self) -> tuple:
+        return self.screen
+
+    def move_to(self, x: float, y: float):
+        self.cursor = (x, y)
+        self._record("move_to", x, y)
+
+    def click(self, button: str = "left", clicks: int = 1):
+        self._record("click", button, clicks)
+        self.clock += 0.05 * (clicks - 1)
+
+    def write(self, text: str, interval: float = 0.0):
+        self._record("write", text)
+        self.clock += interval * len(text)
+
+    def press(self, key: str, presses: int = 1):
+        self._record("press", key, presses)
+        self.clock += 0.05 * (presses - 1)
+
+    def hotkey(self, *keys: str):
+        self._record("hotkey", *keys)
+
+    def screenshot(self, region: Optional[tuple] = None):
+        self._record("screenshot", region)
+        if self.frames is not None:
+            image = self.frames(self.clock)
+        else:
+            from PIL import Image
+
+            image = Image.new("RGB", self.screen, (48, 48, 48))
+        if region is None:
+            return image
+        left, top, width, height = (int(v) for v in region)
+        return image.crop((left, top, left + width, top + height))
+
+    def get_clipboard(self) -> str:
+        return self.clipboard
+
+    def set_clipboard(self, text: str):
+        self.clipboard = text
+        self._record("set_clipboard", text)
+
+    def sleep(self, seconds: float):
+        self.clock += max(seconds, 0.0)
+
+    def now(self) -> float:
+        return self.clock
+
+    def count(self, action: str) -> int:
+        """Number of recorded events of one kind"""
+        return sum(1 for _, recorded, _ in self.events if recorded == action)
+
+
+_backend = {"current": None}
+
+
+def get_backend():
+    """Active input backend (pyautogui unless another one was set)"""
+    if _backend["current"] is None:
+        _backend["current"] = PyAutoGUIBackend()
+    return _backend["current"]
+
+
+def set_backend(backend):
+    """
+    Replace the input backend
+
+    Args:
+        backend: PyAutoGUIBackend, RecordingBackend or any object with the same methods
+
+    Returns:
+        The previous backend (to restore it later)
+    """
+    previous = _backend["current"]
+    _backend["current"] = backend
+    return previous
@@ -0,0 +1,297 @@
+"""
+Intent Router - Deterministic Fast Path for Simple Commands
+Answers one-tool commands ("list files in Downloads", "open Chrome") without any LLM call
+"""
+
+import re
+import time
+
+from src.agent_tools import (
+    check_running_apps,
+    get_current_directory,
+    get_screen_info,
+    list_directory,
+    open_app,
+    open_url,
+    take_screenshot,
+)
+
+# ============================================================================
+# GRAMMAR
+# ============================================================================
+
+# Folder words → paths (anything else must be an explicit ~/ or / path)
+KNOWN_FOLDERS = {
+    "desktop": "~/Desktop",
+    "downloads": "~/Downloads",
+    "documents": "~/Documents",
+    "docs": "~/Documents",
+    "pictures": "~/Pictures",
+    "photos": "~/Pictures",
+    "music": "~/Music",
+    "movies": "~/Movies",
+    "videos": "~/Movies",
+    "home": "~",
+    "home folder": "~",
+    "home directory": "~",
+}
+
+# Spoken app names → macOS application names
+APP_ALIASES = {
+    "chrome": "Google Chrome",
+    "google chrome": "Google Chrome",
+    "vscode": "Visual Studio Code",
+    "vs code": "Visual Studio Code",
+    "code": "Visual Studio Code",
+    "word": "Microsoft Word",
+    "excel": "Microsoft Excel",
+    "powerpoint": "Microsoft PowerPoint",
+    "outlook": "Microsoft Outlook",
+    "teams": "Microsoft Teams",
+    "terminal": "Terminal",
+    "finder": "Finder",
+    "safari": "Safari",
+    "firefox": "Firefox",
+    "slack": "Slack",
+    "spotify": "Spotify",
+    "notes": "Notes",
+    "calendar": "Calendar",
+    "mail": "Mail",
+    "messages": "Messages",
+    "music app": "Music",
+    "calculator": "Calculator",
+    "preview": "Preview",
+    "zoom": "zoom.us",
+}
+
+# Bare domains ("github.com") must end in one of these - file extensions like .pdf, .py,
+# .md or .zip aren't here, so "open report.pdf" is never taken for a website
+WEB_TLDS = {
+    "com",
+    "org",
+    "net",
+    "edu",
+    "gov",
+    "io",
+    "dev",
+    "co",
+    "uk",
+    "us",
+    "ca",
+    "de",
+    "fr",
+    "nl",
+    "eu",
+    "au",
+    "jp",
+    "tv",
+    "info",
+}
+
+# Anything that chains, qualifies or refers back goes to the model
+_AMBIGUOUS_RE = re.compile(
+    r"\b(and|then|after|before|if|unless|but|also|them|it|those|these|that)\b|[,;]",
+    re.IGNORECASE,
+)
+
+_POLITE_RE = re.compile(
+    r"^(please |can you |could you |would you |hey |ok )+|( please|\?|!|\.)+$", re.IGNORECASE
+)
+
+_FOLDER = r"(?:my |the )?(?P<folder>~?/[\w ./~-]*|[a-z ]+?)(?: folder| directory| dir)?"
+
+# (intent, tool, pattern) - patterns must match the whole normalized command
+_GRAMMAR = [
+    (
+        "list_directory",
+        list_directory,
+        rf"(?:list|show|display|ls)(?: me)?(?: all)?(?: the)?(?: files| contents| items| stuff)?"
+        rf"(?: (?:in|of|on|inside))? {_FOLDER}",
+    ),
+    (
+        "list_directory",
+        list_directory,
+        rf"what(?:'s| is| are)(?: the files)? (?:in|on|inside) {_FOLDER}",
+    ),
+    (
+        "get_current_directory",
+        get_current_directory,
+        r"pwd|where am i|(?:what(?:'s| is) )?(?:the |my )?(?:current|working|current working)"
+        r" (?:directory|folder|dir|path)",
+    ),
+    (
+        "check_running_apps",
+        check_running_apps,
+        r"(?:show|list|check|get)(?: me)?(?: the| my)? (?:running|open) (?:apps|applications)"
+        r"|(?:what|which) (?:apps|applications) are (?:running|open)",
+    ),
+    (
+        "take_screenshot",
+        take_screenshot,
+        r"(?:take |grab |capture )?(?:a )?screenshot",
+    ),
+    (
+        "get_screen_info",
+        get_screen_info,
+        r"(?:what(?:'s| is) the |show |get )?(?:the )?(?:screen (?:size|resolution|info)"
+        r"|mouse position)|where is the (?:mouse|cursor)",
+    ),
+    (
+        "open_url",
+        open_url,
+        r"(?:open|go to|visit|browse to|load) (?P<url>(?:https?://)?(?:www\.)?[a-z0-9-]+"
+        r"(?:\.[a-z0-9-]+)*\.[a-z]{2,}(?:/\S*)?)",
+    ),
+    (
+        "open_app",
+        open_app,
+        r"(?:open|launch|start|run)(?: the)? (?P<app>[a-z][a-z0-9 .]{0,30}?)(?: app| application)?",
+    ),
+]
+
+_COMPILED = [
+    (intent, tool, re.compile(pattern, re.IGNORECASE)) for intent, tool, pattern in _GRAMMAR
+]
+
+
+def _normalize(prompt: str) -> str:
+    """Single-spaced, without politeness or trailing punctuation (case kept for paths)"""
+    text = " ".join(prompt.split())
+    return _POLITE_RE.sub("", text).strip()
+
+
+def _folder_path(folder: str) -> str:
+    """Path for a folder word or explicit path, or "" if it isn't one we know"""
+    folder = folder.strip()
+    if folder.startswith(("~", "/")):
+        return folder
+    return KNOWN_FOLDERS.get(folder.lower(), "")
+
+
+def _url(url: str) -> str:
+    """Full URL for a matched address, or "" if it looks like a file name rather than a site"""
+    if url.lower().startswith(("http://", "https://")):
+        return url
+    host = url.split("/", 1)[0].lower()
+    if host.startswith("www.") or host.rsplit(".", 1)[-1] in WEB_TLDS:
+        return f"https://{url}"
+    return ""
+
+
+def match(prompt: str):
+    """
+    Match a command against the grammar
+
+    Args:
+        prompt: User command
+
+    Returns:
+        (intent, tool, args) or None if the command should go to the model
+    """
+    text = _normalize(prompt)
+    if not text or _AMBIGUOUS_RE.search(text):
+        return None
+
+    for intent, tool, pattern in _COMPILED:
+        found = pattern.fullmatch(text)
+        if not found:
+            continue
+        groups = found.groupdict()
+        if "folder" in groups:
+            path = _folder_path(groups["folder"])
+            if not path:
+                continue
+            return intent, tool, {"directory_path": path}
+        if "url" in groups:
+            url = _url(groups["url"])
+            if not url:
+                continue
+            return intent, tool, {"url": url}
+        if "app" in groups:
+            app = APP_ALIASES.get(groups["app"].strip().lower())
+            if not app:
+                continue
+            return intent, tool, {"app_name": app}
+        if intent == "take_screenshot":
+            return intent, tool, {"save": True}  # Asked for by the user - keep the file
+        return intent, tool, {}
+    return None
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+
+class IntentRouter:
+    """
+    Runs simple commands directly and keeps hit-rate and latency stats.
+
+    Usage:
+        router = IntentRouter()
+        hit = router.route("list files in Downloads")
+        if hit is None:
+            ...  # Hand the command to the agent
+    """
+
+    def __init__(self):
+        self.hits = {}  # Intent → count
+        self.misses = 0
+        self.match_seconds = 0.0
+        self.tool_seconds = 0.0
+
+    def route(self, prompt: str):
+        """
+        Answer a command without the model if the grammar matches it
+
+        Args:
+            prompt: User command
+
+        Returns:
+            {"intent", "tool", "args", "output"} or None (send to the model)
+        """
+        start = time.perf_counter()
+        matched = match(prompt)
+        self.match_seconds += time.perf_counter() - start
+        if matched is None:
+            self.misses += 1
+            return None
+
+        intent, tool, args = matched
+        start = time.perf_counter()
+        output = tool.invoke(args)
+        self.tool_seconds += time.perf_counter() - start
+        self.hits[intent] = self.hits.get(intent, 0) + 1
+        return {"intent": intent, "tool": tool.name, "args": args, "output": output}
+
+    def stats(self) -> dict:
+        """Hit rate and latency of the routed commands"""
+        hits = sum(self.hits.values())
+        total = hits + self.misses
+        return {
+            "commands": total,
+            "hits": hits,
+            "misses": self.misses,
+            "hit_rate": hits / total if total else 0.0,
+            "hits_by_intent": dict(self.hits),
+            "avg_match_ms": self.match_seconds / total * 1000 if total else 0.0,
+            "avg_tool_ms": self.tool_seconds / hits * 1000 if hits else 0.0,
+        }
+
+    def print_stats(self):
+        """Print fast-path hit rate and latency"""
+        stats = self.stats()
+        print("\n" + "=" * 70)
+        print("⚡ FAST PATH (no model call)")
+        print("=" * 70)
+        print(
+            f"Commands: {stats['commands']} | Answered directly: {stats['hits']} "
+            f"({stats['hit_rate']:.0%}) | Sent to model: {stats['misses']}"
+        )
+        print(
+            f"Latency: {stats['avg_match_ms']:.3f} ms to match, "
+            f"{stats['avg_tool_ms']:.1f} ms per direct tool call"
+        )
+        for intent, count in sorted(stats["hits_by_intent"].items(), key=lambda item: -item[1]):
+            print(f"   {intent}: {count}")
+        print("=" * 70 + "\n")
@@ -0,0 +1,321 @@
+"""
+Launcher - Non-Blocking App/URL Launch with Readiness Detection
+`open` on macOS, gtk-launch/xdg-open on Linux; reports when the app's process or window appears
+"""
+
+import json
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from src import config
+from src.process_monitor import desktop_entries, monitor
+
+# Launch-to-ready times per app (persisted)
+LAUNCH_TIMES_FILE = Path.home() / ".ai_robot_launch_times.json"
+
+# Desktop entry Exec field codes (%u, %F, ...) - dropped when running an Exec line directly
+FIELD_CODES = {"%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m"}
+
+# AppleScript counting the windows of the process named by its first argument
+WINDOW_COUNT_SCRIPT = [
+    "on run argv",
+    'tell application "System Events" to count windows of process (item 1 of argv)',
+    "end run",
+]
+
+# ============================================================================
+# PLATFORM BACKENDS
+# ============================================================================
+
+
+class MacLauncher:
+    """Launches through `open`; windows are counted via System Events (if permitted)"""
+
+    name = "macos"
+
+    def resolve(self, app_name: str) -> dict:
+        """{"name": app name for process/window checks, "command", "opener": exits right away}"""
+        name = app_name.removesuffix(".app")
+        return {"name": name, "command": ["open", "-a", name], "opener": True}
+
+    def url_command(self, url: str) -> list:
+        return ["open", url]
+
+    def window_count(self, app_name: str):
+        """Open windows of an app, or None if they can't be counted"""
+        # The name is passed as an argument, never pasted into the script
+        command = ["osascript", *(arg for line in WINDOW_COUNT_SCRIPT for arg in ("-e", line))]
+        try:
+            result = subprocess.run([*command, app_name], capture_output=True, text=True, timeout=2)
+            return int(result.stdout.strip()) if result.returncode == 0 else None
+        except (OSError, ValueError, subprocess.TimeoutExpired):
+            return None
+
+
+class LinuxLauncher:
+    """
+    Launches desktop apps by their .desktop entry (gtk-launch, or the Exec line)
+    and URLs through xdg-open; windows are listed with wmctrl when installed.
+    """
+
+    name = "linux"
+
+    def __init__(self, app_dirs: Optional[list] = None):
+        self.app_dirs = app_dirs
+        self._window_classes: dict[str, set] = {}  # App name → WM_CLASS names its windows use
+
+    def resolve(self, app_name: str) -> dict:
+        """
+        Only desktop entries count as apps - a bare program on PATH is never run.
+
+        Raises:
+            ValueError: If no installed app has that name
+        """
+        wanted = app_name.lower()
+        for entry in desktop_entries(self.app_dirs):
+            if wanted in (entry["name"].lower(), entry["id"].lower(), entry["program"].lower()):
+                # Windows carry the WM_CLASS, not the display name ("Navigator.firefox"
+                # for "Firefox Web Browser")
+                self._window_classes[entry["name"]] = {
+                    key.lower() for key in (entry["wm_class"], entry["program"], entry["id"]) if key
+                }
+                if shutil.which("gtk-launch"):
+                    return {
+                        "name": entry["name"],
+                        "command": ["gtk-launch", entry["id"]],
+                        "opener": True,
+                    }
+                command = [word for word in shlex.split(entry["exec"]) if word not in FIELD_CODES]
+                return {"name": entry["name"], "command": command, "opener": False}
+        raise ValueError(f"no installed app named '{app_name}'")
+
+    def url_command(self, url: str) -> list:
+        return ["xdg-open", url]
+
+    def window_count(self, app_name: str):
+        """Windows whose WM_CLASS (instance.class) names a resolved app, or None without wmctrl"""
+        if not shutil.which("wmctrl"):
+            return None
+        try:
+            result = subprocess.run(["wmctrl", "-lx"], capture_output=True, text=True, timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        keys = self._window_classes.get(app_name, {app_name.lower()})
+        count = 0
+        for line in result.stdout.splitlines():
+            fields = line.split(None, 3)  # Window ID, desktop, WM_CLASS, host and title
+            if len(fields) < 3:
+                continue
+            wm_class = fields[2].lower()
+            count += any(
+                wm_class == key or wm_class.startswith(key + ".") or wm_class.endswith("." + key)
+                for key in keys
+            )
+        return count
+
+
+def platform_launcher(platform: Optional[str] = None):
+    """
+    Launcher backend for a platform (default: this machine)
+
+    Raises:
+        RuntimeError: On platforms without a backend
+    """
+    platform = platform or sys.platform
+    if platform == "darwin":
+        return MacLauncher()
+    if platform.startswith("linux"):
+        return LinuxLauncher()
+    raise RuntimeError(f"launching apps isn't supported on {platform}")
+
+
+# ============================================================================
+# LAUNCHES
+# ============================================================================
+
+
+class Launch:
+    """
+    One app/URL launch, watched in the background until it is ready.
+
+    state: "launching" → "ready" | "failed" | "timeout"; signal says what made it
+    ready ("window", "process", "opened" for URLs, "already running").
+    """
+
+    def __init__(self, target: str, kind: str):
+        self.target = target
+        self.kind = kind
+        self.state = "launching"
+        self.signal = ""
+        self.error = ""
+        self.started = time.monotonic()
+        self.ready_s: Optional[float] = None
+        self._done = threading.Event()
+
+    def finish(self, state: str, signal: str = "", error: str = ""):
+        self.state, self.signal, self.error = state, signal, error
+        if state == "ready" and self.ready_s is None:
+            self.ready_s = round(time.monotonic() - self.started, 3)
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> "Launch":
+        """Block until ready/failed/timed out, or for at most `timeout` seconds"""
+        self._done.wait(timeout)
+        return self
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+
+class Launcher:
+    """
+    Starts apps and URLs without waiting on the launch command, then watches for
+    readiness in a background thread: the app's first window, or its process
+    if that shows up first. Launch-to-ready times are kept per app.
+
+    Usage:
+        launcher = Launcher()
+        launch = launcher.open_app("Safari").wait(10)
+        launch.state, launch.ready_s  # ("ready", 1.42)
+    """
+
+    def __init__(self, backend=None, processes=None, times_file: Optional[Path] = None):
+        self._backend = backend
+        self.processes = processes or monitor
+        self.times_file = times_file or LAUNCH_TIMES_FILE
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = platform_launcher()
+        return self._backend
+
+    def _start(self, command: list, opener: bool):
+        # Openers exit right away and say why they failed; an app run directly keeps
+        # running, so its output must not fill a pipe nobody reads
+        return subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE if opener else subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    def open_app(self, app_name: str, timeout: Optional[float] = None) -> Launch:
+        """
+        Launch an app (or bring it to the front if it is already running)
+
+        Args:
+            app_name: App name ("Safari", "Visual Studio Code", "firefox")
+            timeout: Longest readiness watch (default: config.LAUNCH_READY_TIMEOUT_S)
+        """
+        launch = Launch(app_name, "app")
+        try:
+            target = self.backend.resolve(app_name)
+            launch.target = target["name"]
+            already = self.processes.is_running(target["name"], max_age=0)
+            process = self._start(target["command"], target["opener"])
+        except Exception as e:
+            launch.finish("failed", error=str(e))
+            return launch
+        if already:
+            launch.finish("ready", "already running")
+            return launch
+        self._watch(launch, process, timeout)
+        return launch
+
+    def open_url(self, url: str, timeout: Optional[float] = None) -> Launch:
+        """Open a URL in the default browser; ready once the opener has handed it over"""
+        launch = Launch(url, "url")
+        try:
+            process = self._start(self.backend.url_command(url), opener=True)
+        except Exception as e:
+            launch.finish("failed", error=str(e))
+            return launch
+        self._watch(launch, process, timeout)
+        return launch
+
+    def _watch(self, launch: Launch, process, timeout: Optional[float] = None):
+        timeout = config.LAUNCH_READY_TIMEOUT_S if timeout is None else timeout
+        thread = threading.Thread(
+            target=self._poll, args=(launch, process, timeout), name="launch-watch", daemon=True
+        )
+        thread.start()
+
+    def _poll(self, launch: Launch, process, timeout: float):
+        deadline = launch.started + timeout
+        while True:
+            code = process.poll()
+            if code:
+                error = (
+                    process.stderr.read().decode(errors="replace").strip() if process.stderr else ""
+                )
+                launch.finish("failed", error=error or f"launcher exited with code {code}")
+                return
+            if launch.kind == "url":
+                if code == 0:
+                    launch.finish("ready", "opened")
+                    return
+            else:
+                windows = self.backend.window_count(launch.target)
+                if windows:
+                    self._ready(launch, "window")
+                    return
+                # Without a window (or a way to count them), the process showing up is
+                # the best signal - some apps' windows never match what was launched
+                if self.processes.is_running(launch.target, max_age=0):
+                    self._ready(launch, "process")
+                    return
+            if time.monotonic() >= deadline:
+                launch.finish("timeout")
+                return
+            time.sleep(config.LAUNCH_POLL_S)
+
+    def _ready(self, launch: Launch, signal: str):
+        ready_s = round(time.monotonic() - launch.started, 3)
+        launch.ready_s = ready_s
+        self.record(launch.target, ready_s)  # Before waiters wake up
+        launch.finish("ready", signal)
+
+    # ------------------------------------------------------------------------
+    # Launch times
+    # ------------------------------------------------------------------------
+
+    def launch_times(self) -> dict:
+        """App → {"launches", "last_s", "mean_s", "max_s"}"""
+        try:
+            with open(self.times_file) as f:
+                times: dict = json.load(f)
+            return times
+        except Exception:
+            return {}
+
+    def record(self, app_name: str, seconds: float):
+        """Add one launch-to-ready time for an app"""
+        with self._lock:
+            times = self.launch_times()
+            entry = times.get(app_name, {"launches": 0, "mean_s": 0.0, "max_s": 0.0})
+            count = entry["launches"] + 1
+            times[app_name] = {
+                "launches": count,
+                "last_s": seconds,
+                "mean_s": round(entry["mean_s"] + (seconds - entry["mean_s"]) / count, 3),
+                "max_s": max(entry["max_s"], seconds),
+            }
+            try:
+                with open(self.times_file, "w") as f:
+                    json.dump(times, f, indent=2)
+            except Exception:
+                pass
+
+
+# Shared by open_app/open_url
+launcher = Launcher()
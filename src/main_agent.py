@@ -1,32 +1,58 @@
-from langgraph.checkpoint.memory import MemorySaver
+from typing import Optional
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langgraph.prebuilt import create_react_agent
 from prompt_toolkit import PromptSession
 from prompt_toolkit.history import InMemoryHistory
 
+from src import config, response_format, safety, verification
 from src.agent_tools import (
-    DANGEROUS_COMMANDS,
     check_running_apps,
     clear_memory,
     click_mouse,
     debug_last_error,
+    execute_plan,
     execute_terminal_command,
     get_current_directory,
     get_screen_info,
+    gui_sequence,
     list_directory,
+    locate_on_screen,
     move_mouse,
     open_app,
     open_url,
+    organize_directory,
     plan_task,
     press_key,
     read_file_content,
     recall_from_memory,
     save_to_memory,
+    search_content,
     search_file,
     self_critique,
     take_screenshot,
     type_text,
     verify_expectations,
+    wait_for_screen_stable,
+)
+from src.history_manager import HistoryManager
+from src.intent_router import IntentRouter
+from src.output_shaper import shape_output
+from src.prompt_bundles import build_bundle, print_bundle
+from src.session_store import (
+    STATUS_DONE,
+    STATUS_FAILED,
+    STATUS_RUNNING,
+    SessionStore,
+    new_session_id,
 )
+from src.step_monitor import LoopDetectedError, StepMonitor
+from src.task_classifier import log_outcome
+from src.token_meter import UsageMeter, print_daily_usage
+from src.tool_call_recovery import ToolCallRecovery
+from src.tool_selector import ToolSelector
+from src.trajectory_store import TrajectoryStore
 
 # ============================================================================
 # SYSTEM PROMPTS - Different prompts for different model types
@@ -36,30 +62,21 @@ from src.agent_tools import (
 LOCAL_MODEL_PROMPT = """You control the computer by CALLING TOOLS. Don't describe actions - DO THEM!
 
 RULES:
-1. When you see files, CREATE folders for those types ONLY
-2. Use execute_terminal_command() to run commands
+1. To organize a folder by file type, call organize_directory() - it creates ONLY the folders needed and moves the files
+2. Use execute_terminal_command() to run other commands
 3. ALWAYS call tools, NEVER just describe what to do
 
-FILE TYPE → FOLDER:
-.jpg, .jpeg, .png → Images/
-.pdf, .doc, .txt → Documents/
-.mp4, .mov, .avi → Videos/
-
 EXAMPLE - "Organize Desktop":
 
 User: "Organize Desktop by file type"
-You already called: list_directory("~/Desktop")
-Result: "2 .jpg, 3 .pdf, 1 .mp4"
 
-NOW DO THIS (actually call these tools):
-1. execute_terminal_command("mkdir ~/Desktop/Images ~/Desktop/Documents ~/Desktop/Videos")
-2. execute_terminal_command("mv ~/Desktop/*.jpg ~/Desktop/*.jpeg ~/Desktop/Images")
-3. execute_terminal_command("mv ~/Desktop/*.pdf ~/Desktop/Documents")
-4. execute_terminal_command("mv ~/Desktop/*.mp4 ~/Desktop/Videos")
+NOW DO THIS (actually call the tool):
+organize_directory("~/Desktop")
 
 DON'T say "Step 1: Call X" - ACTUALLY CALL X!
 
 Available tools:
+- organize_directory(directory_path)
 - list_directory(directory_path)
 - execute_terminal_command(command)
 - open_app(app_name)
@@ -117,45 +134,53 @@ Example - File Organization:
 - list_directory(directory_path) - See what files/folders exist
 - execute_terminal_command(command) - Run shell commands
 - read_file_content(filepath) - Read file contents
+- search_content(query, directory) - Find text inside files
 - get_current_directory() - Get current location
+- organize_directory(directory_path, dry_run) - Sort files into type folders in one call
 
 **Computer Control:**
 - move_mouse, click_mouse, type_text, press_key
+- gui_sequence - Several clicks/keys/typing in ONE call
 - open_app, open_url, check_running_apps
 
 **Advanced:**
 - plan_task - Create intelligent plans based on actual observations
+- execute_plan - Run a plan_task plan (plan_id) in one call
 - save_to_memory, recall_from_memory - Learn across sessions
-- take_screenshot, get_screen_info - Visual debugging
-- verify_expectations, self_critique - Self-awareness
+- take_screenshot, get_screen_info, wait_for_screen_stable, locate_on_screen - Screen checks
+- verify_expectations (declarative file checks), self_critique - Self-awareness
 - debug_last_error - Error recovery
 
 💡 KEY WORKFLOW:
 1. Use list_directory() to see what's actually there
 2. Use plan_task() to create a smart plan based on observations
-3. Execute only what's needed
+3. Execute only what's needed - execute_plan(plan_id) runs a whole plan in one call
 4. Verify your work
 
 💡 REMEMBER: You're intelligent. Think, reason, adapt. Don't blindly follow patterns."""
 
-# List of all tools (21 total - Professional Grade!)
+# List of all tools (27 total - Professional Grade!)
 tools = [
-    # Computer control (8 tools)
+    # Computer control (9 tools)
     move_mouse,
     click_mouse,
     type_text,
     press_key,
+    gui_sequence,  # Batched mouse/keyboard actions in one call
     search_file,
     open_app,
     open_url,
     check_running_apps,
-    # File operations (4 tools)
+    # File operations (6 tools)
     execute_terminal_command,
     get_current_directory,
     read_file_content,
+    search_content,  # Parallel in-process grep
     list_directory,
-    # Professional features (9 tools)
+    organize_directory,  # Bulk sort by file type in one call
+    # Professional features (12 tools)
     plan_task,  # NEW: Intelligent planning before action
+    execute_plan,  # Runs plan_task's structured plan locally
     self_critique,
     verify_expectations,  # Self-awareness
     save_to_memory,
@@ -164,12 +189,15 @@ tools = [
     debug_last_error,  # Error recovery
     take_screenshot,
     get_screen_info,  # Debugging
+    wait_for_screen_stable,  # Replaces fixed sleeps
+    locate_on_screen,  # Template matching
 ]
 
 # Simplified tool list for local models (remove memory tools that confuse them)
 local_tools = [
     # File operations (core tools only)
     list_directory,
+    organize_directory,
     execute_terminal_command,
     read_file_content,
     get_current_directory,
@@ -179,6 +207,151 @@ local_tools = [
 ]
 
 
+def prompt_bundle(provider: str) -> dict:
+    """Compressed system prompt + (output-shaped) tool set for a provider, built once"""
+    # Local models need simpler prompts and a simplified tool set
+    if provider == "ollama":
+        return build_bundle(provider, LOCAL_MODEL_PROMPT, local_tools)
+    return build_bundle(provider, SYSTEM_PROMPT, tools)
+
+
+def _build_agent(
+    llm,
+    provider: str,
+    checkpointer,
+    tool_selector: Optional[ToolSelector] = None,
+    step_monitor: Optional[StepMonitor] = None,
+):
+    """Create the ReAct agent with the prompt and tool set for a provider"""
+    bundle = prompt_bundle(provider)
+    system_prompt = bundle["system_prompt"]
+    current_tools = bundle["tools"]
+    response_format.set_provider(provider)
+
+    # Cloud models get only the tools each step needs bound (all stay executable)
+    # Repeated calls are fingerprinted; a looping task stops before the next model call
+    history_hook = HistoryManager(system_prompt)
+    if step_monitor is not None:
+        current_tools = step_monitor.wrap_tools(current_tools)
+        history_hook = step_monitor.guard(history_hook)
+
+    model = llm
+    if tool_selector is not None and provider != "ollama":
+        model = tool_selector.dynamic_model(llm, current_tools)
+
+    # Tool results are token-budgeted for the model (the full output is kept as
+    # the message artifact); the history manager adds the system prompt once per
+    # model call and keeps the thread within a token budget
+    # Tool calls a local model wrote as text become real calls (cloud models call tools natively)
+    recovery = None
+    if config.ENABLE_TOOL_CALL_RECOVERY and provider == "ollama":
+        recovery = ToolCallRecovery(current_tools)
+
+    return create_react_agent(
+        model,
+        current_tools,
+        checkpointer=checkpointer,
+        pre_model_hook=history_hook,
+        post_model_hook=recovery,
+    )
+
+
+def _stream_agent(agent_executor, inputs, run_config: dict) -> list:
+    """
+    Run the agent and print its thinking, tool calls and tool results
+
+    Args:
+        agent_executor: Compiled agent graph
+        inputs: {"messages": [...]} for a new prompt, or None to resume the
+            thread from its last checkpoint
+        run_config: LangGraph run config (thread ID, callbacks, ...)
+
+    Returns:
+        Executed tool calls: [{"name", "args", "output"}] in call order
+    """
+    pending = {}  # Tool call ID → (name, args)
+    steps = []
+    for chunk in agent_executor.stream(inputs, run_config):
+        # Show agent node execution
+        if "agent" in chunk:
+            agent_messages = chunk["agent"]["messages"]
+            for msg in agent_messages:
+                # AI thinking/response
+                if hasattr(msg, "content") and msg.content:
+                    print(f"💭 AI Thinking: {msg.content}")
+
+                # Tool calls
+                if hasattr(msg, "tool_calls") and msg.tool_calls:
+                    for tool_call in msg.tool_calls:
+                        tool_name = tool_call.get("name", "unknown")
+                        tool_args = tool_call.get("args", {})
+                        pending[tool_call.get("id")] = (tool_name, tool_args)
+                        print(f"🔧 Calling Tool: {tool_name}({tool_args})")
+
+        # Tool calls recovered from the model's text
+        for msg in (chunk.get("post_model_hook") or {}).get("messages", []):
+            for tool_call in msg.tool_calls:
+                pending[tool_call["id"]] = (tool_call["name"], tool_call["args"])
+                print(f"🩹 Recovered Tool Call: {tool_call['name']}({tool_call['args']})")
+
+        # Show tool execution results
+        if "tools" in chunk:
+            tool_messages = chunk["tools"]["messages"]
+            for msg in tool_messages:
+                if hasattr(msg, "content"):
+                    full_output = getattr(msg, "artifact", None) or msg.content
+                    print(f"✅ Tool Result: {full_output}")
+                    if full_output != msg.content:
+                        print("✂️  (Compacted for the AI - full output shown above)")
+                    if msg.tool_call_id in pending:
+                        name, args = pending.pop(msg.tool_call_id)
+                        steps.append({"name": name, "args": args, "output": full_output})
+    return steps
+
+
+def _record_steps(agent_executor, prompt: str, steps: list, run_config: dict, final: str = ""):
+    """
+    Add tool calls that ran without the model to the session's history
+
+    Written as the tool calls the agent would have made, so follow-up requests
+    ("now move the PDFs there") have the same context as after a model run.
+
+    Args:
+        agent_executor: Compiled agent graph for the session's checkpointer
+        prompt: User command
+        steps: Executed tool calls: [{"name", "args", "output"}]
+        run_config: LangGraph run config (thread ID, ...)
+        final: Closing AI message. Without one the thread is left at the
+            model's turn, so streaming None hands the task to the model.
+    """
+    messages: list = [HumanMessage(prompt)]
+    for step in steps:
+        call_id = f"local-{uuid4().hex[:12]}"
+        output = str(step["output"])
+        messages.append(
+            AIMessage("", tool_calls=[{"name": step["name"], "args": step["args"], "id": call_id}])
+        )
+        messages.append(
+            ToolMessage(
+                shape_output(step["name"], output),
+                tool_call_id=call_id,
+                name=step["name"],
+                artifact=getattr(step["output"], "console_text", output),
+            )
+        )
+    if final:
+        messages.append(AIMessage(final))
+    agent_executor.update_state(
+        run_config, {"messages": messages}, as_node="agent" if final else "tools"
+    )
+
+
+def _print_replayed_step(step: dict):
+    """Print a tool call replayed from the trajectory store"""
+    print(f"♻️  Replaying Tool: {step['name']}({step['args']})")
+    print(f"✅ Tool Result: {getattr(step['output'], 'console_text', step['output'])}")
+
+
 def main():
     """Main entry point for the AI Robot agent"""
 
@@ -192,15 +365,158 @@ def main():
     llm = model_switcher.get_model()
     print("=" * 70)
 
-    # Memory to remember past actions (helps with feedback)
-    memory = MemorySaver()
+    # Precompute compressed prompts + tool sets once per provider
+    for provider in config.FALLBACK_ORDER:
+        print_bundle(prompt_bundle(provider))
+    print("=" * 70)
+
+    # Durable memory: checkpoints live on disk, one thread per named session
+    store = SessionStore()
+    for session_id in store.prune_expired():
+        print(f"🗑️  Removed expired session: {session_id}")
+
+    # Meters real token usage of every model call (daily totals persisted)
+    meter = UsageMeter()
+
+    # Answers trivial one-tool commands directly (no model round trips)
+    router = IntentRouter()
+
+    # Verified tool-call sequences of past tasks, replayed for repeats
+    trajectories = TrajectoryStore()
+
+    def session_config(session_id: str) -> dict:
+        """Run config for a session (conversation ID + recursion limit)"""
+        # Note: High enough for complex multi-step tasks with verification
+        return {
+            "configurable": {"thread_id": session_id},
+            "recursion_limit": 50,  # Allows complex tasks with verification (e.g., organize 5+ file types)
+            "callbacks": [meter],
+        }
+
+    def run_task(task: str, inputs, steps: Optional[list] = None):
+        """Run one task with provider switching on rate limit errors"""
+        nonlocal llm
+        steps = list(steps or [])  # Tool calls so far (replayed steps on a hand-off)
+
+        # Retry with provider switching on rate limit errors
+        max_retries = 3
+        retry_count = 0
+        # Pick the model tier for a new task (a resumed task keeps its model)
+        if inputs is not None:
+            llm = model_switcher.route(task)
+        meter.start_task(task, model_switcher.current_provider, model_switcher.model_name)
+        tool_selector = ToolSelector()
+        step_monitor = StepMonitor()
+        store.touch(active_session, prompt=task, status=STATUS_RUNNING)
+
+        while retry_count < max_retries:
+            meter.set_model(model_switcher.current_provider, model_switcher.model_name)
+            try:
+                # Recreate agent with current model
+                agent_executor = _build_agent(
+                    llm,
+                    model_switcher.current_provider,
+                    store.checkpointer,
+                    tool_selector,
+                    step_monitor,
+                )
+                steps += _stream_agent(agent_executor, inputs, run_config)
+
+                print("\n✨ Task completed!")
+                meter.print_task_summary()
+                tool_selector.print_summary()
+                step_monitor.print_summary(run_config["recursion_limit"])
+                print()
+                store.touch(active_session, status=STATUS_DONE)
+                store.prune(active_session)
+                log_outcome(task, model_switcher.tier, True, meter.task_summary()["calls"])
+                if trajectories.record(task, steps):
+                    print("🧭 Recorded these steps - next time this task replays without the AI\n")
+                break  # Success!
+
+            except LoopDetectedError as e:
+                print(f"\n🔁 Loop detected: {e}")
+                stronger = model_switcher.escalate() if config.LOOP_ESCALATE else None
+                if stronger is not None:
+                    # The thread stopped before a model call - the stronger model picks it up
+                    llm = stronger
+                    step_monitor.reset_streak()
+                    inputs = None
+                    print("✅ Handing the task to the stronger model...\n")
+                    continue
+                print("🛑 Stopped the task instead of repeating the same steps")
+                step_monitor.print_summary(run_config["recursion_limit"])
+                print()
+                store.touch(active_session, status=STATUS_DONE)
+                log_outcome(task, model_switcher.tier, False, meter.task_summary()["calls"])
+                break
+
+            except Exception as e:
+                error_str = str(e)
+
+                # Check if it's a rate limit error
+                if (
+                    "rate" in error_str.lower()
+                    or "429" in error_str
+                    or "quota" in error_str.lower()
+                ):
+                    retry_count += 1
+                    if retry_count < max_retries:
+                        print("\n⚠️  Rate limit error detected!")
+                        print(
+                            f"🔄 Switching to backup provider... (Attempt {retry_count}/{max_retries})"
+                        )
 
-    # Config for the session (like a conversation ID + recursion limit)
-    # Note: High enough for complex multi-step tasks with verification
-    config = {
-        "configurable": {"thread_id": "my-robot-thread"},
-        "recursion_limit": 50,  # Allows complex tasks with verification (e.g., organize 5+ file types)
-    }
+                        # Switch to next provider
+                        llm = model_switcher.switch_provider(error_str)
+
+                        if llm is None:
+                            print("\n❌ All providers exhausted. Please try again later.")
+                            store.touch(active_session, status=STATUS_FAILED)
+                            break
+
+                        # Continue from the last checkpoint instead of re-sending the
+                        # prompt - completed tool calls are not repeated
+                        inputs = None
+                        print("✅ Switched successfully! Retrying task...\n")
+                        continue
+                    else:
+                        print(f"\n❌ Max retries reached. Error: {e}")
+                        print("💡 All AI providers are rate limited. Wait or try again later.")
+                        store.touch(active_session, status=STATUS_FAILED)
+                        break
+                else:
+                    # Non-rate-limit error, show and exit
+                    print(f"\n❌ Error: {e}")
+                    store.touch(active_session, status=STATUS_FAILED)
+                    log_outcome(task, model_switcher.tier, False, meter.task_summary()["calls"])
+                    break
+
+    def resume_interrupted(session_id: str):
+        """Offer to finish a task that was cut off by a crash or restart"""
+        record = store.get(session_id)
+        if not record or record["status"] != STATUS_RUNNING:
+            return
+        pending = _build_agent(llm, model_switcher.current_provider, store.checkpointer)
+        if not pending.get_state(session_config(session_id)).next:
+            store.touch(session_id, status=STATUS_DONE)
+            return
+
+        print(f"⏸️  Interrupted task in {session_id}: {record['last_prompt']}")
+        try:
+            answer = session.prompt("   Resume it? [Y/n]: ").strip().lower()
+        except (KeyboardInterrupt, EOFError):
+            answer = "n"
+        if answer in ["", "y", "yes"]:
+            print("⏯️  Resuming from the last checkpoint...\n")
+            run_task(record["last_prompt"], None)
+        else:
+            store.touch(session_id, status=STATUS_DONE)
+
+    # Continue the most recent session (or start a new one)
+    sessions = store.list_sessions()
+    active_session = sessions[0]["session_id"] if sessions else new_session_id()
+    run_config = session_config(active_session)
 
     # Create a prompt session with history support for arrow key navigation
     session = PromptSession(history=InMemoryHistory())
@@ -224,9 +540,10 @@ def main():
     print("   🔧 Error Recovery - Multiple fallback strategies")
     print("   🔍 Verification - Confirms every change")
     print("\n📊 System:")
-    print("   • 21 Professional Tools (NEW: plan_task)")
+    print("   • 27 Professional Tools (NEW: search_content)")
     print("   • Dual-Model: Gemini → Local (auto-switch)")
     print("   • Memory: ~/.ai_robot_memory.json")
+    print("   • Sessions: ~/.ai_robot_sessions.db")
     print("   • Mode: TRULY AGENTIC ✅")
     print("\n💡 Manual Model Switching:")
     print("   • 'switch to local' - Use local Ollama model")
@@ -235,6 +552,9 @@ def main():
     print("\n🧪 Test With: 'Organize my Desktop by file type'")
     print("=" * 70 + "\n")
 
+    print(f"💾 Session: {active_session}\n")
+    resume_interrupted(active_session)
+
     while True:
         try:
             prompt = session.prompt("🤖 Your command: ")
@@ -247,6 +567,7 @@ def main():
 
         # Handle manual model switching commands
         prompt_lower = prompt.lower().strip()
+        command_arg = prompt.strip().split()[-1] if prompt.strip() else ""
 
         if "switch to local" in prompt_lower or "use local" in prompt_lower:
             print("\n🔄 Manually switching to Local (Ollama)...\n")
@@ -255,7 +576,6 @@ def main():
                 print("✅ Now using Local Ollama model!\n")
             continue
 
-
         elif "switch to gemini" in prompt_lower or "use gemini" in prompt_lower:
             print("\n🔄 Manually switching to Gemini...\n")
             llm = model_switcher._try_load_provider("gemini", "", switching=True)
@@ -271,18 +591,52 @@ def main():
             current = model_switcher.current_provider
             if current:
                 info = config.MODEL_INFO[current]
-                tier = config.DEFAULT_TIER
-                model_name = config.MODEL_TIERS[tier][current]
                 print("\n📊 Current Model:")
                 print(f"   Provider: {current.upper()}")
                 print(f"   Name: {info['name']}")
-                print(f"   Model: {model_name}")
+                print(f"   Model: {model_switcher.model_name}")
                 print(f"   Cost: {info['cost']}")
                 print()
             else:
                 print("\n⚠️  No model loaded yet\n")
             continue
 
+        elif prompt_lower in ["usage", "show usage", "token usage"]:
+            print_daily_usage()
+            continue
+
+        elif prompt_lower in ["stats", "router stats", "fast path stats"]:
+            router.print_stats()
+            continue
+
+        # Session management
+        elif prompt_lower in ["sessions", "list sessions", "show sessions"]:
+            store.print_sessions(active_session)
+            continue
+
+        elif prompt_lower.startswith("new session"):
+            name = prompt.strip()[len("new session") :].strip()
+            active_session = name or new_session_id()
+            run_config = session_config(active_session)
+            print(f"\n💾 Started new session: {active_session}\n")
+            continue
+
+        elif prompt_lower.startswith("resume ") and store.get(command_arg):
+            active_session = command_arg
+            run_config = session_config(active_session)
+            print(f"\n💾 Resumed session: {active_session}\n")
+            resume_interrupted(active_session)
+            continue
+
+        elif prompt_lower.startswith("delete session"):
+            if command_arg == active_session:
+                print("\n⚠️  Can't delete the active session - switch with 'new session' first\n")
+            elif store.delete(command_arg):
+                print(f"\n🗑️  Deleted session: {command_arg}\n")
+            else:
+                print(f"\n❌ No session named '{command_arg}' (see 'sessions')\n")
+            continue
+
         elif prompt_lower in ["help", "commands", "?", "help me"]:
             print("\n" + "=" * 70)
             print("📋 AVAILABLE COMMANDS")
@@ -291,6 +645,13 @@ def main():
             print("   • switch to local   - Use local Ollama (qwen2.5:14b recommended)")
             print("   • switch to gemini  - Use Gemini API (default, best)")
             print("   • show model        - Show current model info")
+            print("   • usage             - Show today's token usage per provider")
+            print("   • stats             - Show fast-path hit rate and latency")
+            print("\n💾 Sessions:")
+            print("   • sessions             - List saved sessions")
+            print("   • new session [name]   - Start a new conversation")
+            print("   • resume <id>          - Switch to a session (finishes interrupted tasks)")
+            print("   • delete session <id>  - Delete a session and its checkpoints")
             print("\n💡 General:")
             print("   • help              - Show this help message")
             print("   • exit              - Quit the application")
@@ -303,95 +664,48 @@ def main():
             print("=" * 70 + "\n")
             continue
 
-        if not all(
-            danger.lower() not in prompt.lower() for danger in DANGEROUS_COMMANDS
-        ):  # Quick safety check
+        if not safety.is_safe(prompt):  # Quick safety check
             print("🚫 Unsafe command blocked! Try something nice.")
             continue
 
-        print("🧠 AI is processing your request...\n")
-
-        # Choose system prompt based on provider (local models need simpler prompts)
-        system_prompt = (
-            LOCAL_MODEL_PROMPT if model_switcher.current_provider == "ollama" else SYSTEM_PROMPT
-        )
-
-        # Run the agent with feedback loop (include system prompt as first message)
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": prompt},
-        ]
-
-        # Retry with provider switching on rate limit errors
-        max_retries = 3
-        retry_count = 0
+        # New task - "before" snapshots for verification are taken from here on
+        verification.reset()
+
+        # Fast path: simple commands map straight onto one tool
+        hit = router.route(prompt)
+        if hit is not None:
+            print(f"⚡ Fast path: {hit['tool']}({hit['args']})")
+            print(f"✅ Tool Result: {getattr(hit['output'], 'console_text', hit['output'])}\n")
+            _record_steps(
+                _build_agent(llm, model_switcher.current_provider, store.checkpointer),
+                prompt,
+                [{"name": hit["tool"], "args": hit["args"], "output": hit["output"]}],
+                run_config,
+                final="Done - the result is shown above.",
+            )
+            continue
 
-        while retry_count < max_retries:
-            try:
-                # Choose tool set based on provider (local models get simplified tools)
-                current_tools = (
-                    local_tools if model_switcher.current_provider == "ollama" else tools
+        # Repeated task: replay its recorded tool calls, the model only handles divergences
+        if config.ENABLE_TRAJECTORY_REPLAY and trajectories.find(prompt):
+            print("♻️  Known task - replaying its recorded steps...\n")
+            replay = trajectories.replay(prompt, tools, on_step=_print_replayed_step)
+            agent_executor = _build_agent(llm, model_switcher.current_provider, store.checkpointer)
+            if replay["completed"]:
+                _record_steps(
+                    agent_executor,
+                    prompt,
+                    replay["steps"],
+                    run_config,
+                    final="Done - replayed the recorded steps, results shown above.",
                 )
+                print(
+                    f"\n✨ Task completed by replay ({len(replay['steps'])} steps, no model calls)\n"
+                )
+                continue
+            print(f"\n↪️  Replay stopped ({replay['reason']}) - handing off to the AI...\n")
+            _record_steps(agent_executor, prompt, replay["steps"], run_config)
+            run_task(prompt, None, replay["steps"])
+            continue
 
-                # Recreate agent with current model
-                agent_executor = create_react_agent(llm, current_tools, checkpointer=memory)
-
-                for chunk in agent_executor.stream({"messages": messages}, config):
-                    # Show agent node execution
-                    if "agent" in chunk:
-                        agent_messages = chunk["agent"]["messages"]
-                        for msg in agent_messages:
-                            # AI thinking/response
-                            if hasattr(msg, "content") and msg.content:
-                                print(f"💭 AI Thinking: {msg.content}")
-
-                            # Tool calls
-                            if hasattr(msg, "tool_calls") and msg.tool_calls:
-                                for tool_call in msg.tool_calls:
-                                    tool_name = tool_call.get("name", "unknown")
-                                    tool_args = tool_call.get("args", {})
-                                    print(f"🔧 Calling Tool: {tool_name}({tool_args})")
-
-                    # Show tool execution results
-                    if "tools" in chunk:
-                        tool_messages = chunk["tools"]["messages"]
-                        for msg in tool_messages:
-                            if hasattr(msg, "content"):
-                                print(f"✅ Tool Result: {msg.content}")
-
-                print("\n✨ Task completed!\n")
-                break  # Success!
-
-            except Exception as e:
-                error_str = str(e)
-
-                # Check if it's a rate limit error
-                if (
-                    "rate" in error_str.lower()
-                    or "429" in error_str
-                    or "quota" in error_str.lower()
-                ):
-                    retry_count += 1
-                    if retry_count < max_retries:
-                        print("\n⚠️  Rate limit error detected!")
-                        print(
-                            f"🔄 Switching to backup provider... (Attempt {retry_count}/{max_retries})"
-                        )
-
-                        # Switch to next provider
-                        llm = model_switcher.switch_provider(error_str)
-
-                        if llm is None:
-                            print("\n❌ All providers exhausted. Please try again later.")
-                            break
-
-                        print("✅ Switched successfully! Retrying task...\n")
-                        continue
-                    else:
-                        print(f"\n❌ Max retries reached. Error: {e}")
-                        print("💡 All AI providers are rate limited. Wait or try again later.")
-                        break
-                else:
-                    # Non-rate-limit error, show and exit
-                    print(f"\n❌ Error: {e}")
-                    break
+        print("🧠 AI is processing your request...\n")
+        run_task(prompt, {"messages": [{"role": "user", "content": prompt}]})
@@ -3,6 +3,8 @@ Dynamic Model Switcher - OPTIMIZED & CONSOLIDATED
 Auto-switches on rate limit errors. All model loading logic in one place.
 """
 
+from typing import Any
+
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_ollama import ChatOllama
 
@@ -12,7 +14,7 @@ from src import config, cost_optimizer
 # PROVIDER CONFIGURATION - OPTIMIZED FOR GEMINI + LOCAL
 # ============================================================================
 
-PROVIDER_CONFIG = {
+PROVIDER_CONFIG: dict[str, dict[str, Any]] = {
     "gemini": {
         "icon": "💎",
         "name": "Gemini 2.0",
@@ -57,6 +59,8 @@ class DynamicModelSwitcher:
 
     def __init__(self):
         self.current_provider = None
+        self.model_name = None
+        self.tier = config.DEFAULT_TIER
         self.failed_providers = []
         self.model = None
 
@@ -74,6 +78,57 @@ class DynamicModelSwitcher:
         # Last resort: local Ollama
         return self._load_fallback()
 
+    def route(self, query: str):
+        """
+        Use the current provider's model for the task's complexity tier
+
+        Args:
+            query: User request
+
+        Returns:
+            Model for the task (the loaded one if the tier's model is the same)
+        """
+        self.tier = cost_optimizer.detect_task_complexity(query)
+        provider = self.current_provider
+        model_name = config.MODEL_TIERS[self.tier].get(provider)
+        if not model_name or model_name == self.model_name or provider not in PROVIDER_CONFIG:
+            return self.model
+
+        print(f"🎯 {self.tier.upper()} task → {model_name}")
+        self.model = PROVIDER_CONFIG[provider]["loader"](model_name)
+        self.model_name = model_name
+        return self.model
+
+    def escalate(self):
+        """
+        Move a struggling task to a stronger model
+
+        Tries a higher tier on the current provider first, then (from the
+        local model) a cloud provider.
+
+        Returns:
+            Stronger model, or None if there is nothing stronger to switch to
+        """
+        tiers = list(config.MODEL_TIERS)
+        for tier in tiers[tiers.index(self.tier) + 1 :]:
+            model_name = config.MODEL_TIERS[tier].get(self.current_provider)
+            if model_name and model_name != self.model_name:
+                print(f"⬆️  Escalating to {tier.upper()} tier → {model_name}")
+                self.tier = tier
+                self.model = PROVIDER_CONFIG[self.current_provider]["loader"](model_name)
+                self.model_name = model_name
+                return self.model
+
+        if self.current_provider == "ollama":
+            for provider in config.FALLBACK_ORDER:
+                if provider in ("ollama", *self.failed_providers):
+                    continue
+                model = self._try_load_provider(provider, "", switching=True)
+                if model:
+                    print(f"⬆️  Escalated to {PROVIDER_CONFIG[provider]['name']}")
+                    return model
+        return None
+
     def switch_provider(self, error_msg: str = ""):
         """Switch to next available provider on error"""
         print(f"\n⚠️  Provider {self.current_provider.upper()} failed: {error_msg}")
@@ -119,6 +174,7 @@ class DynamicModelSwitcher:
 
             # Update state
             self.model = llm
+            self.model_name = model_name
             self.current_provider = provider
             return llm
 
@@ -133,6 +189,7 @@ class DynamicModelSwitcher:
         print("\n❌ All providers exhausted! Using local Ollama...")
         model = config.MODEL_TIERS[config.DEFAULT_TIER]["ollama"]
         self.model = ChatOllama(model=model)
+        self.model_name = model
         self.current_provider = "ollama"
         self._print_model_info("ollama", model)
         return self.model
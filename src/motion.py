@@ -0,0 +1,213 @@
+"""
+Motion Engine - Time-Budgeted Mouse Trajectories
+Cached normalized Bezier templates, scaled and rotated per move in one NumPy operation
+"""
+
+import sys
+import time
+from functools import lru_cache
+
+import numpy as np
+
+from src import config
+from src.input_backend import RecordingBackend, get_backend
+
+MODES = ("human", "fast")
+
+# Pixels covered per intermediate point (short moves need few points)
+PIXELS_PER_STEP = 40
+
+# Distance at which a move uses its full time budget (shorter moves are quicker)
+FULL_BUDGET_DISTANCE = 1000
+
+# ============================================================================
+# PATH TEMPLATES
+# ============================================================================
+
+
+def _ease(t: np.ndarray) -> np.ndarray:
+    """Minimum-jerk progress: slow start, fast middle, slow landing"""
+    progress: np.ndarray = t**3 * (10 - 15 * t + 6 * t**2)
+    return progress
+
+
+@lru_cache(maxsize=64)
+def templates(steps: int, count: int = 0) -> np.ndarray:
+    """
+    Normalized paths from 0 to 1 (as complex numbers), built once per step count
+
+    Each template is a cubic Bezier curve with random control points - gentle
+    arcs and S-curves a few percent off the straight line - sampled with
+    minimum-jerk timing.
+
+    Args:
+        steps: Points per path (the last one is exactly 1+0j)
+        count: Number of templates (default: config.MOUSE_PATH_TEMPLATES)
+
+    Returns:
+        Complex array of shape (count, steps)
+    """
+    count = count or config.MOUSE_PATH_TEMPLATES
+    rng = np.random.default_rng(steps)
+    s = _ease(np.linspace(0.0, 1.0, steps + 1)[1:])
+    basis = np.stack([(1 - s) ** 3, 3 * s * (1 - s) ** 2, 3 * s**2 * (1 - s), s**3], axis=1)
+
+    controls = np.zeros((count, 4), dtype=complex)
+    controls[:, 1] = rng.uniform(0.2, 0.4, count) + 1j * rng.uniform(-0.15, 0.15, count)
+    controls[:, 2] = rng.uniform(0.6, 0.8, count) + 1j * rng.uniform(-0.1, 0.1, count)
+    controls[:, 3] = 1.0
+    paths: np.ndarray = controls @ basis.T
+    return paths
+
+
+def plan_path(start: tuple, end: tuple, steps: int = 0, rng=None) -> np.ndarray:
+    """
+    Mouse path from start to end
+
+    A random template is scaled and rotated onto the move by one complex
+    multiplication: start + template * (end - start).
+
+    Args:
+        start: (x, y) current position
+        end: (x, y) target - the path ends exactly there
+        steps: Points on the path (default: from the distance)
+        rng: numpy Generator (default: fresh entropy)
+
+    Returns:
+        Array of shape (steps, 2) with x, y per point
+    """
+    delta = complex(end[0] - start[0], end[1] - start[1])
+    if not steps:
+        steps = int(np.clip(abs(delta) / PIXELS_PER_STEP, 2, config.MOUSE_MAX_STEPS))
+    rng = rng or np.random.default_rng()
+    paths = templates(steps)
+    path = complex(*start) + paths[rng.integers(len(paths))] * delta
+    return np.column_stack([path.real, path.imag])
+
+
+# ============================================================================
+# MOVING
+# ============================================================================
+
+
+def move(x: int, y: int, mode: str = "", budget_s: float = 0.0, backend=None, rng=None) -> dict:
+    """
+    Move the mouse to (x, y) within a time budget
+
+    Args:
+        x, y: Target coordinates
+        mode: "human" (curved, eased path) or "fast" (jump straight there);
+            default: config.MOUSE_MOTION_MODE
+        budget_s: Longest a move may take (default: config.MOUSE_MOVE_BUDGET_S);
+            shorter moves take proportionally less
+        backend: Input backend (default: the active one)
+        rng: numpy Generator for picking templates
+
+    Returns:
+        {"mode", "steps", "duration_s"}
+    """
+    backend = backend or get_backend()
+    mode = mode or config.MOUSE_MOTION_MODE
+    if mode == "fast":
+        backend.move_to(x, y)
+        return {"mode": mode, "steps": 1, "duration_s": 0.0}
+
+    start = backend.position()
+    distance = float(np.hypot(x - start[0], y - start[1]))
+    if distance < 1:
+        return {"mode": mode, "steps": 0, "duration_s": 0.0}
+
+    budget_s = budget_s or config.MOUSE_MOVE_BUDGET_S
+    duration = budget_s * min(1.0, (distance / FULL_BUDGET_DISTANCE) ** 0.5)
+    path = plan_path(start, (x, y), rng=rng)
+    pause = duration / len(path)
+    for px, py in path.tolist():
+        backend.move_to(px, py)
+        backend.sleep(pause)
+    return {"mode": mode, "steps": len(path), "duration_s": round(duration, 4)}
+
+
+# ============================================================================
+# BENCHMARK (offline, recording backend)
+# ============================================================================
+
+
+def _legacy_move(backend, x: int, y: int, rng):
+    """The previous human-like move: a scipy spline per call, 20 points, 10-50 ms sleeps"""
+    from scipy.interpolate import splev, splprep
+
+    cx, cy = backend.position()
+    tx, ty = x + rng.uniform(-5, 5), y + rng.uniform(-5, 5)
+    points = np.array(
+        [
+            [cx, cy],
+            [
+                cx + (tx - cx) * 0.3 + rng.uniform(-30, 30),
+                cy + (ty - cy) * 0.3 + rng.uniform(-20, 20),
+            ],
+            [
+                cx + (tx - cx) * 0.7 + rng.uniform(-20, 20),
+                cy + (ty - cy) * 0.7 + rng.uniform(-10, 10),
+            ],
+            [tx, ty],
+        ]
+    )
+    tck, _ = splprep(points.T, s=0, k=2)
+    for px, py in zip(*splev(np.linspace(0, 1, 20), tck)):
+        backend.move_to(px, py)
+        backend.sleep(0.01 + rng.uniform(0.01, 0.05))  # moveTo(duration=0.01) + random sleep
+
+
+def benchmark(moves: int = 200, seed: int = 0) -> dict:
+    """
+    Compare motion modes on the same random targets without touching the mouse
+
+    Args:
+        moves: Number of moves per mode
+        seed: Seed for targets and paths
+
+    Returns:
+        Mode → {"compute_ms": CPU time per move, "move_s": time per move
+        including pauses, "events": mouse events per move, "landed": moves that
+        ended exactly on target}
+    """
+    targets = np.random.default_rng(seed).integers(0, (1920, 1080), size=(moves, 2)).tolist()
+    results = {}
+    for mode in ("legacy", *MODES):
+        backend = RecordingBackend(start=(960, 540))
+        rng = np.random.default_rng(seed)
+        for steps in range(2, config.MOUSE_MAX_STEPS + 1):  # Warm the cache outside the timing
+            templates(steps)
+        landed = 0
+        start = time.perf_counter()
+        for x, y in targets:
+            if mode == "legacy":
+                _legacy_move(backend, x, y, rng)
+            else:
+                move(x, y, mode=mode, backend=backend, rng=rng)
+            landed += backend.position() == (x, y)
+        compute = time.perf_counter() - start
+        results[mode] = {
+            "compute_ms": compute / moves * 1000,
+            "move_s": (compute + backend.clock) / moves,
+            "events": backend.count("move_to") / moves,
+            "landed": landed / moves,
+        }
+    return results
+
+
+def main():
+    """Print the motion benchmark"""
+    moves = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    results = benchmark(moves)
+    print(f"🖱️  Mouse motion benchmark ({moves} moves, recording backend)")
+    print(f"   {'mode':<8} {'compute':>10} {'per move':>10} {'events':>8} {'on target':>10}")
+    for mode, row in results.items():
+        print(
+            f"   {mode:<8} {row['compute_ms']:>7.3f} ms {row['move_s']:>8.3f} s "
+            f"{row['events']:>8.1f} {row['landed']:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
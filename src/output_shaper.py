@@ -0,0 +1,241 @@
+"""
+Output Shaper - Token-Budgeted Tool Output Compaction
+Keeps huge tool results out of the model context; the console still shows everything
+"""
+
+import re
+from collections import Counter
+
+from langchain_core.tools import StructuredTool
+
+from src import config
+from src.cost_optimizer import estimate_tokens
+
+# ============================================================================
+# LINE-LEVEL HELPERS
+# ============================================================================
+
+# Last whitespace-separated token ends in a file extension (".jpg", ".tar.gz" → ".gz")
+_EXTENSION_RE = re.compile(r"(\.[A-Za-z0-9]{1,8})\W*$")
+
+# A listing needs at least this many lines before it is summarized by extension
+LISTING_MIN_LINES = 40
+
+# Share of the budget spent on the head of the output (the rest goes to the tail)
+HEAD_SHARE = 0.6
+
+
+def _collapse_repeats(lines: list) -> tuple:
+    """
+    Collapse runs of identical consecutive lines into one annotated line
+
+    Args:
+        lines: Output lines
+
+    Returns:
+        (collapsed lines, how many original lines each collapsed line stands for)
+    """
+    collapsed: list = []
+    runs: list = []
+    run_line = None
+    run_length = 0
+
+    def flush():
+        if run_line is None:
+            return
+        if run_length > 1:
+            collapsed.append(f"{run_line}  [repeated {run_length}×]")
+        else:
+            collapsed.append(run_line)
+        runs.append(run_length)
+
+    for line in lines:
+        if line == run_line:
+            run_length += 1
+            continue
+        flush()
+        run_line = line
+        run_length = 1
+    flush()
+
+    return collapsed, runs
+
+
+def _extension_summary(lines: list) -> str:
+    """
+    Summarize a file listing by extension
+
+    Args:
+        lines: Output lines (ls output, list_directory entries, search results, ...)
+
+    Returns:
+        One-line summary, or "" if the output doesn't look like a listing
+    """
+    if len(lines) < LISTING_MIN_LINES:
+        return ""
+
+    extensions: Counter = Counter()
+    for line in lines:
+        # list_directory lines look like "📄 name.jpg (.jpg, 123 bytes)"
+        token = line.split(" (")[0].strip().split()[-1] if line.strip() else ""
+        match = _EXTENSION_RE.search(token)
+        if match:
+            extensions[match.group(1).lower()] += 1
+
+    # Only treat it as a listing if most lines are file names
+    if sum(extensions.values()) < len(lines) // 2:
+        return ""
+
+    top = ", ".join(f"{count} {ext}" for ext, count in extensions.most_common(12))
+    others = len(extensions) - 12
+    if others > 0:
+        top += f", +{others} other types"
+    return f"📊 Listing summary: {sum(extensions.values())} files by extension: {top}"
+
+
+def _clip_line(line: str, max_tokens: int) -> str:
+    """Clip a single overlong line (minified JSON, base64, ...) to a token budget"""
+    max_chars = max(max_tokens * 4, 40)
+    if len(line) <= max_chars:
+        return line
+    half = max_chars // 2
+    return f"{line[:half]} …[{len(line) - max_chars:,} chars elided]… {line[-half:]}"
+
+
+# ============================================================================
+# OUTPUT SHAPING
+# ============================================================================
+
+
+def get_budget(tool_name: str) -> int:
+    """
+    Token budget for a tool's result in the model context
+
+    Args:
+        tool_name: Name of the tool
+
+    Returns:
+        Maximum tokens the model should see for this tool's output
+    """
+    return config.TOOL_OUTPUT_BUDGETS.get(tool_name, config.DEFAULT_TOOL_OUTPUT_BUDGET)
+
+
+def shape_output(tool_name: str, output: str) -> str:
+    """
+    Compact a tool result so it fits the tool's token budget
+
+    Repeated lines are collapsed, large listings get a per-extension summary,
+    and the head and tail of the output are kept. A trailing note says exactly
+    what was elided.
+
+    Args:
+        tool_name: Name of the tool that produced the output
+        output: Full tool output
+
+    Returns:
+        Output to feed back to the model (unchanged if already within budget)
+    """
+    budget = get_budget(tool_name)
+    original_tokens = estimate_tokens(output)
+    if original_tokens <= budget:
+        return output
+
+    lines = output.splitlines()
+    collapsed, runs = _collapse_repeats(lines)
+    repeats_removed = len(lines) - len(collapsed)
+    summary = _extension_summary(collapsed)
+
+    # Reserve room for the summary and the elision note
+    available = budget - estimate_tokens(summary) - 40
+    line_budget = max(available // 4, 10)
+    lines_fit = [_clip_line(line, line_budget) for line in collapsed]
+
+    # Keep lines from the head, then from the tail, while the budget allows
+    head, tail = [], []
+    head_budget = int(available * HEAD_SHARE)
+    used = 0
+    for line in lines_fit:
+        cost = estimate_tokens(line) + 1
+        if used + cost > head_budget:
+            break
+        head.append(line)
+        used += cost
+    for line in reversed(lines_fit[len(head) :]):
+        cost = estimate_tokens(line) + 1
+        if used + cost > available:
+            break
+        tail.append(line)
+        used += cost
+    tail.reverse()
+
+    elided = lines_fit[len(head) : len(lines_fit) - len(tail)]
+    # Line numbers refer to the original output, not the collapsed lines
+    head_end = sum(runs[: len(head)])
+    tail_start = len(lines) - sum(runs[len(lines_fit) - len(tail) :]) + 1
+    elided_lines = tail_start - 1 - head_end
+    clipped = sum(1 for before, after in zip(collapsed, lines_fit) if before != after)
+
+    parts = []
+    if summary:
+        parts.append(summary)
+    parts.extend(head)
+    if elided:
+        elided_tokens = sum(estimate_tokens(line) + 1 for line in elided)
+        parts.append(f"… [{elided_lines:,} lines elided (~{elided_tokens:,} tokens)] …")
+    parts.extend(tail)
+
+    details = [f"{original_tokens:,} → ~{budget:,} tokens"]
+    if elided:
+        kept = []
+        if head:
+            kept.append(f"1-{head_end}")
+        if tail:
+            kept.append(f"{tail_start}-{len(lines)}")
+        kept_text = f"kept lines {' and '.join(kept)}" if kept else "kept no lines"
+        details.append(f"{kept_text} of {len(lines)}, elided {elided_lines}")
+    if repeats_removed:
+        details.append(f"collapsed {repeats_removed} repeated lines")
+    if clipped:
+        details.append(f"clipped {clipped} long lines")
+    parts.append(f"✂️ Output compacted ({'; '.join(details)}). Full output shown to the user.")
+
+    return "\n".join(parts)
+
+
+# ============================================================================
+# TOOL WRAPPING
+# ============================================================================
+
+
+def shape_tool(tool):
+    """
+    Wrap a tool so the model receives shaped output
+
+    The wrapped tool uses LangChain's content-and-artifact format: the message
+    content is the shaped text and the artifact is the full output, which the
+    console prints (the rich rendering, for compact-mode tool responses).
+
+    Args:
+        tool: LangChain tool to wrap
+
+    Returns:
+        New tool with the same name, description and arguments
+    """
+
+    def _run(**kwargs):
+        result = tool.invoke(kwargs)
+        text = str(result)
+        return shape_output(tool.name, text), getattr(result, "console_text", text)
+
+    return StructuredTool.from_function(
+        func=_run,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        response_format="content_and_artifact",
+    )
+
+
+def shape_tools(tools: list) -> list:
+    """Wrap every tool in a list with output shaping"""
+    return [shape_tool(tool) for tool in tools]
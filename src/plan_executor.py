@@ -0,0 +1,288 @@
+"""
+Plan Executor - Runs Structured Plans Locally
+A DAG of tool calls with expected outcomes; independent steps run in parallel, no per-step LLM turn
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from src import config
+from src.tool_selector import FAILURE_MARKERS
+
+# ============================================================================
+# PLAN FORMAT
+# ============================================================================
+#
+# {"steps": [{"id": "mkdir-Images",
+#             "tool": "execute_terminal_command",
+#             "args": {"command": "mkdir -p ~/Desktop/Images"},
+#             "depends_on": [],
+#             "expect": {"is_dir": "~/Desktop/Images"}}, ...]}
+#
+# Expected outcomes (all given keys must hold after the step):
+#   is_dir: path          - directory exists
+#   exists: path          - file or directory exists
+#   no_match: [globs]     - none of the globs match anything
+#   has_match: [globs]    - every glob matches something
+#   output_contains: text - tool output contains the text
+
+# Tools a plan may call - file/shell work that's safe to run without the model
+PLAN_TOOLS = {
+    "execute_terminal_command",
+    "list_directory",
+    "read_file_content",
+    "search_file",
+    "search_content",
+    "get_current_directory",
+    "verify_expectations",
+    "organize_directory",
+    "open_app",
+    "open_url",
+}
+
+_plans: dict[str, dict] = {}  # Plan ID → plan
+
+
+def register_plan(plan: dict) -> str:
+    """
+    Keep a plan so the model can run it by ID (no need to echo the steps back)
+
+    Returns:
+        Plan ID ("plan-1", "plan-2", ...)
+    """
+    plan_id = f"plan-{len(_plans) + 1}"
+    _plans[plan_id] = plan
+    return plan_id
+
+
+def get_plan(plan_ref: str) -> dict:
+    """
+    Resolve a plan reference
+
+    Args:
+        plan_ref: Plan ID from plan_task, or a plan as JSON ({"steps": [...]} or [...])
+
+    Returns:
+        Plan dict, or {} if the reference is unknown or not valid JSON
+    """
+    plan_ref = plan_ref.strip()
+    if plan_ref in _plans:
+        return _plans[plan_ref]
+    try:
+        plan = json.loads(plan_ref)
+    except json.JSONDecodeError:
+        return {}
+    if isinstance(plan, list):
+        plan = {"steps": plan}
+    return plan if isinstance(plan, dict) else {}
+
+
+def validate_plan(plan: dict) -> str:
+    """
+    Check a plan is a runnable DAG
+
+    Returns:
+        Problem description, or "" if the plan is valid
+    """
+    steps = plan.get("steps")
+    if not steps:
+        return "plan has no steps"
+
+    ids = [step.get("id") for step in steps]
+    if None in ids or len(set(ids)) != len(ids):
+        return "every step needs a unique id"
+    for step in steps:
+        if step.get("tool") not in PLAN_TOOLS:
+            return f"step {step['id']}: tool {step.get('tool')!r} can't run in a plan"
+        missing = set(step.get("depends_on", [])) - set(ids)
+        if missing:
+            return f"step {step['id']}: unknown dependencies {sorted(missing)}"
+
+    # Kahn's algorithm - anything left over is part of a cycle
+    remaining = {step["id"]: set(step.get("depends_on", [])) for step in steps}
+    while remaining:
+        ready = [step_id for step_id, deps in remaining.items() if not deps]
+        if not ready:
+            return f"dependency cycle between {sorted(remaining)}"
+        for step_id in ready:
+            del remaining[step_id]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return ""
+
+
+# ============================================================================
+# FILE ORGANIZATION PLANS
+# ============================================================================
+
+
+def _any_case(extension: str) -> str:
+    """Case-insensitive glob suffix for an extension (".png" → ".[pP][nN][gG]")"""
+    return "".join(f"[{c.lower()}{c.upper()}]" if c.isalpha() else c for c in extension)
+
+
+def build_organize_plan(directory: str, extensions: list, categories: dict) -> dict:
+    """
+    DAG for sorting a directory's files into category folders
+
+    The moves go through organize_directory (file_organizer.organize), which
+    creates only the needed folders and renames instead of overwriting a file
+    that's already there. The step's expectations check every observed type
+    left the directory and arrived in its folder; a final listing shows the result.
+
+    Args:
+        directory: Directory to organize
+        extensions: Extensions observed in the directory (".jpg", ...)
+        categories: Folder name → (description, extensions)
+
+    Returns:
+        {"directory", "steps", "unplanned"} - unplanned lists observed
+        extensions no category covers (the model has to decide on those)
+    """
+    root = os.path.expanduser(directory)
+    steps: list = []
+    planned = set()
+    left: list = []
+    arrived: list = []
+
+    for folder, (_, folder_extensions) in categories.items():
+        present = [ext for ext in folder_extensions if ext in extensions]
+        planned.update(present)
+        left += [os.path.join(root, f"*{_any_case(ext)}") for ext in present]
+        arrived += [os.path.join(root, folder, f"*{_any_case(ext)}") for ext in present]
+
+    if planned:
+        steps.append(
+            {
+                "id": "organize",
+                "tool": "organize_directory",
+                "args": {"directory_path": directory},
+                "depends_on": [],
+                "expect": {"no_match": left, "has_match": arrived},
+            }
+        )
+        steps.append(
+            {
+                "id": "verify",
+                "tool": "list_directory",
+                "args": {"directory_path": directory},
+                "depends_on": ["organize"],
+                "expect": {},
+            }
+        )
+
+    return {
+        "directory": directory,
+        "steps": steps,
+        "unplanned": sorted(set(extensions) - planned),
+    }
+
+
+# ============================================================================
+# EXECUTION
+# ============================================================================
+
+
+def check_expectation(expect: dict, output: str) -> str:
+    """
+    Check a step's expected outcome
+
+    Returns:
+        What didn't hold, or "" if everything did
+    """
+
+    def matches(pattern: str) -> bool:
+        return bool(glob.glob(os.path.expanduser(pattern)))
+
+    if "is_dir" in expect and not os.path.isdir(os.path.expanduser(expect["is_dir"])):
+        return f"{expect['is_dir']} is not a directory"
+    if "exists" in expect and not os.path.exists(os.path.expanduser(expect["exists"])):
+        return f"{expect['exists']} does not exist"
+    for pattern in expect.get("no_match", []):
+        if matches(pattern):
+            return f"{pattern} still matches files"
+    for pattern in expect.get("has_match", []):
+        if not matches(pattern):
+            return f"{pattern} matches nothing"
+    if "output_contains" in expect and expect["output_contains"] not in output:
+        return f"output lacks {expect['output_contains']!r}"
+    return ""
+
+
+def run_plan(plan: dict, tools_by_name: dict, max_workers: int = 0) -> dict:
+    """
+    Execute a plan, running steps in parallel as their dependencies finish
+
+    A step fails if its tool reports an error or its expected outcome doesn't
+    hold. Steps depending on a failed step are skipped; independent branches
+    still run to completion.
+
+    Args:
+        plan: {"steps": [...]} (see PLAN FORMAT)
+        tools_by_name: Tool name → LangChain tool
+        max_workers: Thread pool size (default: config.PLAN_MAX_WORKERS)
+
+    Returns:
+        {"status": "done"|"failed"|"invalid", "steps": [{"id", "status", "detail"}],
+         "problem": str, "elapsed_s": float}
+    """
+    start = time.perf_counter()
+    problem = validate_plan(plan)
+    if problem:
+        return {"status": "invalid", "steps": [], "problem": problem, "elapsed_s": 0.0}
+
+    steps = {step["id"]: step for step in plan["steps"]}
+    results: dict = {}  # Step ID → {"id", "status", "detail"}
+
+    def execute(step: dict) -> dict:
+        output = str(tools_by_name[step["tool"]].invoke(step.get("args", {})))
+        if output.strip().startswith(FAILURE_MARKERS) or "VERIFICATION FAILED" in output:
+            return {"id": step["id"], "status": "failed", "detail": output.strip()[:300]}
+        unmet = check_expectation(step.get("expect", {}), output)
+        if unmet:
+            return {"id": step["id"], "status": "failed", "detail": f"expected outcome: {unmet}"}
+        return {"id": step["id"], "status": "ok", "detail": ""}
+
+    with ThreadPoolExecutor(max_workers=max_workers or config.PLAN_MAX_WORKERS) as pool:
+        running: dict = {}
+        while True:
+            # Skipping a step can make its dependents skippable too - repeat until stable
+            changed = True
+            while changed:
+                changed = False
+                for step_id, step in steps.items():
+                    if step_id in results or step_id in running.values():
+                        continue
+                    deps = [
+                        results.get(dep, {}).get("status") for dep in step.get("depends_on", [])
+                    ]
+                    if any(status in ("failed", "skipped") for status in deps):
+                        results[step_id] = {
+                            "id": step_id,
+                            "status": "skipped",
+                            "detail": "dependency failed",
+                        }
+                        changed = True
+                    elif all(status == "ok" for status in deps):
+                        running[pool.submit(execute, step)] = step_id
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id = running.pop(future)
+                try:
+                    results[step_id] = future.result()
+                except Exception as e:
+                    results[step_id] = {"id": step_id, "status": "failed", "detail": str(e)}
+
+    ordered = [results[step_id] for step_id in steps]
+    failed = any(result["status"] != "ok" for result in ordered)
+    return {
+        "status": "failed" if failed else "done",
+        "steps": ordered,
+        "problem": "",
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
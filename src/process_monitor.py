@@ -0,0 +1,287 @@
+"""
+Process Monitor - Running Apps from an In-Process psutil Snapshot
+macOS .app bundles and Linux desktop apps, cached for a short TTL, with started/exited diffs
+"""
+
+import os
+import re
+import shlex
+import sys
+import threading
+import time
+from typing import Optional
+
+import psutil
+
+from src import config
+
+# Wrappers, interpreters and launchers that come before the real program (script, jar,
+# app ID) in a desktop entry's Exec line or a process's command line
+EXEC_WRAPPERS = {"env", "sh", "bash", "-c", "nice", "ionice", "gtk-launch", "exec"}
+EXEC_WRAPPERS |= {"perl", "ruby", "node", "java", "mono", "wine", "gjs"}  # Interpreters
+EXEC_WRAPPERS |= {"flatpak", "snap", "run"}  # Launchers ("flatpak run <app ID>")
+
+# Versioned interpreters ("python3.12", "pypy3")
+_INTERPRETER_RE = re.compile(r"python[\d.]*|pypy[\d.]*")
+
+# ============================================================================
+# APP RECOGNITION
+# ============================================================================
+
+
+def bundle_name(path: str) -> str:
+    """
+    App name of a macOS bundle executable, or "" for anything else
+
+    Helpers inside another bundle belong to the outermost app:
+    ".../Google Chrome.app/Contents/Frameworks/.../Helper.app/Contents/MacOS/Helper"
+    → "Google Chrome".
+    """
+    if not path or ".app/Contents/" not in path:
+        return ""
+    return os.path.basename(path.split(".app/", 1)[0])
+
+
+def application_dirs() -> list:
+    """XDG folders holding .desktop files (user first, then system and Flatpak/Snap)"""
+    data_home = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    data_dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    roots = [
+        data_home,
+        *data_dirs.split(":"),
+        "/var/lib/flatpak/exports/share",
+        os.path.expanduser("~/.local/share/flatpak/exports/share"),
+        "/var/lib/snapd/desktop",
+    ]
+    seen = []
+    for root in roots:
+        folder = os.path.join(root, "applications")
+        if root and folder not in seen:
+            seen.append(folder)
+    return seen
+
+
+def _program(words: list) -> str:
+    """
+    Program a command line runs, past wrappers, interpreters and launchers
+
+    "env X=1 /usr/bin/firefox %u" → "firefox", "python3 /usr/bin/meld" → "meld",
+    "java -jar /opt/tool/tool.jar" → "tool.jar", "flatpak run org.gnome.Calculator"
+    → "org.gnome.Calculator".
+    """
+    for word in words:
+        name: str = os.path.basename(word)
+        if name in EXEC_WRAPPERS or _INTERPRETER_RE.fullmatch(name):
+            continue
+        if "=" in word or word.startswith(("-", "%")):
+            continue
+        return name
+    return ""
+
+
+def _exec_program(command: str) -> str:
+    """Program a desktop entry's Exec line runs (see _program)"""
+    try:
+        words = shlex.split(command)
+    except ValueError:
+        words = command.split()
+    return _program(words)
+
+
+def parse_desktop_entry(text: str) -> dict:
+    """
+    Keys of a .desktop file's [Desktop Entry] section
+
+    Returns:
+        {"Name": ..., "Exec": ..., ...} (localized keys like Name[de] are skipped)
+    """
+    entry: dict[str, str] = {}
+    in_section = False
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("["):
+            in_section = line == "[Desktop Entry]"
+        elif in_section and "=" in line and not line.startswith("#"):
+            key, value = line.split("=", 1)
+            if "[" not in key:
+                entry.setdefault(key.strip(), value.strip())
+    return entry
+
+
+def desktop_entries(directories: Optional[list] = None) -> list:
+    """
+    Graphical apps installed on a Linux desktop
+
+    Entries that are hidden (NoDisplay/Hidden), run in a terminal or aren't
+    applications are left out - they aren't "apps" to a user. An entry in an
+    earlier folder hides one with the same file name in a later folder.
+
+    Args:
+        directories: Folders of .desktop files (default: application_dirs())
+
+    Returns:
+        [{"id": desktop file name without .desktop, "name", "program", "exec", "wm_class"}]
+    """
+    entries, seen = [], set()
+    for folder in directories if directories is not None else application_dirs():
+        try:
+            names = sorted(os.listdir(folder))
+        except OSError:
+            continue
+        for filename in names:
+            if not filename.endswith(".desktop") or filename in seen:
+                continue
+            seen.add(filename)
+            try:
+                with open(os.path.join(folder, filename), encoding="utf-8", errors="replace") as f:
+                    entry = parse_desktop_entry(f.read())
+            except OSError:
+                continue
+            hidden = entry.get("NoDisplay", "").lower() == "true" or (
+                entry.get("Hidden", "").lower() == "true"
+            )
+            if entry.get("Type") != "Application" or hidden:
+                continue
+            if entry.get("Terminal", "").lower() == "true":
+                continue
+            program = _exec_program(entry.get("Exec", ""))
+            if program and entry.get("Name"):
+                entries.append(
+                    {
+                        "id": filename[: -len(".desktop")],
+                        "name": entry["Name"],
+                        "program": program,
+                        "exec": entry["Exec"],
+                        "wm_class": entry.get("StartupWMClass", ""),
+                    }
+                )
+    return entries
+
+
+def desktop_apps(directories: Optional[list] = None) -> dict:
+    """
+    Program name → app name for desktop_entries() (the first entry per program wins)
+
+    An entry's StartupWMClass is added in lower case, for apps whose Exec line
+    starts a launcher script rather than the process that keeps running.
+    """
+    programs: dict[str, str] = {}
+    for entry in desktop_entries(directories):
+        programs.setdefault(entry["program"], entry["name"])
+        if entry["wm_class"]:
+            programs.setdefault(entry["wm_class"].lower(), entry["name"])
+    return programs
+
+
+def psutil_processes() -> list:
+    """[{"pid", "name", "exe", "cmdline", "create_time"}] for every visible process"""
+    attrs = ["pid", "name", "exe", "cmdline", "create_time"]
+    return [process.info for process in psutil.process_iter(attrs, ad_value=None)]
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+
+class ProcessMonitor:
+    """
+    Running apps, enumerated in-process and cached for config.PROCESS_SNAPSHOT_TTL_S.
+
+    Usage:
+        monitor = ProcessMonitor()
+        monitor.apps()     # {"Safari": {"pids": [...], "started": 1700000000.0}, ...}
+        monitor.changes()  # {"started": [...], "exited": [...]} since the last changes() call
+    """
+
+    def __init__(
+        self, source=None, platform: Optional[str] = None, app_dirs: Optional[list] = None
+    ):
+        """
+        Args:
+            source: callable() → process dicts as from psutil_processes() (for tests)
+            platform: sys.platform value to recognize apps for (default: this machine)
+            app_dirs: Folders of .desktop files on Linux (default: application_dirs())
+        """
+        self.source = source or psutil_processes
+        self.platform = platform or sys.platform
+        self.app_dirs = app_dirs
+        self._programs: Optional[dict[str, str]] = None
+        self._snapshot: Optional[dict] = None
+        self._taken = 0.0
+        self._reported: Optional[dict] = None
+        self._lock = threading.Lock()
+
+    def _app_name(self, process: dict) -> str:
+        exe = process.get("exe") or ""
+        cmdline = process.get("cmdline") or []
+        if self.platform == "darwin":
+            return bundle_name(exe) or bundle_name(cmdline[0] if cmdline else "")
+        programs = self._programs
+        if programs is None:
+            programs = self._programs = desktop_apps(self.app_dirs)
+        for candidate in (
+            os.path.basename(exe),
+            process.get("name") or "",
+            _program(cmdline),  # The script or jar an interpreter runs
+        ):
+            for key in (candidate, candidate.lower()):
+                if key in programs:
+                    return programs[key]
+        return ""
+
+    def apps(self, max_age: Optional[float] = None) -> dict:
+        """
+        Running apps, from the cached snapshot if it is recent enough
+
+        Args:
+            max_age: Oldest usable snapshot in seconds (default: config.PROCESS_SNAPSHOT_TTL_S;
+                0 forces a fresh one)
+
+        Returns:
+            App name → {"pids": [...], "started": earliest process start time}
+        """
+        max_age = config.PROCESS_SNAPSHOT_TTL_S if max_age is None else max_age
+        with self._lock:
+            if self._snapshot is not None and time.monotonic() - self._taken <= max_age:
+                return self._snapshot
+            snapshot: dict = {}
+            for process in self.source():
+                name = self._app_name(process)
+                if not name:
+                    continue
+                app = snapshot.setdefault(name, {"pids": [], "started": None})
+                app["pids"].append(process["pid"])
+                started = process.get("create_time")
+                if started is not None and (app["started"] is None or started < app["started"]):
+                    app["started"] = started
+            self._snapshot, self._taken = snapshot, time.monotonic()
+            return snapshot
+
+    def is_running(self, app_name: str, max_age: Optional[float] = None) -> bool:
+        """Whether an app with this name (case-insensitive) is running; max_age as in apps()"""
+        wanted = app_name.lower().removesuffix(".app")
+        return any(name.lower() == wanted for name in self.apps(max_age))
+
+    def changes(self, max_age: Optional[float] = None) -> dict:
+        """
+        Apps started or exited since the previous changes() call
+
+        The first call has nothing to compare with and reports every running app as started.
+
+        Returns:
+            {"started": [names], "exited": [names], "running": count}
+        """
+        current = self.apps(max_age)
+        with self._lock:
+            previous: dict = self._reported if self._reported is not None else {}
+            self._reported = current
+        return {
+            "started": sorted(set(current) - set(previous)),
+            "exited": sorted(set(previous) - set(current)),
+            "running": len(current),
+        }
+
+
+# Shared by check_running_apps and the app launcher
+monitor = ProcessMonitor()
@@ -0,0 +1,88 @@
+"""
+Prompt Bundles - Precomputed Per-Provider System Prompt + Tool Set
+Compressed once at startup, cached by prompt version, with token counts for the fixed overhead
+"""
+
+import hashlib
+import json
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src import config
+from src.cost_optimizer import compress_prompt, estimate_tokens
+from src.output_shaper import shape_tools
+
+_bundles: dict[tuple, dict] = {}  # (provider, prompt version) → bundle
+_versions: dict[tuple, str] = {}  # (provider, prompt, tool objects) → prompt version
+
+
+def prompt_version(system_prompt: str, tools: list) -> str:
+    """
+    Content hash of everything sent as fixed overhead
+
+    Changes whenever the prompt text, a tool's name/description/arguments or
+    the compression setting changes, so stale bundles are never reused.
+
+    Args:
+        system_prompt: Uncompressed system prompt
+        tools: Tools bound for the provider
+
+    Returns:
+        Short version string
+    """
+    schemas = [convert_to_openai_tool(tool) for tool in tools]
+    payload = json.dumps(
+        [system_prompt, schemas, config.USE_COMPRESSED_PROMPTS], sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+def build_bundle(provider: str, system_prompt: str, tools: list) -> dict:
+    """
+    Get the prompt bundle for a provider, building it on first use
+
+    Args:
+        provider: AI provider ("groq", "gemini", "ollama")
+        system_prompt: Uncompressed system prompt for this provider
+        tools: Tools bound for this provider
+
+    Returns:
+        {"provider", "version", "system_prompt", "tools", "system_tokens",
+         "original_system_tokens", "tool_tokens", "overhead_tokens"}
+    """
+    # Hashing every schema is only needed once per prompt/tool combination
+    lookup = (provider, system_prompt, tuple(id(tool) for tool in tools))
+    if lookup not in _versions:
+        _versions[lookup] = prompt_version(system_prompt, tools)
+    version = _versions[lookup]
+    key = (provider, version)
+    if key in _bundles:
+        return _bundles[key]
+
+    compressed = compress_prompt(system_prompt)
+    system_tokens = estimate_tokens(compressed)
+    tool_tokens = sum(estimate_tokens(json.dumps(convert_to_openai_tool(tool))) for tool in tools)
+
+    bundle = {
+        "provider": provider,
+        "version": version,
+        "system_prompt": compressed,
+        "tools": shape_tools(tools),
+        "system_tokens": system_tokens,
+        "original_system_tokens": estimate_tokens(system_prompt),
+        "tool_tokens": tool_tokens,
+        "overhead_tokens": system_tokens + tool_tokens,
+    }
+    _bundles[key] = bundle
+    return bundle
+
+
+def print_bundle(bundle: dict):
+    """Print a bundle's fixed per-request token overhead"""
+    print(
+        f"📦 {bundle['provider'].upper()} prompt v{bundle['version'][:7]}: "
+        f"system {bundle['system_tokens']:,} tokens "
+        f"(was {bundle['original_system_tokens']:,}), "
+        f"{len(bundle['tools'])} tools {bundle['tool_tokens']:,} tokens, "
+        f"overhead ~{bundle['overhead_tokens']:,}/request"
+    )
@@ -0,0 +1,60 @@
+"""
+Response Format - Compact Structured Tool Responses
+Verbose tools return minimal JSON to the model; the rich banner is still shown on the console
+"""
+
+import json
+
+from src import config
+
+# Active format: "compact" (JSON for the model) or "rich" (emoji banners)
+_mode = "rich"
+
+
+class ToolResponse(str):
+    """
+    Tool result as seen by the model, carrying the rich console rendering.
+
+    Behaves as a plain string everywhere; the output shaper prints
+    `console_text` for the user and sends the string itself to the model.
+    """
+
+    console_text: str
+
+    def __new__(cls, text: str, console_text: str):
+        response = super().__new__(cls, text)
+        response.console_text = console_text
+        return response
+
+
+def set_provider(provider: str):
+    """
+    Select the response format for a provider
+
+    Args:
+        provider: AI provider ("groq", "gemini", "ollama")
+    """
+    global _mode
+    _mode = config.RESPONSE_FORMAT.get(provider, "rich")
+
+
+def get_mode() -> str:
+    """Current response format ("compact" or "rich")"""
+    return _mode
+
+
+def respond(data: dict, rich_text: str) -> str:
+    """
+    Build a tool result in the active format
+
+    Args:
+        data: Structured result (same information as the rich text)
+        rich_text: Human-readable rendering for the console
+
+    Returns:
+        Rich text in "rich" mode, otherwise compact JSON carrying the rich text
+    """
+    if _mode != "compact":
+        return rich_text
+    compact = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return ToolResponse(compact, rich_text)
@@ -0,0 +1,499 @@
+"""
+Safety - Compiled, Shell-Aware Check for Destructive Actions
+One precompiled regex scans any text; shell commands are tokenized with shlex and judged by their argv
+"""
+
+import functools
+import os
+import re
+import shlex
+
+# Part of every cached decision's key - bump it whenever a rule changes
+RULES_VERSION = 2
+
+# Longer command lines are scanned like text instead of being fully tokenized,
+# and their decisions go to a small cache of their own (big type_text payloads)
+PARSE_MAX_CHARS = 65536
+LARGE_CACHE_SIZE = 8
+
+# Rule sets: "command" = a shell command line, "text" = anything else (typed text,
+# prompts, paths, app names, URLs)
+KINDS = ("command", "text")
+
+# Programs that are destructive just by running
+SHUTDOWN_PROGRAMS = {"shutdown", "halt", "reboot", "poweroff"}
+KILL_ALL_PROGRAMS = {"killall", "pkill"}
+FORMAT_PROGRAMS = {"mkfs", "mke2fs", "newfs", "wipefs"}
+
+# diskutil verbs that wipe a disk
+DISKUTIL_ERASE = {
+    "erasedisk",
+    "erasevolume",
+    "zerodisk",
+    "randomdisk",
+    "secureerase",
+    "reformat",
+    "partitiondisk",
+}
+
+# Commands that run the rest of their argv, and their options that take a value
+WRAPPERS = {
+    "sudo": {"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-U"},
+    "doas": {"-u", "-C"},
+    "env": {"-u", "-C", "-S"},
+    "nohup": set(),
+    "time": set(),
+    "nice": {"-n"},
+    "ionice": {"-c", "-n"},
+    "timeout": {"-s", "-k", "--signal", "--kill-after"},
+    "xargs": {"-I", "-n", "-P", "-L", "-d", "-E", "-s", "-a"},
+    "watch": {"-n", "-d", "--interval"},
+    "stdbuf": set(),
+    "command": set(),
+    "exec": set(),
+    "builtin": set(),
+    "caffeinate": set(),
+}
+ELEVATORS = {"sudo", "doas"}
+SHELLS = {"sh", "bash", "zsh", "dash", "ksh", "fish"}
+
+# Shell reserved words a command can follow ("if true; then rm -rf ~; fi", "{ rm -rf ~; }")
+RESERVED_WORDS = {"if", "then", "elif", "else", "do", "while", "until", "{", "!"}
+
+# find actions that run a command on each match ("find ~ -exec rm -rf {} +")
+FIND_EXEC = {"-exec", "-execdir", "-ok", "-okdir"}
+
+# Interpreters and the option that runs code from the next argument (python3 -c '...')
+INTERPRETERS = {"python": "c", "perl": "e", "ruby": "e", "node": "e", "osascript": "e", "php": "r"}
+
+# Programs that only count when they really are the command (not a word in prose)
+BY_NAME_ONLY = SHUTDOWN_PROGRAMS | KILL_ALL_PROGRAMS
+
+# Every program judge_argv() has a rule for
+PROGRAMS = (
+    SHUTDOWN_PROGRAMS
+    | KILL_ALL_PROGRAMS
+    | FORMAT_PROGRAMS
+    | SHELLS
+    | {"eval", "rm", "dd", "chmod", "chown", "chgrp", "mv", "format", "diskutil"}
+    | {"init", "telinit", "systemctl", "kill", "find", "watch"}
+    | set(INTERPRETERS)
+)
+
+# Targets that take the whole machine or home folder with them
+ROOT_TARGETS = {
+    "/",
+    "/*",
+    "~",
+    "~/",
+    "~/*",
+    "$HOME",
+    "$HOME/",
+    "$HOME/*",
+    "/bin",
+    "/etc",
+    "/home",
+    "/System",
+    "/Users",
+    "/usr",
+}
+
+# Whole disks and partitions (not /dev/null, /dev/zero, ...)
+DISK_DEVICE = r"/dev/(?:r?disk\d|sd[a-z]|hd[a-z]|vd[a-z]|xvd[a-z]|nvme\d|mmcblk\d)"
+
+# ============================================================================
+# COMPILED SCAN
+# ============================================================================
+
+# Command words whose surroundings are tokenized and judged by their argv, each
+# with what must follow it on the line for any rule to apply (cheap pre-filter).
+# BY_NAME_ONLY programs are matched by the regex alone, at command position.
+TRIGGERS = {
+    "rm": "",
+    "mkfs": "",
+    "mke2fs": "",
+    "newfs": "",
+    "wipefs": "",
+    "dd": r"(?=[^\n]{0,200}\bof=/dev/)",
+    "init": r"(?=\s+[06]\b)",
+    "telinit": r"(?=\s+[06]\b)",
+    "systemctl": r"(?=(?:\s+-\S+)*\s+(?:halt|reboot|poweroff|kexec)\b)",
+    "kill": r"(?=[^\n]{0,80}\s-1\b)",
+    "chmod": r"(?=[^\n]{0,200}(?:\s-\w*r|--recursive))",
+    "chown": r"(?=[^\n]{0,200}(?:\s-\w*r|--recursive))",
+    "chgrp": r"(?=[^\n]{0,200}(?:\s-\w*r|--recursive))",
+    "mv": r"(?=[^\n]{0,200}\s(?:/|~|\$HOME))",
+    "format": r"(?=\s+[a-z]:(?!\w))",
+    "diskutil": r"(?=\s+(?:erase|zero|random|secure|reformat|partition))",
+    "sh": r"(?=\s+-\w*c)",
+    "bash": r"(?=\s+-\w*c)",
+    "zsh": r"(?=\s+-\w*c)",
+    "dash": r"(?=\s+-\w*c)",
+    "ksh": r"(?=\s+-\w*c)",
+    "fish": r"(?=\s+-\w*c)",
+    "eval": r"(?=\s+\S)",
+}
+
+# Characters a command word can follow (besides the start of a line)
+BOUNDARY = r"[\s;(|&`/\\'\"]"
+
+# Start of a command: a line, a separator or a "$" prompt, then any reserved words and wrappers
+COMMAND_START = (
+    r"(?<=[\n;&|(`$])[^\S\n]*(?:(?:"
+    + "|".join([re.escape(word) for word in RESERVED_WORDS] + list(WRAPPERS))
+    + r")[^\S\n]+(?:-\S+[^\S\n]+)*)*"
+)
+
+# Suffixes of program families (mkfs.ext4, newfs_hfs)
+VARIANTS = {"mkfs": r"(?:\.\w+)?", "newfs": r"(?:_\w+)?"}
+
+
+def _trie(words: dict) -> str:
+    """Alternation grouped by first letter, so the engine tests one branch per letter"""
+    branches: dict[str, list] = {}
+    for word, follows in words.items():
+        branches.setdefault(word[0], []).append(
+            rf"{word[1:]}{VARIANTS.get(word, '')}(?![\w-]){follows}"
+        )
+    return "|".join(f"{letter}(?:{'|'.join(rest)})" for letter, rest in branches.items())
+
+
+# Letters a trigger or phrase (delete system, fork bomb) can start with
+FIRST_LETTERS = "".join(sorted({word[0] for word in TRIGGERS} | {"d", "f"}))
+
+# All rules in one regex, run once over the lower-cased text. Every match begins
+# with one character of a small class - the engine skips to those in C and only
+# then tries the rules, with a one-letter look-ahead before the word trie.
+SCAN = re.compile(
+    r"[:>\s;&|(`$/\\'\"](?:"
+    rf"(?<={BOUNDARY})(?=[{FIRST_LETTERS}])(?:"
+    rf"(?P<trigger>{_trie(TRIGGERS)})"
+    r"|(?P<delete_system>delete\s+(?:the\s+)?system\b)"
+    r"|(?P<fork_bomb_phrase>fork\s+bomb\b)"
+    r")"
+    r"|(?<=:)\s*\(\s*\)\s*\{\s*:\s*\|\s*:\s*(?P<fork_bomb>&)"
+    rf"|(?<=>)\s*(?P<disk_write>{DISK_DEVICE})"
+    rf"|{COMMAND_START}(?P<by_name>{'|'.join(BY_NAME_ONLY)})(?![\w.-])"
+    r")"
+)
+# Same rules for text whose lower-case form has a different length (rare non-ASCII)
+SCAN_ANY_CASE = re.compile(SCAN.pattern, re.IGNORECASE)
+
+FINDINGS = {
+    "fork_bomb": "fork bomb",
+    "fork_bomb_phrase": "fork bomb",
+    "disk_write": "write to a disk device",
+    "delete_system": "delete system",
+}
+
+# How much of a line around a trigger is looked at (bounds the work on huge lines)
+PREFIX_CHARS = 80
+SEGMENT_CHARS = 256
+SEGMENT_WORDS = 16
+
+SEPARATOR_CHARS = set("();|&")
+REDIRECT_CHARS = set("<>&")
+
+# ============================================================================
+# SHELL COMMANDS
+# ============================================================================
+
+
+def _program(word: str) -> str:
+    """
+    Program name of an argv[0] ("/bin/rm" → "rm", "\\rm" → "rm", "python3.12" → "python");
+    case-folded for macOS
+    """
+    name = os.path.basename(word).lstrip("\\").lower()
+    return "python" if re.fullmatch(r"python[\d.]*", name) else name
+
+
+def simple_commands(command: str) -> list:
+    """
+    Split a shell command line into the argv of each simple command
+
+    Splits at ; && || | & newlines, subshells and command substitutions; quotes
+    are honoured ("echo 'rm -rf /'" is one echo). Reserved words that start a
+    command ("then", "do", "{", ...) are dropped. A redirection to a disk device
+    is kept as a ">" word followed by its target.
+
+    Returns:
+        [[word, ...], ...]
+    """
+    command = command.replace("\\\n", "").replace("\n", ";").replace("`", ";")
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    try:
+        words = list(lexer)
+    except ValueError:  # Unbalanced quotes - fall back to plain words
+        words = re.sub(r"([;&|()])", r" \1 ", command).split()
+    commands: list = []
+    argv: list = []
+    for word in words:
+        if word and set(word) <= SEPARATOR_CHARS and not set(word) & {"<", ">"}:
+            if argv:
+                commands.append(argv)
+            argv = []
+        elif word and set(word) <= REDIRECT_CHARS:
+            argv.append(">")
+        elif not argv and word in RESERVED_WORDS:
+            continue
+        else:
+            argv.append(word)
+    if argv:
+        commands.append(argv)
+    return commands
+
+
+def _unwrap(argv: list) -> tuple:
+    """Strip sudo/env/nohup/VAR=value/... → (argv of the real program, whether elevated)"""
+    elevated, i = False, 0
+    while i < len(argv):
+        name = _program(argv[i])
+        if name in WRAPPERS:
+            elevated |= name in ELEVATORS
+            i += 1
+            while i < len(argv) and (argv[i].startswith("-") or (name == "env" and "=" in argv[i])):
+                i += 2 if argv[i] in WRAPPERS[name] else 1
+            if name == "timeout" and i < len(argv):
+                i += 1  # Duration
+        elif re.match(r"[A-Za-z_]\w*=", argv[i]):
+            i += 1
+        else:
+            break
+    return argv[i:], elevated
+
+
+def _options(args: list) -> tuple:
+    """(short option letters, long options, operands) - options end at "--" """
+    short, long, operands = set(), set(), []
+    for i, arg in enumerate(args):
+        if arg == "--":
+            operands.extend(args[i + 1 :])
+            break
+        if arg.startswith("--"):
+            long.add(arg.split("=", 1)[0].lower())
+        elif arg.startswith("-") and len(arg) > 1:
+            short.update(arg[1:])
+        else:
+            operands.append(arg)
+    return short, long, operands
+
+
+def judge_argv(argv: list, command_position: bool = True, depth: int = 0) -> str:
+    """
+    Why one simple command is destructive, or "" if it isn't
+
+    Args:
+        argv: Words of the command (wrappers like sudo included)
+        command_position: argv[0] really is a command (False for a word in prose -
+            then programs that are only dangerous by name, like reboot, don't count)
+        depth: Nesting of sh -c / eval / find -exec / watch (bounded)
+    """
+    if ">" in argv:
+        for i, word in enumerate(argv[:-1]):
+            if word == ">" and re.match(DISK_DEVICE, argv[i + 1]):
+                return FINDINGS["disk_write"]
+        argv = [word for word in argv if word != ">"]
+    argv, elevated = _unwrap(argv)
+    if not argv:
+        return ""
+    name, args = _program(argv[0]), argv[1:]
+    if name not in PROGRAMS and not name.startswith(("mkfs.", "newfs_")):
+        return ""
+    if name in INTERPRETERS:
+        letter = INTERPRETERS[name]
+        flag = next((i for i, a in enumerate(args) if re.fullmatch(rf"-[a-z]*{letter}", a)), None)
+        return _scan(args[flag + 1]) if flag is not None and flag + 1 < len(args) else ""
+    if name == "find":
+        if depth >= 3:
+            return ""
+        for i, arg in enumerate(args):
+            if arg in FIND_EXEC:
+                end = next((j for j in range(i + 1, len(args)) if args[j] in (";", "+")), None)
+                reason = judge_argv(args[i + 1 : end], True, depth + 1)
+                if reason:
+                    return reason
+        return ""
+    if name in SHELLS or name in ("eval", "watch"):
+        if depth >= 3:
+            return ""
+        if name in ("eval", "watch"):  # watch runs its arguments with sh -c
+            inner = " ".join(args)
+        else:
+            flag = next((i for i, a in enumerate(args) if re.fullmatch(r"-[a-z]*c[a-z]*", a)), None)
+            inner = args[flag + 1] if flag is not None and flag + 1 < len(args) else ""
+        for sub in simple_commands(inner):
+            reason = judge_argv(sub, True, depth + 1)
+            if reason:
+                return reason
+        return ""
+    if name in ("rm", "chmod", "chown", "chgrp", "mv"):
+        short, long, operands = _options(args)
+        recursive = bool(short & {"r", "R"}) or "--recursive" in long
+    else:
+        operands = [arg for arg in args[:4] if not arg.startswith("-")]
+    if name == "rm":
+        if recursive and ("f" in short or "--force" in long):
+            return "rm -rf"
+        if recursive and set(operands) & ROOT_TARGETS:
+            return "rm -r on a system folder"
+        if elevated:
+            return "sudo rm"
+        return ""
+    if name in FORMAT_PROGRAMS or name.startswith(("mkfs.", "newfs_")):
+        return "mkfs"
+    if name == "dd":
+        if any(re.match(r"of=" + DISK_DEVICE, arg) for arg in args):
+            return "dd to a disk device"
+        return ""
+    if name in ("chmod", "chown", "chgrp"):
+        if recursive and set(operands) & ROOT_TARGETS:
+            return f"{name} -R on a system folder"
+        return ""
+    if name == "mv":
+        if set(operands[:-1]) & ROOT_TARGETS:
+            return "mv of a system folder"
+        return ""
+    if name == "format":
+        if operands and re.fullmatch(r"[a-z]:", operands[0], re.IGNORECASE):
+            return "format drive"
+        return ""
+    if name == "diskutil":
+        if operands and operands[0].lower() in DISKUTIL_ERASE:
+            return "diskutil erase"
+        return ""
+    if name in ("init", "telinit"):
+        if operands[:1] in (["0"], ["6"]):
+            return f"init {operands[0]}"
+        return ""
+    if name == "systemctl":
+        if operands and operands[0].lower() in SHUTDOWN_PROGRAMS | {"kexec"}:
+            return "shutdown"
+        return ""
+    if name == "kill":
+        if "-1" in args[-1:]:
+            return "kill -1 (every process)"
+        return ""
+    if not command_position:
+        return ""
+    return name if name in BY_NAME_ONLY else ""
+
+
+# ============================================================================
+# DECISIONS
+# ============================================================================
+
+
+def _command_position(text: str, line_start: int, pos: int) -> tuple:
+    """
+    (whether the word at pos starts a command, whether sudo/doas precede it)
+
+    Walks back over wrapper words and their options to the line start or a
+    separator (; & | ( ` or a "$" prompt).
+    """
+    words = text[max(line_start, pos - PREFIX_CHARS) : pos].split()
+    elevated = False
+    while words and (
+        words[-1].lower() in WRAPPERS
+        or words[-1].lower() in RESERVED_WORDS
+        or words[-1].startswith("-")
+    ):
+        elevated |= words.pop().lower() in ELEVATORS
+    if not words:
+        return pos - line_start <= PREFIX_CHARS, elevated
+    return words[-1].endswith((";", "&", "|", "(", "`", "$")), elevated
+
+
+def _matches(text: str):
+    """(rule group, start in text, match) for each SCAN match, in order"""
+    lowered = "\n" + text.lower()  # The newline lets a command word start the text
+    scan = SCAN
+    if len(lowered) != len(text) + 1:
+        lowered, scan = "\n" + text, SCAN_ANY_CASE
+    for match in scan.finditer(lowered):
+        group = match.lastgroup
+        if group is None:  # Every alternative is a named group
+            continue
+        yield group, match.start(group) - 1, match
+
+
+def _segment_argv(segment: str) -> list:
+    """argv of the first simple command in a segment (plain split unless it is quoted)"""
+    if not any(char in segment for char in "'\"\\`$"):
+        return re.split(r"[;&|()]", segment, maxsplit=1)[0].split()[:SEGMENT_WORDS]
+    commands = simple_commands(segment)
+    return commands[0][:SEGMENT_WORDS] if commands else []
+
+
+def _scan(text: str) -> str:
+    """
+    Reason from the compiled scan: direct findings, then the argv that starts
+    at each command word
+    """
+    for kind, pos, match in _matches(text):
+        if kind == "by_name":
+            return str(match.group(kind)).lower()
+        if kind != "trigger":
+            return FINDINGS[kind]
+        line_start = text.rfind("\n", max(0, pos - PREFIX_CHARS), pos) + 1
+        if line_start == 0 and pos > PREFIX_CHARS:
+            line_start = pos - PREFIX_CHARS - 1  # Long line - its start is out of view
+        at_start, elevated = _command_position(text, line_start, pos)
+        line_end = text.find("\n", pos, pos + SEGMENT_CHARS)
+        segment = text[pos : line_end if line_end >= 0 else pos + SEGMENT_CHARS]
+        argv = (["sudo"] if elevated else []) + _segment_argv(segment)
+        reason = judge_argv(argv, at_start)
+        if reason:
+            return reason
+    return ""
+
+
+def _check(text: str, kind: str) -> str:
+    if kind == "command" and len(text) <= PARSE_MAX_CHARS:
+        for argv in simple_commands(text):
+            reason = judge_argv(argv)
+            if reason:
+                return reason
+    # Also the backstop for command lines: quoting or syntax the argv split
+    # doesn't follow still can't hide a destructive command word
+    return _scan(text)
+
+
+# Decisions per (text, rule set, RULES_VERSION). A repeated check costs a dict
+# lookup - for a big payload too, since a str caches its own hash.
+@functools.lru_cache(maxsize=2048)
+def _cached_check(text: str, kind: str, version: int) -> str:
+    return _check(text, kind)
+
+
+@functools.lru_cache(maxsize=LARGE_CACHE_SIZE)
+def _cached_large_check(text: str, kind: str, version: int) -> str:
+    return _check(text, kind)
+
+
+def check(text, kind: str = "text") -> str:
+    """
+    Why an action is unsafe, or "" if it is allowed
+
+    Args:
+        text: What is about to be run, typed, opened or sent to the model
+        kind: "command" for a shell command line (judged by the argv of every
+            simple command in it, then scanned like text), "text" for anything
+            else (judged around command words found by the compiled scan)
+
+    Returns:
+        A short reason like "rm -rf" or "mkfs", or ""
+    """
+    if kind not in KINDS:
+        raise ValueError(f"unknown kind '{kind}' (expected one of {KINDS})")
+    text = str(text)
+    if len(text) > PARSE_MAX_CHARS:
+        return _cached_large_check(text, kind, RULES_VERSION)
+    return _cached_check(text, kind, RULES_VERSION)
+
+
+def is_safe(text, kind: str = "text") -> bool:
+    """Whether check() finds nothing destructive"""
+    return not check(text, kind)
@@ -0,0 +1,311 @@
+"""
+Screen Capture - Region Capture, Downscaling, Compact Encoding and a Frame Buffer
+Screenshots stay in memory as small JPEG/WebP frames; nothing touches the disk unless asked
+"""
+
+import io
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from src import config
+from src.input_backend import RecordingBackend, get_backend
+
+FORMATS = {"jpeg": "JPEG", "webp": "WEBP", "png": "PNG"}
+
+EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp", "png": ".png"}
+
+# ============================================================================
+# CAPTURE & ENCODING
+# ============================================================================
+
+
+def parse_region(region) -> Optional[tuple]:
+    """
+    Region as (left, top, width, height)
+
+    Args:
+        region: "x,y,w,h" string, 4-item sequence, or None/"" for the whole screen
+
+    Raises:
+        ValueError: If it isn't four numbers with a positive width and height
+    """
+    if region is None or region == "":
+        return None
+    parts = region.replace(" ", "").split(",") if isinstance(region, str) else list(region)
+    try:
+        left, top, width, height = (int(float(part)) for part in parts)
+    except (TypeError, ValueError):
+        raise ValueError(f"region must be 'x,y,width,height', got {region!r}") from None
+    if width <= 0 or height <= 0 or left < 0 or top < 0:
+        raise ValueError(f"region needs x,y >= 0 and a positive size, got {region!r}")
+    return left, top, width, height
+
+
+def downscale(image: Image.Image, max_width: int) -> Image.Image:
+    """Shrink to at most max_width pixels wide, keeping the aspect ratio (0 = no limit)"""
+    if not max_width or image.width <= max_width:
+        return image
+    height = max(1, round(image.height * max_width / image.width))
+    # reducing_gap shrinks by an integer factor first (fast), then resamples the rest
+    return image.resize((max_width, height), Image.Resampling.BILINEAR, reducing_gap=2.0)
+
+
+def encode(image: Image.Image, fmt: str, quality: int) -> bytes:
+    """
+    Encode an image as JPEG, WebP or PNG
+
+    Raises:
+        ValueError: For an unknown format
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}, got {fmt!r}")
+    if fmt != "png" and image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    buffer = io.BytesIO()
+    if fmt == "png":
+        image.save(buffer, "PNG", compress_level=1)
+    elif fmt == "webp":
+        image.save(buffer, "WEBP", quality=quality, method=0)
+    else:
+        image.save(buffer, "JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def capture(
+    region=None,
+    max_width: Optional[int] = None,
+    fmt: Optional[str] = None,
+    quality: Optional[int] = None,
+    backend=None,
+) -> dict:
+    """
+    Capture the screen (or a region of it), downscale and encode it
+
+    Args:
+        region: (left, top, width, height) in screen points, "x,y,w,h", or None for everything
+        max_width: Widest frame in pixels (default: config.SCREENSHOT_MAX_WIDTH, 0 = full size)
+        fmt: "jpeg", "webp" or "png" (default: config.SCREENSHOT_FORMAT)
+        quality: JPEG/WebP quality 1-100 (default: config.SCREENSHOT_QUALITY)
+        backend: Input backend (default: the active one)
+
+    Returns:
+        Frame: {"time", "region", "source_size", "size", "format", "data", "capture_ms",
+        "encode_ms"}
+    """
+    backend = backend or get_backend()
+    region = parse_region(region)
+    max_width = config.SCREENSHOT_MAX_WIDTH if max_width is None else max_width
+    fmt = fmt or config.SCREENSHOT_FORMAT
+    quality = quality or config.SCREENSHOT_QUALITY
+
+    start = time.perf_counter()
+    image = backend.screenshot(region)
+    captured = time.perf_counter()
+    small = downscale(image, max_width)
+    data = encode(small, fmt, quality)
+    return {
+        "time": time.time(),
+        "region": region,
+        "source_size": image.size,
+        "size": small.size,
+        "format": fmt,
+        "data": data,
+        "capture_ms": (captured - start) * 1000,
+        "encode_ms": (time.perf_counter() - captured) * 1000,
+    }
+
+
+def describe(frame: dict) -> str:
+    """One-line summary: size, format, bytes and latency"""
+    width, height = frame["size"]
+    where = ""
+    if frame["region"]:
+        left, top, region_width, region_height = frame["region"]
+        where = f" of region {left},{top} {region_width}x{region_height}"
+    return (
+        f"{width}x{height} {frame['format'].upper()}{where}, {len(frame['data']) / 1024:.0f} KB, "
+        f"{frame['capture_ms'] + frame['encode_ms']:.0f} ms"
+    )
+
+
+def save_frame(frame: dict, filename: str = "", directory: Optional[str] = None) -> str:
+    """
+    Write a frame to disk
+
+    Args:
+        frame: Captured frame
+        filename: File name (default: screenshot_<time>.<ext>); the extension follows the format
+        directory: Target folder (default: config.SCREENSHOT_DIR)
+
+    Returns:
+        Path of the written file
+    """
+    directory = os.path.expanduser(directory or config.SCREENSHOT_DIR)
+    stamp = datetime.fromtimestamp(frame["time"]).strftime("%Y%m%d_%H%M%S")
+    stem = os.path.splitext(filename)[0] if filename else f"screenshot_{stamp}"
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, stem + EXTENSIONS[frame["format"]])
+    with open(path, "wb") as f:
+        f.write(frame["data"])
+    return path
+
+
+# ============================================================================
+# FRAME BUFFER
+# ============================================================================
+
+
+class FrameBuffer:
+    """
+    The last N captured frames, newest last, with their timestamps.
+
+    Usage:
+        buffer = FrameBuffer(size=8)
+        frame = buffer.capture(region="0,0,800,600")
+        buffer.latest()
+        save_frame(frame)  # Only now does it touch the disk
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self._frames: deque = deque(maxlen=size or config.SCREENSHOT_BUFFER_FRAMES)
+        self._lock = threading.Lock()
+        self._count = 0
+
+    def add(self, frame: dict) -> dict:
+        """Store a frame (dropping the oldest when full); it gets a running "number" """
+        with self._lock:
+            self._count += 1
+            frame["number"] = self._count
+            self._frames.append(frame)
+        return frame
+
+    def capture(self, region=None, **options) -> dict:
+        """capture() and store the frame; options as in capture()"""
+        return self.add(capture(region, **options))
+
+    def latest(self) -> Optional[dict]:
+        """Newest frame, or None"""
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+
+    def frames(self, since: Optional[float] = None) -> list:
+        """Buffered frames, oldest first (only those taken after `since` if given)"""
+        with self._lock:
+            return [f for f in self._frames if since is None or f["time"] > since]
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+
+    def __len__(self):
+        return len(self._frames)
+
+
+# Frames captured by the take_screenshot tool and the screen_wait samples
+frame_buffer = FrameBuffer()
+
+
+# ============================================================================
+# BENCHMARK (offline, synthetic frames)
+# ============================================================================
+
+
+def synthetic_screen(size: tuple = (2880, 1800), seed: int = 0) -> Image.Image:
+    """
+    Desktop-like test frame: photo-like wallpaper, flat windows and rows of "text"
+
+    Args:
+        size: Pixel size (default: a 15" Retina display)
+        seed: Layout seed
+    """
+    width, height = size
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0:height, 0:width]
+    wallpaper = np.stack(
+        [40 + 60 * x / width, 60 + 40 * y / height, 120 + 50 * (x + y) / (width + height)], axis=-1
+    )
+    grain = rng.normal(0, 6, (height, width, 1))  # Photo texture (what makes PNGs big)
+    pixels = np.clip(wallpaper + grain, 0, 255).astype(np.uint8)
+    for _ in range(6):
+        w, h = (
+            int(rng.integers(width // 5, width // 2)),
+            int(rng.integers(height // 5, height // 2)),
+        )
+        left, top = int(rng.integers(0, width - w)), int(rng.integers(0, height - h))
+        pixels[top : top + h, left : left + w] = 245
+        pixels[top : top + 40, left : left + w] = 215  # Title bar
+        columns = np.arange(w - 40)
+        for row in range(top + 60, top + h - 20, 28):  # Lines of 10 px "glyphs" and spaces
+            letters = rng.random((w - 40) // 10 + 1) < 0.8
+            strokes = letters[columns // 10] & (columns % 10 < 7) & (columns % 3 != 1)
+            pixels[row : row + 14, left + 20 : left + w - 20][:, strokes] = 30
+    return Image.fromarray(pixels)
+
+
+def benchmark(rounds: int = 5, size: tuple = (2880, 1800)) -> list:
+    """
+    Capture-to-bytes latency and output size per mode, on a synthetic Retina frame
+
+    Args:
+        rounds: Captures per mode (the median is reported)
+        size: Synthetic screen size in pixels
+
+    Returns:
+        [{"mode", "size", "kb", "ms"}] - "legacy" is the old full-resolution PNG
+        written to disk
+    """
+    screen = synthetic_screen(size)
+    backend = RecordingBackend(screen=size, frames=lambda clock: screen)
+    modes: list[tuple[str, Optional[dict[str, Any]]]] = [
+        ("legacy (full png)", None),
+        ("png full", {"fmt": "png", "max_width": 0}),
+        ("jpeg 1280", {"fmt": "jpeg", "max_width": 1280}),
+        ("webp 1280", {"fmt": "webp", "max_width": 1280}),
+        ("jpeg 800", {"fmt": "jpeg", "max_width": 800}),
+        ("jpeg region", {"fmt": "jpeg", "max_width": 1280, "region": (0, 0, 1000, 700)}),
+    ]
+    rows = []
+    for mode, options in modes:
+        times, sizes, shape = [], [], size
+        for _ in range(rounds):
+            start = time.perf_counter()
+            if options is None:
+                buffer = io.BytesIO()  # Same PNG encoder the file write used
+                backend.screenshot().save(buffer, "PNG")
+                data = buffer.getvalue()
+            else:
+                frame = capture(backend=backend, quality=config.SCREENSHOT_QUALITY, **options)
+                data, shape = frame["data"], frame["size"]
+            times.append(time.perf_counter() - start)
+            sizes.append(len(data))
+        rows.append(
+            {
+                "mode": mode,
+                "size": shape,
+                "kb": sizes[-1] / 1024,
+                "ms": float(np.median(times)) * 1000,
+            }
+        )
+    return rows
+
+
+def main():
+    """Print the capture benchmark"""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"📸 Screenshot benchmark ({rounds} rounds, synthetic 2880x1800 frame)")
+    print(f"   {'mode':<20} {'size':>10} {'KB':>8} {'ms':>8}")
+    for row in benchmark(rounds):
+        size = f"{row['size'][0]}x{row['size'][1]}"
+        print(f"   {row['mode']:<20} {size:>10} {row['kb']:>8.0f} {row['ms']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Screen Wait - Wait Until the Screen Stops Changing
+Samples tiny grayscale frames and differences them with NumPy instead of sleeping a guessed delay
+"""
+
+import io
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+from src import config
+from src.input_backend import get_backend
+from src.screen_capture import frame_buffer, parse_region
+
+# Brightness change (0-255) for a sample pixel to count as changed (ignores JPEG-like noise)
+PIXEL_DELTA = 16
+
+# With require_change, a screen that hasn't changed at all by then is taken as settled
+# (e.g. the app was already frontmost) instead of waiting out the timeout
+CHANGE_GRACE_S = 1.5
+
+# ============================================================================
+# FRAME DIFFERENCING
+# ============================================================================
+
+
+def sample(region=None, backend=None) -> np.ndarray:
+    """
+    Small grayscale copy of the screen (or region) for comparing frames
+
+    The sample is captured through the frame buffer (as a lossless PNG frame), so
+    the buffer also holds what the screen looked like while waiting.
+
+    Args:
+        region: (left, top, width, height), "x,y,w,h" or None for the whole screen
+        backend: Input backend (default: the active one)
+
+    Returns:
+        uint8 array, config.SCREEN_STABLE_SAMPLE_WIDTH pixels wide at most
+    """
+    backend = backend or get_backend()
+    frame = frame_buffer.capture(
+        region, max_width=config.SCREEN_STABLE_SAMPLE_WIDTH, fmt="png", backend=backend
+    )
+    return np.asarray(Image.open(io.BytesIO(frame["data"])).convert("L"))
+
+
+def changed_fraction(before: np.ndarray, after: np.ndarray) -> float:
+    """Share of sample pixels whose brightness moved by more than PIXEL_DELTA"""
+    if before.shape != after.shape:
+        return 1.0
+    delta = np.abs(before.astype(np.int16) - after.astype(np.int16))
+    return float(np.count_nonzero(delta > PIXEL_DELTA)) / delta.size
+
+
+# ============================================================================
+# WAITING
+# ============================================================================
+
+
+def wait_for_stable(
+    region=None,
+    timeout: Optional[float] = None,
+    stable_for: Optional[float] = None,
+    require_change: bool = False,
+    backend=None,
+) -> dict:
+    """
+    Return as soon as the screen (or region) has stopped changing, or at the timeout
+
+    Args:
+        region: Region of interest (default: the whole screen)
+        timeout: Longest wait in seconds (default: config.SCREEN_STABLE_TIMEOUT_S)
+        stable_for: How long it must stay unchanged (default: config.SCREEN_STABLE_FOR_S)
+        require_change: Wait for something to change first (e.g. a window that hasn't
+            appeared yet), then for it to settle - for up to CHANGE_GRACE_S
+        backend: Input backend (default: the active one)
+
+    Returns:
+        {"stable": bool, "waited_s", "samples", "changed": whether anything moved}
+    """
+    backend = backend or get_backend()
+    timeout = config.SCREEN_STABLE_TIMEOUT_S if timeout is None else timeout
+    stable_for = config.SCREEN_STABLE_FOR_S if stable_for is None else stable_for
+    region = parse_region(region)
+
+    start = backend.now()
+    previous = sample(region, backend)
+    samples, changed, quiet_since = 1, False, start
+    stable = False
+    while backend.now() - start < timeout:
+        backend.sleep(config.SCREEN_STABLE_INTERVAL_S)
+        current = sample(region, backend)
+        samples += 1
+        now = backend.now()
+        if changed_fraction(previous, current) > config.SCREEN_STABLE_TOLERANCE:
+            changed, quiet_since = True, now
+        elif (changed or not require_change or now - start >= CHANGE_GRACE_S) and (
+            now - quiet_since >= stable_for
+        ):
+            stable = True
+            break
+        previous = current
+    return {
+        "stable": stable,
+        "waited_s": round(backend.now() - start, 3),
+        "samples": samples,
+        "changed": changed,
+    }
+
+
+def settle(timeout: Optional[float] = None, backend=None) -> str:
+    """
+    Wait for the UI to settle after an action, when the model asks for it (wait=True)
+
+    Returns:
+        Note for the tool result ("" when the screen can't be read)
+    """
+    timeout = config.SETTLE_TIMEOUT_S if timeout is None else timeout
+    try:
+        result = wait_for_stable(timeout=timeout, backend=backend)
+    except Exception:
+        return ""  # No screen access (headless, no permission) - don't fail the action
+    if result["stable"]:
+        return f" Screen settled after {result['waited_s']:.2f}s."
+    return f" Screen still changing after {result['waited_s']:.1f}s."
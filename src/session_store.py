@@ -0,0 +1,247 @@
+"""
+Session Store - Durable On-Disk Checkpointer with Named Sessions
+Agent state survives crashes/restarts; multiple conversations can be listed, resumed and deleted
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from src import config
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:  # langgraph-checkpoint-sqlite not installed
+    SqliteSaver = None  # type: ignore[assignment,misc]
+
+SESSIONS_DB = Path.home() / ".ai_robot_sessions.db"
+
+# Task status recorded per session (a "running" task at startup was interrupted)
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def new_session_id() -> str:
+    """Generate a readable session ID (e.g. session-20250101-153000)"""
+    return datetime.now().strftime("session-%Y%m%d-%H%M%S")
+
+
+class SessionStore:
+    """
+    SQLite-backed checkpointer plus a small table of named sessions.
+
+    Each session is a LangGraph thread. Checkpoints beyond the newest
+    `config.CHECKPOINT_RETENTION` per session are pruned after every task, and
+    sessions untouched for `config.SESSION_MAX_AGE_DAYS` are deleted at startup.
+    Falls back to an in-memory checkpointer if SQLite support is unavailable.
+    """
+
+    def __init__(self, path: Path = SESSIONS_DB):
+        self.durable = SqliteSaver is not None
+        self._sessions: dict = {}  # In-memory fallback for session metadata
+
+        if not self.durable:
+            print("⚠️  langgraph-checkpoint-sqlite not installed - sessions won't survive restarts")
+            self.conn = None
+            self.checkpointer: Any = MemorySaver()
+            return
+
+        self.conn = sqlite3.connect(str(path), check_same_thread=False)
+        self.checkpointer = SqliteSaver(self.conn)
+        self.checkpointer.setup()
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                """
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    last_prompt TEXT NOT NULL DEFAULT '',
+                    status TEXT NOT NULL DEFAULT 'done'
+                )
+                """
+            )
+
+    # ========================================================================
+    # SESSION METADATA
+    # ========================================================================
+
+    def touch(self, session_id: str, prompt: Optional[str] = None, status: Optional[str] = None):
+        """
+        Create or update a session record
+
+        Args:
+            session_id: Session (thread) ID
+            prompt: Latest user prompt, if a task is starting
+            status: STATUS_RUNNING when a task starts, STATUS_DONE or STATUS_FAILED when it ends
+        """
+        now = time.time()
+        if not self.durable:
+            record = self._sessions.setdefault(
+                session_id,
+                {
+                    "session_id": session_id,
+                    "created_at": now,
+                    "last_prompt": "",
+                    "status": STATUS_DONE,
+                },
+            )
+            record["updated_at"] = now
+            if prompt is not None:
+                record["last_prompt"] = prompt
+            if status is not None:
+                record["status"] = status
+            return
+
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                "INSERT OR IGNORE INTO sessions (session_id, created_at, updated_at) VALUES (?, ?, ?)",
+                (session_id, now, now),
+            )
+            cur.execute(
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?", (now, session_id)
+            )
+            if prompt is not None:
+                cur.execute(
+                    "UPDATE sessions SET last_prompt = ? WHERE session_id = ?",
+                    (prompt, session_id),
+                )
+            if status is not None:
+                cur.execute(
+                    "UPDATE sessions SET status = ? WHERE session_id = ?", (status, session_id)
+                )
+
+    def get(self, session_id: str):
+        """Get one session record, or None if it doesn't exist"""
+        return next((s for s in self.list_sessions() if s["session_id"] == session_id), None)
+
+    def list_sessions(self) -> list:
+        """
+        List sessions, most recently used first
+
+        Returns:
+            [{"session_id", "created_at", "updated_at", "last_prompt", "status", "checkpoints"}]
+        """
+        if not self.durable:
+            sessions = [dict(s, checkpoints=0) for s in self._sessions.values()]
+            return sorted(sessions, key=lambda s: s["updated_at"], reverse=True)
+
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                """
+                SELECT s.session_id, s.created_at, s.updated_at, s.last_prompt, s.status,
+                       COUNT(c.checkpoint_id)
+                FROM sessions s
+                LEFT JOIN checkpoints c ON c.thread_id = s.session_id
+                GROUP BY s.session_id
+                ORDER BY s.updated_at DESC
+                """
+            )
+            rows = cur.fetchall()
+        keys = ["session_id", "created_at", "updated_at", "last_prompt", "status", "checkpoints"]
+        return [dict(zip(keys, row)) for row in rows]
+
+    def delete(self, session_id: str) -> bool:
+        """
+        Delete a session and all its checkpoints
+
+        Returns:
+            True if the session existed
+        """
+        existed = self.get(session_id) is not None
+        self.checkpointer.delete_thread(session_id)
+        if not self.durable:
+            self._sessions.pop(session_id, None)
+            return existed
+
+        with self.checkpointer.cursor() as cur:
+            cur.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        return existed
+
+    # ========================================================================
+    # RETENTION
+    # ========================================================================
+
+    def prune(self, session_id: str, keep: Optional[int] = None) -> int:
+        """
+        Delete all but the newest checkpoints (and their pending writes) of a session
+
+        Checkpoint IDs are time-ordered, so the newest sort last.
+
+        Args:
+            session_id: Session (thread) ID
+            keep: Checkpoints to keep (default: config.CHECKPOINT_RETENTION)
+
+        Returns:
+            Number of checkpoints deleted
+        """
+        if not self.durable:
+            return 0
+
+        keep = keep or config.CHECKPOINT_RETENTION
+        with self.checkpointer.cursor() as cur:
+            cur.execute(
+                """
+                SELECT checkpoint_id FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ''
+                ORDER BY checkpoint_id DESC
+                LIMIT -1 OFFSET ?
+                """,
+                (session_id, keep),
+            )
+            stale = [row[0] for row in cur.fetchall()]
+            if not stale:
+                return 0
+
+            newest_stale = stale[0]
+            cur.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_id <= ?",
+                (session_id, newest_stale),
+            )
+            cur.execute(
+                "DELETE FROM writes WHERE thread_id = ? AND checkpoint_id <= ?",
+                (session_id, newest_stale),
+            )
+        return len(stale)
+
+    def prune_expired(self, max_age_days: Optional[int] = None) -> list:
+        """
+        Delete sessions not used for `max_age_days` (default: config.SESSION_MAX_AGE_DAYS)
+
+        Returns:
+            IDs of the deleted sessions
+        """
+        max_age_days = max_age_days or config.SESSION_MAX_AGE_DAYS
+        cutoff = time.time() - max_age_days * 86400
+        expired = [s["session_id"] for s in self.list_sessions() if s["updated_at"] < cutoff]
+        for session_id in expired:
+            self.delete(session_id)
+        return expired
+
+    def print_sessions(self, active_session: str = ""):
+        """Print all sessions in a table"""
+        sessions = self.list_sessions()
+
+        print("\n" + "=" * 70)
+        print(f"💾 SESSIONS ({len(sessions)})")
+        print("=" * 70)
+        if not sessions:
+            print("No saved sessions yet.")
+        for s in sessions:
+            marker = "▶" if s["session_id"] == active_session else " "
+            updated = datetime.fromtimestamp(s["updated_at"]).strftime("%Y-%m-%d %H:%M")
+            status = {STATUS_RUNNING: " ⏸️  interrupted", STATUS_FAILED: " ❌ failed"}.get(
+                s["status"], ""
+            )
+            print(
+                f"{marker} {s['session_id']}  ({updated}, {s['checkpoints']} checkpoints){status}"
+            )
+            if s["last_prompt"]:
+                prompt = s["last_prompt"]
+                print(f"     Last: {prompt[:60]}{'...' if len(prompt) > 60 else ''}")
+        print("=" * 70 + "\n")
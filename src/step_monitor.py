@@ -0,0 +1,227 @@
+"""
+Step Monitor - Loop Detection and Duplicate Tool-Call Short-Circuiting
+Repeated read-only calls are answered from a cache; a looping task is stopped long before recursion_limit
+"""
+
+import hashlib
+import json
+import threading
+from typing import Optional
+
+from langchain_core.tools import StructuredTool
+
+from src import config
+from src.tool_selector import FAILURE_MARKERS
+
+# Tools that only look - a repeat with nothing changed in between returns the same result
+READ_ONLY_TOOLS = {
+    "list_directory",
+    "read_file_content",
+    "get_current_directory",
+    "search_file",
+    "search_content",
+    "check_running_apps",
+    "get_screen_info",
+    "recall_from_memory",
+    "verify_expectations",
+}
+
+# Graph steps per agent iteration (pre_model_hook → agent → post_model_hook → tools)
+STEPS_PER_ITERATION = 4
+
+CACHED_NOTE = (
+    "♻️ You already called {name} with these arguments and nothing has changed since - "
+    "same result as before. Use it instead of calling again."
+)
+
+
+def fingerprint(name: str, args: dict) -> str:
+    """Stable key for a tool call (argument order doesn't matter)"""
+    return f"{name}:{json.dumps(args, sort_keys=True, default=str, ensure_ascii=False)}"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()[:16]
+
+
+class LoopDetectedError(Exception):
+    """Raised before the next model call when the agent keeps repeating itself"""
+
+    def __init__(self, tool_name: str, repeats: int):
+        super().__init__(f"{tool_name} repeated {repeats} times without progress")
+        self.tool_name = tool_name
+        self.repeats = repeats
+
+
+# ============================================================================
+# STEP MONITOR
+# ============================================================================
+
+
+class StepMonitor:
+    """
+    Fingerprints every tool call and its result within one task.
+
+    - A read-only call identical to an earlier one, with no changing call in
+      between, is answered from the cache with a "you already did this" note
+    - A call whose (arguments, result) pair was already seen is an
+      unproductive repeat; any new result resets the streak
+    - After `max_repeats` unproductive repeats in a row, the next model call
+      raises LoopDetectedError instead (the thread can be resumed by a stronger model)
+
+    Usage:
+        monitor = StepMonitor()
+        create_react_agent(llm, monitor.wrap_tools(tools),
+                           pre_model_hook=monitor.guard(HistoryManager(prompt)))
+        ...
+        monitor.print_summary()
+    """
+
+    def __init__(self, max_repeats: Optional[int] = None):
+        self.max_repeats = max_repeats or config.LOOP_MAX_REPEATS
+        self.cache: dict = {}  # Fingerprint → (content, artifact) of read-only calls since the last change
+        self.outcomes: set = set()  # Fingerprint + result digest of every call so far
+        self.streak = 0  # Unproductive repeats since the last new result
+        self.last_repeat = ""  # Tool name of the latest repeat
+        self.model_calls = 0
+        self.tool_calls = 0
+        self.cache_hits = 0
+        self.repeats = 0
+        self.stops: list = []  # (tool name, model calls so far) for every loop stopped
+        self._lock = threading.Lock()  # Parallel tool calls share the bookkeeping
+
+    # ------------------------------------------------------------------------
+    # Tool calls
+    # ------------------------------------------------------------------------
+
+    def _observe(self, name: str, key: str, content: str):
+        """Count a call as progress (new result) or as an unproductive repeat"""
+        self.tool_calls += 1
+        outcome = f"{key}→{_digest(content)}"
+        if outcome in self.outcomes:
+            self.repeats += 1
+            self.streak += 1
+            self.last_repeat = name
+        else:
+            self.outcomes.add(outcome)
+            self.streak = 0
+
+    def wrap_tool(self, tool):
+        """
+        Wrap a (content-and-artifact) tool with fingerprinting and the cache
+
+        Args:
+            tool: Tool from the prompt bundle
+
+        Returns:
+            New tool with the same name, description and arguments
+        """
+
+        def _run(**kwargs):
+            key = fingerprint(tool.name, kwargs)
+            with self._lock:
+                cached = self.cache.get(key) if tool.name in READ_ONLY_TOOLS else None
+                if cached:
+                    self.cache_hits += 1
+                    self._observe(tool.name, key, cached[0])
+            if cached:
+                note = CACHED_NOTE.format(name=tool.name)
+                return f"{note}\n{cached[0]}", f"{note}\n{cached[1]}"
+
+            message = tool.invoke(
+                {"type": "tool_call", "name": tool.name, "args": kwargs, "id": "step-monitor"}
+            )
+            content = message.content if isinstance(message.content, str) else str(message.content)
+            artifact = message.artifact if message.artifact is not None else content
+            with self._lock:
+                if tool.name in READ_ONLY_TOOLS:
+                    self.cache[key] = (content, artifact)
+                elif not content.lstrip().startswith(FAILURE_MARKERS):
+                    self.cache.clear()  # Anything may have changed (a failed call changed nothing)
+                self._observe(tool.name, key, content)
+            return content, artifact
+
+        return StructuredTool.from_function(
+            func=_run,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            response_format="content_and_artifact",
+        )
+
+    def wrap_tools(self, tools: list) -> list:
+        """Wrap every tool in a list"""
+        return [self.wrap_tool(tool) for tool in tools]
+
+    # ------------------------------------------------------------------------
+    # Model calls
+    # ------------------------------------------------------------------------
+
+    def guard(self, hook):
+        """
+        Pre-model hook that stops a looping task before the model is called again
+
+        Args:
+            hook: Pre-model hook to run afterwards (e.g., HistoryManager)
+
+        Returns:
+            Callable state → hook(state); raises LoopDetectedError on a loop
+        """
+
+        def guarded(state: dict) -> dict:
+            if self.streak >= self.max_repeats:
+                self.stops.append((self.last_repeat, self.model_calls))
+                raise LoopDetectedError(self.last_repeat, self.streak)
+            self.model_calls += 1
+            update: dict = hook(state)
+            return update
+
+        return guarded
+
+    def reset_streak(self):
+        """Give the (escalated) model a fresh repeat allowance"""
+        self.streak = 0
+
+    # ------------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------------
+
+    def summary(self, recursion_limit: int = 50) -> dict:
+        """
+        Repeats caught and steps saved so far
+
+        Args:
+            recursion_limit: The run's recursion limit (bounds how long a loop could have run)
+
+        Returns:
+            {"tool_calls", "model_calls", "repeats", "cache_hits", "loops_stopped",
+             "model_calls_prevented"} - prevented calls are an upper bound: what the
+             loop could still have spent before hitting recursion_limit
+        """
+        max_model_calls = recursion_limit // STEPS_PER_ITERATION
+        return {
+            "tool_calls": self.tool_calls,
+            "model_calls": self.model_calls,
+            "repeats": self.repeats,
+            "cache_hits": self.cache_hits,
+            "loops_stopped": len(self.stops),
+            "model_calls_prevented": sum(
+                max(max_model_calls - calls, 0) for _, calls in self.stops
+            ),
+        }
+
+    def print_summary(self, recursion_limit: int = 50):
+        """Print repeated calls short-circuited and wasted steps prevented"""
+        summary = self.summary(recursion_limit)
+        if not summary["repeats"] and not summary["loops_stopped"]:
+            return
+        line = (
+            f"🔁 Step monitor: {summary['repeats']} repeated calls, "
+            f"{summary['cache_hits']} served from cache"
+        )
+        if summary["loops_stopped"]:
+            line += (
+                f", stopped {summary['loops_stopped']} loop(s) - "
+                f"up to {summary['model_calls_prevented']} wasted model calls prevented"
+            )
+        print(line)
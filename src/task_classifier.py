@@ -0,0 +1,382 @@
+"""
+Task Classifier - Learned Task Complexity for Model Tier Routing
+Logistic regression on hashed word n-grams (NumPy), trained from logged task outcomes
+"""
+
+import json
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from src import config
+
+# ============================================================================
+# LABELLED DATA
+# ============================================================================
+
+TIERS = ("small", "medium", "large")
+
+# Outcomes of real tasks, appended after every run (one JSON object per line)
+TASK_LOG_FILE = Path.home() / ".ai_robot_task_outcomes.jsonl"
+
+
+# Hand-labelled seed examples so the classifier works before any task is logged
+SEED_TASKS = [
+    # small - one lookup, one tool call
+    ("list files in Downloads", "small"),
+    ("list my desktop", "small"),
+    ("show files on the desktop", "small"),
+    ("what's in my documents folder", "small"),
+    ("what is the current directory", "small"),
+    ("where am i", "small"),
+    ("show running apps", "small"),
+    ("check which apps are running", "small"),
+    ("open chrome", "small"),
+    ("open safari", "small"),
+    ("launch spotify", "small"),
+    ("open youtube.com", "small"),
+    ("go to github.com", "small"),
+    ("take a screenshot", "small"),
+    ("get screen size", "small"),
+    ("read notes.txt", "small"),
+    ("show me the contents of todo.txt", "small"),
+    ("find report.pdf", "small"),
+    ("search for resume.docx", "small"),
+    ("press enter", "small"),
+    ("type hello world", "small"),
+    ("click the mouse", "small"),
+    ("move the mouse to the center", "small"),
+    ("what do you remember about me", "small"),
+    ("recall my preferences", "small"),
+    ("remember that i like dark mode", "small"),
+    ("forget everything", "small"),
+    ("how many files are in downloads", "small"),
+    ("display the current folder", "small"),
+    ("list pdfs in documents", "small"),
+    # medium - several file operations in one pass
+    ("move all pdfs to documents", "medium"),
+    ("move all pdfs from downloads into a folder called papers", "medium"),
+    ("organize my desktop by file type", "medium"),
+    ("organize downloads", "medium"),
+    ("clean up my downloads folder", "medium"),
+    ("sort the images on my desktop into folders", "medium"),
+    ("create a folder called projects and move all python files into it", "medium"),
+    ("rename all screenshots on the desktop with today's date", "medium"),
+    ("copy every jpg from downloads to pictures", "medium"),
+    ("delete all .tmp files in downloads", "medium"),
+    ("archive old documents into a zip file", "medium"),
+    ("make folders for each file type in downloads and move the files", "medium"),
+    ("group my music files by extension", "medium"),
+    ("back up my notes folder to the desktop", "medium"),
+    ("set up a new project folder with src and tests", "medium"),
+    ("configure a workspace folder for my photos", "medium"),
+    ("move the videos on my desktop into a videos folder", "medium"),
+    ("put all the zip files in an archives folder", "medium"),
+    ("open chrome and go to gmail", "medium"),
+    ("open notes and type a shopping list", "medium"),
+    ("find all duplicate photos in pictures and move them to a folder", "medium"),
+    ("create documents, images and videos folders on the desktop", "medium"),
+    ("tidy up my desktop", "medium"),
+    ("move every file older than a month into an old folder", "medium"),
+    ("list my downloads then move the installers to a dmg folder", "medium"),
+    # large - diagnosis, recovery, open-ended reasoning
+    ("show me why the build fails", "large"),
+    ("why did the last command fail", "large"),
+    ("debug the error from the previous task", "large"),
+    ("fix the permission denied error", "large"),
+    ("figure out why my files weren't moved", "large"),
+    ("troubleshoot why chrome won't open", "large"),
+    ("analyze my downloads and suggest how to organize them", "large"),
+    ("explain what went wrong with the organization", "large"),
+    ("recover from the failed move and finish organizing", "large"),
+    ("the script crashes with a traceback, find the cause", "large"),
+    ("investigate why disk space is running low", "large"),
+    ("what caused the error in the log file", "large"),
+    ("find the bug in main.py and explain it", "large"),
+    ("my desktop organization broke halfway, check what happened and repair it", "large"),
+    ("compare the two config files and tell me what is different and why it matters", "large"),
+    ("plan and carry out a cleanup of my whole home folder, then verify it", "large"),
+    ("work out which apps are slowing my computer down", "large"),
+    ("the mv command says no such file, sort it out", "large"),
+    ("read the error log and fix whatever is broken", "large"),
+    ("diagnose the failing terminal command", "large"),
+    ("something is wrong with my downloads folder, look into it", "large"),
+    ("understand the project structure and summarize how it works", "large"),
+    ("retry the last task and fix anything that fails", "large"),
+    ("why is the screenshot black", "large"),
+    ("check my work and correct any mistakes", "large"),
+]
+
+
+def log_outcome(task: str, tier: str, success: bool, model_calls: int):
+    """
+    Append a finished task to the outcome log (training data for the classifier)
+
+    Args:
+        task: User request
+        tier: Model tier the task ran on
+        success: Whether the task completed without error
+        model_calls: Number of model calls the task took
+    """
+    entry = {
+        "task": task,
+        "tier": tier,
+        "success": success,
+        "model_calls": model_calls,
+        "timestamp": time.time(),
+    }
+    try:
+        with open(TASK_LOG_FILE, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+    except Exception:
+        return
+    # Learn from it right away; a full retrain only happens at the next startup
+    label = outcome_label(entry)
+    if label and _classifier["model"] is not None:
+        update(_classifier["model"], task, label)
+
+
+def outcome_label(entry: dict) -> str:
+    """
+    Tier a logged task should have used
+
+    Successes confirm the tier used, failures needed the next tier up. A quick
+    success on a bigger tier isn't taken as a small task - only the small tier
+    succeeding shows that (otherwise a task that failed there keeps flip-flopping).
+
+    Returns:
+        Tier name, or "" if the outcome says nothing (a failure on the large tier)
+    """
+    tier: str = entry.get("tier", "")
+    if tier not in TIERS:
+        return ""
+    if entry.get("success"):
+        return tier
+    index = TIERS.index(tier)
+    return TIERS[index + 1] if index + 1 < len(TIERS) else ""
+
+
+def load_outcomes() -> list:
+    """
+    Labelled examples from the outcome log (most recent last)
+
+    Returns:
+        [(task, tier)] for the last config.TASK_CLASSIFIER_MAX_OUTCOMES usable outcomes
+    """
+    examples = []
+    try:
+        if TASK_LOG_FILE.exists():
+            with open(TASK_LOG_FILE) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    label = outcome_label(entry)
+                    if label and entry.get("task"):
+                        examples.append((entry["task"], label))
+    except Exception:
+        pass
+    return examples[-config.TASK_CLASSIFIER_MAX_OUTCOMES :]
+
+
+# ============================================================================
+# FEATURES (hashed word n-grams)
+# ============================================================================
+
+N_FEATURES = 2**12
+
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def _features(text: str) -> np.ndarray:
+    """
+    Hashed feature indices for a task: words, word pairs and a length bucket
+
+    crc32 keeps the hashes stable across runs (Python's hash() is salted).
+    """
+    words = _WORD_RE.findall(text.lower())
+    grams = [f"w:{word}" for word in words]
+    grams += [f"b:{a}_{b}" for a, b in zip(words, words[1:])]
+    grams.append(f"len:{min(len(words) // 4, 5)}")
+    return np.unique([zlib.crc32(gram.encode()) % N_FEATURES for gram in grams])
+
+
+# ============================================================================
+# MODEL (softmax regression, trained in-process)
+# ============================================================================
+
+_classifier: dict[str, Optional[dict]] = {"model": None}  # {"weights", "bias"} once trained
+
+
+def train(examples: list, epochs: int = 300, learning_rate: float = 0.5, l2: float = 1e-3) -> dict:
+    """
+    Fit multinomial logistic regression with full-batch gradient descent
+
+    Each task has only a dozen or so active features, so the inputs are kept
+    sparse (feature indices per row) instead of a dense rows × N_FEATURES matrix.
+
+    Args:
+        examples: [(task, tier)] labelled examples
+        epochs: Gradient descent iterations
+        learning_rate: Step size
+        l2: Weight decay
+
+    Returns:
+        {"weights": (N_FEATURES, 3) array, "bias": (3,) array}
+    """
+    features = [_features(task) for task, _ in examples]
+    cols = np.concatenate(features)
+    rows = np.repeat(np.arange(len(examples)), [len(f) for f in features])
+    starts = np.concatenate(([0], np.cumsum([len(f) for f in features])[:-1]))
+    y = np.zeros((len(examples), len(TIERS)), dtype=np.float32)
+    y[np.arange(len(examples)), [TIERS.index(tier) for _, tier in examples]] = 1.0
+
+    weights = np.zeros((N_FEATURES, len(TIERS)), dtype=np.float32)
+    bias = np.zeros(len(TIERS), dtype=np.float32)
+    gradient = np.empty_like(weights)
+    for _ in range(epochs):
+        probs = _softmax(np.add.reduceat(weights[cols], starts) + bias)
+        error = (probs - y) / len(examples)
+        for tier in range(len(TIERS)):
+            gradient[:, tier] = np.bincount(cols, error[rows, tier], minlength=N_FEATURES)
+        weights -= learning_rate * (gradient + l2 * weights)
+        bias -= learning_rate * error.sum(axis=0)
+
+    return {"weights": weights, "bias": bias}
+
+
+def update(model: dict, task: str, tier: str, steps: int = 3, learning_rate: float = 0.5):
+    """
+    Nudge a trained model towards one new labelled task (in place)
+
+    Only the task's own feature rows change, so this costs microseconds.
+
+    Args:
+        model: Model from train()
+        task: User request
+        tier: Tier the task should have used
+        steps: Gradient steps on the example
+        learning_rate: Step size
+    """
+    features = _features(task)
+    target = np.zeros(len(TIERS), dtype=np.float32)
+    target[TIERS.index(tier)] = 1.0
+    for _ in range(steps):
+        error = _softmax(model["weights"][features].sum(axis=0) + model["bias"]) - target
+        model["weights"][features] -= learning_rate * error
+        model["bias"] -= learning_rate * error
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max(axis=-1, keepdims=True))
+    probabilities: np.ndarray = exp / exp.sum(axis=-1, keepdims=True)
+    return probabilities
+
+
+def _get_model() -> dict:
+    """Trained model for seed + logged examples (trained on first use)"""
+    model = _classifier["model"]
+    if model is None:
+        model = _classifier["model"] = train(SEED_TASKS + load_outcomes())
+    return model
+
+
+def classify(query: str) -> tuple[str, float]:
+    """
+    Predict the model tier a task needs
+
+    Args:
+        query: User request
+
+    Returns:
+        (tier, confidence) - confidence is the predicted probability of the tier
+    """
+    if not query.strip():
+        return config.DEFAULT_TIER, 0.0
+    model = _get_model()
+    logits = model["weights"][_features(query)].sum(axis=0) + model["bias"]
+    probs = _softmax(logits)
+    best = int(probs.argmax())
+    return TIERS[best], float(probs[best])
+
+
+# ============================================================================
+# EVALUATION (python -m src.task_classifier [labelled.jsonl])
+# ============================================================================
+
+EVAL_FILE = Path(__file__).resolve().parent.parent / "tests" / "data" / "task_tiers.jsonl"
+
+
+def load_labelled(path: Path) -> list:
+    """Read [(task, tier)] from a JSONL file of {"task", "tier"} objects"""
+    with open(path) as f:
+        return [(item["task"], item["tier"]) for item in map(json.loads, f) if item]
+
+
+def evaluate(examples: list) -> dict:
+    """
+    Score the classifier (and the keyword rules it falls back to) on labelled tasks
+
+    Args:
+        examples: [(task, tier)] held-out labelled examples
+
+    Returns:
+        {"total", "accuracy", "routed_accuracy", "keyword_accuracy",
+         "fallback_rate", "confusion", "latency_ms"}
+    """
+    from src.cost_optimizer import detect_task_complexity, keyword_task_complexity
+
+    _get_model()  # Train outside the timed loop
+    confusion = {tier: dict.fromkeys(TIERS, 0) for tier in TIERS}
+    correct = routed = keyword = fallbacks = 0
+    latency = 0.0
+    for task, expected in examples:
+        start = time.perf_counter()
+        predicted, confidence = classify(task)
+        latency += time.perf_counter() - start
+
+        confusion[expected][predicted] += 1
+        correct += predicted == expected
+        routed += detect_task_complexity(task) == expected
+        keyword += keyword_task_complexity(task) == expected
+        fallbacks += confidence < config.TASK_CLASSIFIER_MIN_CONFIDENCE
+
+    total = len(examples)
+    return {
+        "total": total,
+        "accuracy": correct / total,
+        "routed_accuracy": routed / total,
+        "keyword_accuracy": keyword / total,
+        "fallback_rate": fallbacks / total,
+        "confusion": confusion,
+        "latency_ms": latency / total * 1000,
+    }
+
+
+def main():
+    """Print evaluation results for a labelled set"""
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else EVAL_FILE
+    results = evaluate(load_labelled(path))
+
+    print(f"📊 Task classifier on {results['total']} labelled tasks ({path.name})")
+    print(f"   Classifier accuracy: {results['accuracy']:.1%}")
+    print(
+        f"   Routed accuracy:     {results['routed_accuracy']:.1%} "
+        f"({results['fallback_rate']:.0%} fell back to keywords)"
+    )
+    print(f"   Keyword rules only:  {results['keyword_accuracy']:.1%}")
+    print(f"   Inference latency:   {results['latency_ms']:.3f} ms/task")
+    print("   Confusion (expected → predicted):")
+    for expected, row in results["confusion"].items():
+        cells = "  ".join(f"{tier} {count:>2}" for tier, count in row.items())
+        print(f"     {expected:<6} → {cells}")
+
+
+if __name__ == "__main__":
+    main()
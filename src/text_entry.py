@@ -0,0 +1,209 @@
+"""
+Text Entry - Keystroke Typing, Clipboard Paste and Hotkey Chords
+Long or non-ASCII text is pasted (clipboard restored afterwards); "cmd+shift+4" style chords are real hotkeys
+"""
+
+import sys
+import time
+from typing import Optional
+
+from src import config
+from src.input_backend import RecordingBackend, get_backend
+
+# Modifier that pastes ("command" on macOS, "ctrl" elsewhere)
+PASTE_MODIFIER = "command" if sys.platform == "darwin" else "ctrl"
+
+# Spoken/short key names → pyautogui key names
+KEY_ALIASES = {
+    "cmd": "command",
+    "⌘": "command",
+    "control": "ctrl",
+    "ctl": "ctrl",
+    "opt": "option",
+    "alt": "option" if sys.platform == "darwin" else "alt",
+    "⌥": "option",
+    "⇧": "shift",
+    "return": "enter",
+    "esc": "escape",
+    "del": "delete",
+    "spacebar": "space",
+    "pgup": "pageup",
+    "pgdn": "pagedown",
+    "windows": "win",
+    "super": "win",
+}
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+
+def normalize_key(key: str) -> str:
+    """pyautogui name for a key ("Cmd" → "command", "Return" → "enter")"""
+    key = key.strip()
+    lowered = key.lower()
+    return KEY_ALIASES.get(lowered, lowered if len(key) > 1 else key)
+
+
+def parse_chord(keys: str) -> list:
+    """
+    Split a chord into pyautogui key names
+
+    "cmd+shift+4" → ["command", "shift", "4"]; a single key gives one item.
+    A literal plus is written "cmd++" or "plus".
+    """
+    keys = keys.strip()
+    if keys in ("+", "plus"):
+        return ["+"]
+    parts = keys[:-2].split("+") + ["+"] if keys.endswith("++") else keys.split("+")
+    chord = [normalize_key(part) for part in parts if part.strip()]
+    # "Ctrl+C" means ctrl+c - an uppercase letter would make pyautogui add shift
+    return [key.lower() for key in chord] if len(chord) > 1 else chord
+
+
+def press(keys: str, times: int = 1, backend=None) -> list:
+    """
+    Press a key or a chord
+
+    Args:
+        keys: One key ("enter") or a chord ("cmd+shift+4")
+        times: Repetitions
+        backend: Input backend (default: the active one)
+
+    Returns:
+        The pyautogui key names pressed together
+    """
+    backend = backend or get_backend()
+    chord = parse_chord(keys)
+    if not chord:
+        raise ValueError("no key given")
+    if len(chord) == 1:
+        backend.press(chord[0], presses=times)
+        return chord
+    for repetition in range(times):
+        backend.hotkey(*chord)
+        if repetition < times - 1:
+            backend.sleep(config.KEY_REPEAT_INTERVAL_S)
+    return chord
+
+
+# ============================================================================
+# TEXT
+# ============================================================================
+
+
+def choose_method(text: str) -> str:
+    """
+    "paste" for long or non-ASCII text (pyautogui can't type non-ASCII), else "type"
+    """
+    if len(text) >= config.TYPE_PASTE_MIN_CHARS or not text.isascii():
+        return "paste"
+    return "type"
+
+
+def paste(text: str, backend=None):
+    """
+    Paste text via the clipboard, then put the previous clipboard contents back
+
+    Raises:
+        Exception: If the clipboard can't be written (callers fall back to typing)
+    """
+    backend = backend or get_backend()
+    try:
+        previous = backend.get_clipboard()
+    except Exception:
+        previous = None
+    backend.set_clipboard(text)
+    try:
+        backend.hotkey(PASTE_MODIFIER, "v")
+        # The target app reads the clipboard asynchronously - give it a moment
+        backend.sleep(config.CLIPBOARD_SETTLE_S)
+    finally:
+        if previous is not None:
+            backend.set_clipboard(previous)
+
+
+def enter_text(
+    text: str, interval: Optional[float] = None, method: str = "auto", backend=None
+) -> dict:
+    """
+    Enter text at the cursor by typing or pasting, whichever fits the payload
+
+    Args:
+        text: Text to enter
+        interval: Seconds between keystrokes when typing (default: config.TYPE_INTERVAL_S)
+        method: "auto", "type" or "paste"
+        backend: Input backend (default: the active one)
+
+    Returns:
+        {"method": "type"|"paste", "chars", "duration_s"}
+    """
+    backend = backend or get_backend()
+    interval = config.TYPE_INTERVAL_S if interval is None else interval
+    method = choose_method(text) if method == "auto" else method
+    start = time.perf_counter()
+    if method == "paste":
+        try:
+            paste(text, backend)
+        except Exception:
+            if not text.isascii():
+                raise
+            method = "type"  # No clipboard (e.g. no xclip on Linux) - type it instead
+    if method == "type":
+        backend.write(text, interval=interval)
+    return {"method": method, "chars": len(text), "duration_s": time.perf_counter() - start}
+
+
+# ============================================================================
+# BENCHMARK (offline, recording backend)
+# ============================================================================
+
+
+def benchmark(lengths: tuple = (10, 100, 2000), legacy_interval: float = 0.05) -> list:
+    """
+    Time to enter texts of several lengths, per method, on the virtual clock
+
+    Args:
+        lengths: Text lengths to try
+        legacy_interval: Keystroke interval of the old type_text default
+
+    Returns:
+        [{"chars", "method", "seconds", "chars_per_s"}] - "legacy" is keystroke
+        typing at the old 0.05 s interval, "auto" is what enter_text picks
+    """
+    rows = []
+    for length in lengths:
+        text = ("lorem ipsum " * (length // 12 + 1))[:length]
+        for label, method, interval in (
+            ("legacy", "type", legacy_interval),
+            ("type", "type", None),
+            ("auto", "auto", None),
+        ):
+            backend = RecordingBackend()
+            result = enter_text(text, interval=interval, method=method, backend=backend)
+            seconds = backend.clock + result["duration_s"]
+            name = f"auto ({result['method']})" if label == "auto" else label
+            rows.append(
+                {
+                    "chars": length,
+                    "method": name,
+                    "seconds": seconds,
+                    "chars_per_s": length / seconds if seconds else float("inf"),
+                }
+            )
+    return rows
+
+
+def main():
+    """Print the text entry benchmark"""
+    print("⌨️  Text entry benchmark (recording backend, virtual clock)")
+    print(f"   {'chars':>6} {'method':<14} {'seconds':>9} {'chars/s':>10}")
+    for row in benchmark():
+        print(
+            f"   {row['chars']:>6} {row['method']:<14} {row['seconds']:>9.3f} "
+            f"{row['chars_per_s']:>10,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
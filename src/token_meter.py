@@ -0,0 +1,259 @@
+"""
+Token Meter - Real Token Usage from Provider Metadata
+Attributes prompt/completion tokens to task, provider, model and step; persists daily totals
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src import config, cost_optimizer
+
+# ============================================================================
+# DAILY TOTALS (persisted)
+# ============================================================================
+
+USAGE_FILE = Path.home() / ".ai_robot_usage.json"
+
+# Warn when a provider has used this share of its daily token limit
+DAILY_LIMIT_WARNING = 0.8
+
+
+def _today() -> str:
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def _load_usage() -> dict:
+    """Load daily usage totals from disk"""
+    try:
+        if USAGE_FILE.exists():
+            with open(USAGE_FILE) as f:
+                usage: dict = json.load(f)
+                return usage
+    except Exception:
+        pass
+    return {}
+
+
+def _save_usage(usage: dict):
+    """Save daily usage totals to disk"""
+    try:
+        with open(USAGE_FILE, "w") as f:
+            json.dump(usage, f, indent=2)
+    except Exception:
+        pass
+
+
+def get_daily_usage(day: str = "") -> dict:
+    """
+    Get persisted token totals for one day
+
+    Args:
+        day: Date as YYYY-MM-DD (default: today)
+
+    Returns:
+        {provider: {"input_tokens", "output_tokens", "requests", "estimated_requests"}}
+    """
+    totals: dict = _load_usage().get(day or _today(), {})
+    return totals
+
+
+# ============================================================================
+# USAGE EXTRACTION
+# ============================================================================
+
+
+def _usage_from_result(response) -> dict:
+    """
+    Pull token usage out of an LLMResult
+
+    Prefers the standard `usage_metadata` on the AI message, then the
+    provider-specific `llm_output["token_usage"]` (Groq/OpenAI style).
+
+    Returns:
+        {"input_tokens", "output_tokens"} or {} if the provider reported nothing
+    """
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if usage:
+                return {
+                    "input_tokens": usage.get("input_tokens", 0),
+                    "output_tokens": usage.get("output_tokens", 0),
+                }
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if token_usage:
+        return {
+            "input_tokens": token_usage.get("prompt_tokens", 0),
+            "output_tokens": token_usage.get("completion_tokens", 0),
+        }
+    return {}
+
+
+def _estimate_messages(messages: list) -> int:
+    """Local estimate of prompt tokens for a list of chat messages"""
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        total += cost_optimizer.estimate_tokens(content) + 4  # Role/formatting overhead
+        for tool_call in getattr(message, "tool_calls", None) or []:
+            total += cost_optimizer.estimate_tokens(json.dumps(tool_call.get("args", {})))
+    return total
+
+
+def _estimate_completion(response) -> int:
+    """Local estimate of completion tokens for an LLMResult"""
+    total = 0
+    for generations in response.generations:
+        for generation in generations:
+            total += cost_optimizer.estimate_tokens(generation.text or "")
+            message = getattr(generation, "message", None)
+            for tool_call in getattr(message, "tool_calls", None) or []:
+                total += cost_optimizer.estimate_tokens(
+                    tool_call.get("name", "") + json.dumps(tool_call.get("args", {}))
+                )
+    return total
+
+
+# ============================================================================
+# USAGE METER
+# ============================================================================
+
+
+class UsageMeter(BaseCallbackHandler):
+    """
+    LangChain callback that meters every model call.
+
+    Pass it in the run config (`{"callbacks": [meter]}`); each chat model call
+    is recorded against the current task, provider, model and graph step.
+    """
+
+    def __init__(self):
+        self.task = ""
+        self.provider = ""
+        self.model = ""
+        self.calls = []
+        self._pending = {}  # run_id -> (step, estimated prompt tokens)
+
+    def start_task(self, task: str, provider: str, model: str):
+        """Begin attributing calls to a new task"""
+        self.task = task
+        self.calls = []
+        self._pending = {}
+        self.set_model(provider, model)
+
+    def set_model(self, provider: str, model: str):
+        """Update provider/model after a switch (e.g. on rate limit)"""
+        self.provider = provider or "unknown"
+        self.model = model or "unknown"
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        step = (metadata or {}).get("langgraph_step", len(self.calls) + 1)
+        estimate = sum(_estimate_messages(batch) for batch in messages)
+        self._pending[run_id] = (step, estimate)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        step, prompt_estimate = self._pending.pop(run_id, (len(self.calls) + 1, 0))
+        usage = _usage_from_result(response)
+        estimated = not usage
+        if estimated:
+            usage = {
+                "input_tokens": prompt_estimate,
+                "output_tokens": _estimate_completion(response),
+            }
+
+        call = {
+            "task": self.task,
+            "provider": self.provider,
+            "model": self.model,
+            "step": step,
+            "input_tokens": usage["input_tokens"],
+            "output_tokens": usage["output_tokens"],
+            "estimated": estimated,
+        }
+        self.calls.append(call)
+        self._record_daily(call)
+        cost_optimizer.track_request()
+
+    def _record_daily(self, call: dict):
+        """Add one call to today's persisted totals"""
+        usage = _load_usage()
+        day = usage.setdefault(_today(), {})
+        totals = day.setdefault(
+            call["provider"],
+            {"input_tokens": 0, "output_tokens": 0, "requests": 0, "estimated_requests": 0},
+        )
+        totals["input_tokens"] += call["input_tokens"]
+        totals["output_tokens"] += call["output_tokens"]
+        totals["requests"] += 1
+        totals["estimated_requests"] += int(call["estimated"])
+        _save_usage(usage)
+
+    def task_summary(self) -> dict:
+        """Token totals for the current task"""
+        return {
+            "task": self.task,
+            "calls": len(self.calls),
+            "input_tokens": sum(c["input_tokens"] for c in self.calls),
+            "output_tokens": sum(c["output_tokens"] for c in self.calls),
+            "estimated_calls": sum(1 for c in self.calls if c["estimated"]),
+            "input_per_step": [c["input_tokens"] for c in self.calls],
+        }
+
+    def print_task_summary(self):
+        """Print tokens used by the current task and warn near daily limits"""
+        summary = self.task_summary()
+        if not summary["calls"]:
+            return
+
+        estimated = (
+            f" ({summary['estimated_calls']} estimated)" if summary["estimated_calls"] else ""
+        )
+        print(
+            f"📊 Tokens: {summary['input_tokens']:,} in / {summary['output_tokens']:,} out "
+            f"over {summary['calls']} model calls{estimated}"
+        )
+        # Prompt size per step - growth here means history/tool output is piling up
+        steps = " → ".join(f"{tokens:,}" for tokens in summary["input_per_step"])
+        print(f"   Prompt per step: {steps}")
+
+        check_daily_limits()
+
+
+def check_daily_limits():
+    """Warn when a provider is close to its daily token limit"""
+    for provider, totals in get_daily_usage().items():
+        limit = config.DAILY_TOKEN_LIMITS.get(provider)
+        if not limit:
+            continue
+        used = totals["input_tokens"] + totals["output_tokens"]
+        if used >= limit * DAILY_LIMIT_WARNING:
+            print(
+                f"⚠️  {provider.upper()} has used {used:,} of {limit:,} tokens today "
+                f"({used / limit * 100:.0f}%)"
+            )
+
+
+def print_daily_usage():
+    """Print today's persisted token totals per provider"""
+    usage = get_daily_usage()
+
+    print("\n" + "=" * 70)
+    print(f"📊 TOKEN USAGE TODAY ({_today()})")
+    print("=" * 70)
+    if not usage:
+        print("No model calls recorded today.")
+    for provider, totals in usage.items():
+        used = totals["input_tokens"] + totals["output_tokens"]
+        limit = config.DAILY_TOKEN_LIMITS.get(provider)
+        limit_text = f" / {limit:,} ({used / limit * 100:.1f}%)" if limit else ""
+        print(f"{provider.upper()}: {used:,} tokens{limit_text}")
+        print(
+            f"   {totals['input_tokens']:,} in / {totals['output_tokens']:,} out, "
+            f"{totals['requests']} requests ({totals['estimated_requests']} estimated)"
+        )
+    print("=" * 70 + "\n")
@@ -0,0 +1,362 @@
+"""
+Tool Call Recovery - Turns Tool Calls Written as Text into Real Tool Calls
+Local models often write "execute_terminal_command('mkdir …')" instead of calling the tool
+"""
+
+import ast
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+# Keys local models use for the tool name and its arguments in JSON tool calls
+_NAME_KEYS = ("name", "tool", "tool_name", "function", "action")
+_ARGS_KEYS = ("arguments", "args", "parameters", "tool_input", "input", "action_input")
+
+# Shell code blocks ("```bash\nmkdir ~/Desktop/Images\n```")
+_SHELL_BLOCK_RE = re.compile(r"```(?:bash|sh|shell|zsh|console)\s*\n(.*?)```", re.DOTALL)
+
+# Text before a written call on its line that reads as "about to call it", not "called it"
+_INVOKE_PREFIX_RE = re.compile(
+    r"(?:^|[:`>*\-\d.)]|\b(?:i'll|i will|i'm going to|let me|let's|now|next|first|then|"
+    r"call(?:ing)?|run(?:ning)?|execut(?:e|ing)|us(?:e|ing)|action|tool call|invoke|invoking))"
+    r"[\s`*:>\"']*$",
+    re.IGNORECASE,
+)
+_PAST_TENSE_RE = re.compile(
+    r"\b(used|called|ran|executed|invoked|have|has|had|already|didn't|did not|was)\b", re.IGNORECASE
+)
+# Advice and examples for the user ("you can run: ```df -h```", "next time, call …")
+_ADVICE_RE = re.compile(
+    r"\b(you(?:'ll)? (?:can|could|should|may|might|need|have)|yourself|if you|let me know|"
+    r"next time|in (?:the )?future|for example|example|e\.g|manually|would|could|should)\b",
+    re.IGNORECASE,
+)
+# Lead-in of a JSON call or shell block the model means to run itself
+_ACTION_LEAD_RE = re.compile(
+    r"\b(i'll|i will|i'm going to|i am going to|i need to|let me|let's|now|running|executing|"
+    r"calling|(?:action|tool call)\W*:)",
+    re.IGNORECASE,
+)
+# Markup around JSON calls and shell blocks that isn't prose
+_WRAPPER_RE = re.compile(r"```\w*|</?tool_call>")
+_NOT_PROSE = " \t\n`*:.-#>"
+
+
+def _schema_fields(tool) -> dict:
+    """Argument name → pydantic field of a tool's schema"""
+    schema = tool.args_schema
+    return getattr(schema, "model_fields", {}) if schema is not None else {}
+
+
+def validate_call(tool, args: dict):
+    """
+    Check arguments against a tool's schema
+
+    Args:
+        tool: LangChain tool
+        args: Argument name → value
+
+    Returns:
+        Validated arguments (types coerced), or None if they don't fit the schema
+    """
+    if not isinstance(args, dict):
+        return None
+    fields = _schema_fields(tool)
+    if set(args) - set(fields):
+        return None
+    if any(field.is_required() and name not in args for name, field in fields.items()):
+        return None
+    try:
+        validated = tool.args_schema.model_validate(args)
+    except Exception:
+        return None
+    return {name: getattr(validated, name) for name in args}
+
+
+def _framed_as_action(text: str, spans: list) -> bool:
+    """
+    Whether calls written as JSON or shell blocks are meant to be run
+
+    True when the message is nothing but the calls, or the line leading into
+    them announces an action ("I'll check the folder:") and nothing in it
+    addresses the user ("You can check it yourself with: ```df -h```").
+    """
+    if not spans:
+        return False
+    pieces, position = [], 0
+    for start, end in spans:
+        pieces.append(text[position:start])
+        position = end
+    pieces.append(text[position:])
+    prose = _WRAPPER_RE.sub(" ", "\n".join(pieces)).strip(_NOT_PROSE)
+    if not prose:
+        return True
+    if _ADVICE_RE.search(prose):
+        return False
+    lead = _WRAPPER_RE.sub(" ", text[: spans[0][0]]).strip(_NOT_PROSE)
+    return bool(_ACTION_LEAD_RE.search(lead.rsplit("\n", 1)[-1]))
+
+
+def _json_calls(text: str, tools_by_name: dict) -> list:
+    """Tool calls written as JSON objects ({"name": ..., "arguments": {...}}, lists of them, ...)"""
+    decoder = json.JSONDecoder()
+    calls: list = []
+    spans: list = []
+    position = 0
+    while True:
+        start = min(
+            (i for i in (text.find("{", position), text.find("[", position)) if i >= 0), default=-1
+        )
+        if start < 0:
+            return calls if _framed_as_action(text, spans) else []
+        try:
+            value, end = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            position = start + 1
+            continue
+        position = end
+        found = len(calls)
+        for item in value if isinstance(value, list) else [value]:
+            if not isinstance(item, dict):
+                continue
+            if isinstance(item.get("function"), dict):  # OpenAI style
+                item = item["function"]
+            name = next((item[key] for key in _NAME_KEYS if isinstance(item.get(key), str)), None)
+            if name not in tools_by_name:
+                continue
+            args: Any = next((item[key] for key in _ARGS_KEYS if key in item), {})
+            if isinstance(args, str):
+                try:
+                    args = json.loads(args) if args.strip() else {}
+                except json.JSONDecodeError:
+                    continue
+            calls.append((name, args))
+        if len(calls) > found:
+            spans.append((start, end))
+
+
+def _literal_args(call: ast.Call, tool) -> dict:
+    """Arguments of a parsed Python-style call (positional ones mapped in schema order)"""
+    fields = list(_schema_fields(tool))
+    if len(call.args) > len(fields):
+        raise ValueError("too many positional arguments")
+    args = {name: ast.literal_eval(node) for name, node in zip(fields, call.args)}
+    for keyword in call.keywords:
+        if keyword.arg is None:
+            raise ValueError("**kwargs")
+        args[keyword.arg] = ast.literal_eval(keyword.value)
+    return args
+
+
+def _python_calls(text: str, tools_by_name: dict) -> list:
+    """Tool calls written as Python calls (list_directory("~/Desktop"), tool(x=1), ...)"""
+    names = "|".join(re.escape(name) for name in sorted(tools_by_name, key=len, reverse=True))
+    calls = []
+    for found in re.finditer(rf"\b({names})\s*\(", text):
+        line_start = text.rfind("\n", 0, found.start()) + 1
+        prefix = text[line_start : found.start()]
+        prefix = re.sub(r"\b(?:functions|tools|default_api)\.$", "", prefix)
+        if _PAST_TENSE_RE.search(prefix) or _ADVICE_RE.search(prefix):
+            continue
+        if not _INVOKE_PREFIX_RE.search(prefix):
+            continue
+
+        # Shortest closing parenthesis that makes the call parse
+        for end in (i for i, char in enumerate(text) if char == ")" and i > found.end() - 1):
+            try:
+                node = ast.parse(text[found.start() : end + 1].strip(), mode="eval").body
+            except SyntaxError:
+                continue
+            if isinstance(node, ast.Call):
+                tool = tools_by_name[found.group(1)]
+                try:
+                    args = _literal_args(node, tool)
+                except ValueError:  # Variables, expressions, **kwargs - not a literal call
+                    break
+                calls.append((tool.name, args))
+            break
+    return calls
+
+
+def _shell_calls(text: str, tools_by_name: dict) -> list:
+    """Commands written in a shell code block instead of calling execute_terminal_command"""
+    if "execute_terminal_command" not in tools_by_name:
+        return []
+    calls, spans = [], []
+    for block in _SHELL_BLOCK_RE.finditer(text):
+        lines = [line.strip().removeprefix("$ ") for line in block.group(1).splitlines()]
+        commands = [line for line in lines if line and not line.startswith("#")]
+        if commands:
+            calls.append(("execute_terminal_command", {"command": " && ".join(commands)}))
+            spans.append(block.span())
+    return calls if _framed_as_action(text, spans) else []
+
+
+def recover_tool_calls(text: str, tools_by_name: dict) -> list:
+    """
+    Find tool calls written into an assistant message as text
+
+    JSON tool calls are tried first, then Python-style calls, then shell code
+    blocks (as execute_terminal_command). Every call is validated against the
+    tool's schema; calls that don't fit are dropped. JSON and shell blocks
+    only count when the message is just the calls or announces running them,
+    and Python-style calls only when the text before them reads as calling
+    now - examples and advice to the user are left as text.
+
+    Args:
+        text: Assistant message content
+        tools_by_name: Tool name → LangChain tool (the tools the agent can run)
+
+    Returns:
+        Tool calls: [{"name", "args", "id", "type"}] (empty if none were found)
+    """
+    if not text or not tools_by_name:
+        return []
+    calls = []
+    for parse in (_json_calls, _python_calls, _shell_calls):
+        for name, args in parse(text, tools_by_name):
+            validated = validate_call(tools_by_name[name], args)
+            if validated is not None and (name, validated) not in calls:
+                calls.append((name, validated))
+        if calls:
+            break
+    return [
+        {"name": name, "args": args, "id": f"recovered-{uuid4().hex[:12]}", "type": "tool_call"}
+        for name, args in calls
+    ]
+
+
+# ============================================================================
+# POST-MODEL HOOK
+# ============================================================================
+
+
+def _content_text(message) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return "".join(
+        part.get("text", "") if isinstance(part, dict) else str(part) for part in message.content
+    )
+
+
+class ToolCallRecovery:
+    """
+    Post-model hook that converts tool calls written as text into real ones.
+
+    Runs after every model call; when the model answered with text only and
+    that text contains valid tool calls, the message is replaced by the same
+    message with those tool calls attached, so the agent executes them
+    instead of ending the task.
+
+    Usage:
+        create_react_agent(llm, tools, post_model_hook=ToolCallRecovery(tools))
+    """
+
+    def __init__(self, tools: list):
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.text_answers = 0  # Model answers without tool calls
+        self.recovered = 0  # ... of which contained recoverable tool calls
+
+    def __call__(self, state: dict) -> dict:
+        message = state["messages"][-1]
+        if not isinstance(message, AIMessage) or message.tool_calls:
+            return {}
+        self.text_answers += 1
+        calls = recover_tool_calls(_content_text(message), self.tools_by_name)
+        if not calls:
+            return {}
+        self.recovered += 1
+        # Same message ID - the messages reducer replaces the original
+        return {"messages": [message.model_copy(update={"tool_calls": calls})]}
+
+
+# ============================================================================
+# EVALUATION (recorded local-model outputs)
+# ============================================================================
+
+CORPUS_FILE = (
+    Path(__file__).resolve().parent.parent / "tests" / "data" / "local_model_outputs.jsonl"
+)
+
+
+def load_corpus(path: Path) -> list:
+    """Read [{"text", "expected": [{"name", "args"}]}] from a JSONL file"""
+    with open(path) as f:
+        return [item for item in map(json.loads, f) if item]
+
+
+def evaluate(corpus: list, tools: list) -> dict:
+    """
+    Score recovery on recorded model outputs
+
+    Args:
+        corpus: Recorded outputs with the tool calls they were meant to make
+            (an empty list for genuine text answers)
+        tools: Tools to validate against
+
+    Returns:
+        {"total", "with_calls", "recovered", "recovery_rate", "false_positives",
+         "wrong", "latency_ms"}
+    """
+    tools_by_name = {tool.name: tool for tool in tools}
+    with_calls = recovered = false_positives = 0
+    wrong = []
+    latency = 0.0
+    for item in corpus:
+        start = time.perf_counter()
+        calls = recover_tool_calls(item["text"], tools_by_name)
+        latency += time.perf_counter() - start
+
+        found = [{"name": call["name"], "args": call["args"]} for call in calls]
+        if item["expected"]:
+            with_calls += 1
+            if found == item["expected"]:
+                recovered += 1
+            else:
+                wrong.append(item["text"][:80])
+        elif found:
+            false_positives += 1
+            wrong.append(item["text"][:80])
+
+    total = len(corpus)
+    return {
+        "total": total,
+        "with_calls": with_calls,
+        "recovered": recovered,
+        "recovery_rate": recovered / with_calls if with_calls else 0.0,
+        "false_positives": false_positives,
+        "wrong": wrong,
+        "latency_ms": latency / total * 1000 if total else 0.0,
+    }
+
+
+def main():
+    """Print recovery results for a corpus of recorded outputs"""
+    from src.main_agent import local_tools
+
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else CORPUS_FILE
+    results = evaluate(load_corpus(path), local_tools)
+
+    print(f"📊 Tool-call recovery on {results['total']} recorded outputs ({path.name})")
+    print(
+        f"   Recovered: {results['recovered']}/{results['with_calls']} "
+        f"({results['recovery_rate']:.1%})"
+    )
+    print(f"   False positives on text answers: {results['false_positives']}")
+    print(f"   Latency: {results['latency_ms']:.3f} ms/output")
+    for text in results["wrong"]:
+        print(f"   ✗ {text!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Tool Selector - Dynamic Tool Subsets per Request
+Binds only the tools a prompt needs instead of all 27 JSON schemas on every call
+"""
+
+import json
+import re
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.cost_optimizer import estimate_tokens
+
+# ============================================================================
+# TOOL CATALOG
+# ============================================================================
+
+# Always bound - general-purpose tools that cover most file tasks
+CORE_TOOLS = {"list_directory", "execute_terminal_command"}
+
+# Intent → (trigger pattern, tools). Patterns are matched on word boundaries.
+TOOL_INTENTS = {
+    "files": (
+        r"files?|folders?|director(y|ies)|desktop|downloads|documents|organi[sz]e|move|copy"
+        r"|rename|create|delete|list|find|search|grep|contain(s|ing)?|read|pdfs?|jpe?g|png|txt|path|cwd"
+        r"|pwd|where am i",
+        {
+            "read_file_content",
+            "search_content",
+            "get_current_directory",
+            "search_file",
+            "organize_directory",
+        },
+    ),
+    "gui": (
+        r"click|mouse|cursor|type text|typing|write text|enter text|press|keys?|keyboard"
+        r"|shortcut|screen|screenshot|button|scroll|drag|window|wait|load(s|ing)?|icon|find on screen|locate",
+        {
+            "move_mouse",
+            "click_mouse",
+            "type_text",
+            "press_key",
+            "gui_sequence",
+            "take_screenshot",
+            "get_screen_info",
+            "wait_for_screen_stable",
+            "locate_on_screen",
+        },
+    ),
+    "apps": (
+        r"open|launch|start|apps?|application|browser|url|website|https?|www|chrome|safari"
+        r"|firefox|running",
+        {"open_app", "open_url", "check_running_apps"},
+    ),
+    "planning": (
+        r"organi[sz]e|plan|steps?|verify|make sure|double[- ]check|clean up",
+        {"plan_task", "execute_plan", "self_critique", "verify_expectations"},
+    ),
+    "memory": (
+        r"remember|memory|memories|recall|forget|prefer(ence)?s?|last time|learned",
+        {"save_to_memory", "recall_from_memory", "clear_memory"},
+    ),
+    "debug": (
+        r"errors?|fail(s|ed|ing)?|debug|fix|broken|why",
+        {"debug_last_error"},
+    ),
+}
+
+_INTENT_PATTERNS = {
+    intent: re.compile(rf"\b({pattern})\b") for intent, (pattern, _) in TOOL_INTENTS.items()
+}
+
+# A tool result starting with one of these means the step failed
+FAILURE_MARKERS = ("❌", "⚠️", "🚫", "⏱️", "Error")
+
+# The model saying it lacks a tool → bind everything
+_MISSING_TOOL_RE = re.compile(
+    r"(don't|do not|doesn't|does not) have (a |the |any |access to )?(tool|way|ability)"
+    r"|no (such |suitable |available )?tool|tool (is )?not available",
+    re.IGNORECASE,
+)
+
+
+_schema_tokens: dict[str, int] = {}  # Tool name → schema tokens
+
+
+def schema_tokens(tool) -> int:
+    """
+    Tokens a tool's JSON schema costs on every request it's bound to
+
+    Args:
+        tool: LangChain tool
+
+    Returns:
+        Estimated schema tokens (cached per tool)
+    """
+    if tool.name not in _schema_tokens:
+        _schema_tokens[tool.name] = estimate_tokens(json.dumps(convert_to_openai_tool(tool)))
+    return _schema_tokens[tool.name]
+
+
+def _current_turn(messages: list) -> list:
+    """Messages from the latest user message onward"""
+    for i in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[i], HumanMessage):
+            return messages[i:]
+    return messages
+
+
+def select_tool_names(messages: list, available: set) -> set:
+    """
+    Pick the tools relevant to the current turn
+
+    Uses keyword/intent routing over the user request, then widens per step:
+    tools the model already called or named, debug tools after a failed step,
+    and everything if the model says a tool is missing.
+
+    Args:
+        messages: Conversation messages (the current turn is used)
+        available: Names of all tools the agent can execute
+
+    Returns:
+        Names of tools to bind for the next model call
+    """
+    turn = _current_turn(messages)
+    request = ""
+    if turn and isinstance(turn[0], HumanMessage):
+        request = turn[0].content if isinstance(turn[0].content, str) else str(turn[0].content)
+    request = request.lower()
+
+    selected = set(CORE_TOOLS)
+    matched_intent = False
+    for intent, pattern in _INTENT_PATTERNS.items():
+        if pattern.search(request):
+            selected |= TOOL_INTENTS[intent][1]
+            matched_intent = True
+
+    # Nothing recognizable - don't guess, bind everything
+    if not matched_intent:
+        return set(available)
+
+    for message in turn[1:]:
+        if isinstance(message, AIMessage):
+            # Widen with any tool the model called (even if it wasn't bound) or named
+            for tool_call in message.tool_calls or []:
+                selected.add(tool_call["name"])
+            content = message.content if isinstance(message.content, str) else str(message.content)
+            if _MISSING_TOOL_RE.search(content):
+                return set(available)
+            selected |= {name for name in available if name in content}
+        elif isinstance(message, ToolMessage):
+            content = message.content if isinstance(message.content, str) else str(message.content)
+            if message.status == "error" or content.lstrip().startswith(FAILURE_MARKERS):
+                selected |= TOOL_INTENTS["debug"][1]
+
+    return selected & set(available)
+
+
+# ============================================================================
+# TOOL SELECTOR (dynamic model for create_react_agent)
+# ============================================================================
+
+
+class ToolSelector:
+    """
+    Binds a per-step tool subset and tracks the schema tokens saved.
+
+    All tools stay registered with the agent's tool node, so a call to a tool
+    that wasn't bound still runs - and widens the subset for the next step.
+
+    Usage:
+        selector = ToolSelector()
+        create_react_agent(selector.dynamic_model(llm, tools), tools, ...)
+        ...
+        selector.print_summary()
+    """
+
+    def __init__(self):
+        self.calls = []  # (bound tool count, bound tokens, full tokens) per model call
+
+    def dynamic_model(self, llm, tools: list):
+        """
+        Build a dynamic model callable for create_react_agent
+
+        Args:
+            llm: Chat model (tools not bound)
+            tools: All tools the agent can execute
+
+        Returns:
+            Callable (state, runtime) → llm bound to the selected tools
+        """
+        tools_by_name = {tool.name: tool for tool in tools}
+        tokens_by_name = {tool.name: schema_tokens(tool) for tool in tools}
+        full_tokens = sum(tokens_by_name.values())
+
+        def select_model(state, runtime):
+            names = select_tool_names(state["messages"], set(tools_by_name))
+            bound = [tool for name, tool in tools_by_name.items() if name in names]
+            bound_tokens = sum(tokens_by_name[tool.name] for tool in bound)
+            self.calls.append((len(bound), bound_tokens, full_tokens))
+            return llm.bind_tools(bound)
+
+        return select_model
+
+    def summary(self) -> dict:
+        """Schema token savings for the model calls so far"""
+        return {
+            "calls": len(self.calls),
+            "tools_per_call": [count for count, _, _ in self.calls],
+            "bound_tokens": sum(bound for _, bound, _ in self.calls),
+            "full_tokens": sum(full for _, _, full in self.calls),
+        }
+
+    def print_summary(self):
+        """Print schema tokens saved compared with binding the full tool list"""
+        summary = self.summary()
+        if not summary["calls"]:
+            return
+        saved = summary["full_tokens"] - summary["bound_tokens"]
+        per_call = saved // summary["calls"]
+        tools_per_call = "/".join(str(count) for count in summary["tools_per_call"])
+        print(
+            f"🧰 Tool schemas: {tools_per_call} tools bound per call, "
+            f"saved ~{saved:,} tokens (~{per_call:,}/call)"
+        )
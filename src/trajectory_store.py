@@ -0,0 +1,441 @@
+"""
+Trajectory Store - Replays Verified Tool-Call Sequences for Repeated Tasks
+"Organize Desktop by file type" runs locally the second time; the model only sees divergences
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from src.agent_tools import FOLDER_CATEGORIES
+from src.intent_router import KNOWN_FOLDERS
+from src.safety import simple_commands
+from src.tool_selector import FAILURE_MARKERS
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+
+TRAJECTORY_FILE = Path.home() / ".ai_robot_trajectories.json"
+
+# Placeholder for the task's directory in recorded tool arguments
+DIR_PLACEHOLDER = "{dir}"
+
+# Tools replayed as recorded (after re-binding their arguments)
+REPLAYABLE_TOOLS = {
+    "list_directory",
+    "execute_terminal_command",
+    "organize_directory",
+    "verify_expectations",
+    "read_file_content",
+    "get_current_directory",
+    "search_file",
+    "search_content",
+}
+
+# Tools that change the file system (a trajectory needs at least one)
+CHANGING_TOOLS = {"execute_terminal_command", "organize_directory"}
+
+# Reasoning-only tools - dropped from the recording, the replay doesn't need them
+REASONING_TOOLS = {
+    "plan_task",
+    "self_critique",
+    "recall_from_memory",
+    "save_to_memory",
+    "debug_last_error",
+}
+
+# "📊 File types found: 2 .jpg, 3 .pdf" (list_directory summary line)
+_FILE_TYPES_RE = re.compile(r"File types found:(.*)")
+_EXTENSION_COUNT_RE = re.compile(r"\d+ (\.[\w-]+)")
+
+# Extension globs in shell commands ("~/Desktop/*.jpg")
+_GLOB_EXTENSION_RE = re.compile(r"\*(\.[A-Za-z0-9]+)\b")
+
+_SHELL_OPERATORS = ("&&", "||", ";", "|", "`", "$(", "'", '"')
+
+# Programs whose plain arguments are files - each one must lie inside the task's directory
+_FILE_PROGRAMS = {"mkdir", "mv", "cp", "rm", "rmdir", "touch", "ln", "rsync", "tar", "zip", "unzip"}
+
+
+def _load() -> dict:
+    """Load recorded trajectories from disk"""
+    try:
+        if TRAJECTORY_FILE.exists():
+            with open(TRAJECTORY_FILE) as f:
+                trajectories: dict = json.load(f)
+                return trajectories
+    except Exception:
+        pass
+    return {}
+
+
+def _save(trajectories: dict):
+    """Save recorded trajectories to disk"""
+    try:
+        with open(TRAJECTORY_FILE, "w") as f:
+            json.dump(trajectories, f, indent=2, ensure_ascii=False)
+    except Exception:
+        pass
+
+
+# ============================================================================
+# TASK KEYS & ARGUMENT TEMPLATES
+# ============================================================================
+
+_FILLER_RE = re.compile(r"\b(please|my|the|can you|could you)\b")
+
+
+def task_key(task: str) -> tuple:
+    """
+    Normalize a task and pull out the directory it's about
+
+    "Organize my Desktop by file type" and "organize downloads by file type"
+    share the key "organize {dir} by file type".
+
+    Args:
+        task: User request
+
+    Returns:
+        (key, directory) or ("", "") if the task names no known folder or path
+    """
+    text = task.strip().rstrip(".!?")
+    path_match = re.search(r"(?<!\S)(~?/[\w./~-]*)", text)
+    if path_match:
+        directory = path_match.group(1).rstrip("/") or "/"
+        text = text.replace(path_match.group(1), DIR_PLACEHOLDER, 1)
+    else:
+        lowered = text.lower()
+        # Longest folder word first ("home folder" before "home")
+        for word in sorted(KNOWN_FOLDERS, key=len, reverse=True):
+            found = re.search(rf"\b{re.escape(word)}\b", lowered)
+            if found:
+                directory = KNOWN_FOLDERS[word]
+                text = text[: found.start()] + DIR_PLACEHOLDER + text[found.end() :]
+                break
+        else:
+            return "", ""
+
+    key = _FILLER_RE.sub("", text.lower())
+    return " ".join(key.split()), directory
+
+
+def _same_directory(a: str, b: str) -> bool:
+    return os.path.normpath(os.path.expanduser(a)) == os.path.normpath(os.path.expanduser(b))
+
+
+def _to_template(value, directory: str):
+    """Replace the directory (as written or expanded) with the placeholder"""
+    if not isinstance(value, str):
+        return value
+    for form in sorted({directory, os.path.expanduser(directory)}, key=len, reverse=True):
+        value = value.replace(form, DIR_PLACEHOLDER)
+    return value
+
+
+def _from_template(value, directory: str):
+    """Bind the placeholder to the absolute directory (safe inside quotes, unlike ~)"""
+    if not isinstance(value, str):
+        return value
+    return value.replace(DIR_PLACEHOLDER, os.path.expanduser(directory))
+
+
+def listing_extensions(listing: str) -> set:
+    """File extensions in a list_directory result"""
+    found = _FILE_TYPES_RE.search(listing)
+    return set(_EXTENSION_COUNT_RE.findall(found.group(1))) if found else set()
+
+
+def verification_passed(output) -> bool:
+    """Whether a verify_expectations result passed (not failed or inconclusive)"""
+    return "VERIFICATION PASSED" in str(getattr(output, "console_text", output))
+
+
+def _inside(path: str, directory: str) -> bool:
+    """Whether a path (absolute or ~) lies in a directory, without escaping it via .."""
+    if not path.startswith(("/", "~")) or ".." in path.split("/"):
+        return False
+    root = os.path.normpath(os.path.expanduser(directory))
+    path = os.path.normpath(os.path.expanduser(path))
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def confined(step: dict, directory: str) -> bool:
+    """
+    Whether a changing step only touches files inside a directory
+
+    organize_directory must target the directory itself. A shell command must
+    name the directory, every path in it must lie inside it, and file commands
+    (mv, cp, mkdir, ...) may only use relative names after a cd into it.
+
+    Args:
+        step: {"name", "args"} with the directory bound
+        directory: The task's directory
+    """
+    args = step["args"]
+    if step["name"] == "organize_directory":
+        return _same_directory(args.get("directory_path", ""), directory)
+    if step["name"] != "execute_terminal_command":
+        return True
+    command = args.get("command", "")
+    root = os.path.expanduser(directory)
+    if root not in command and directory not in command:
+        return False
+    moved_in = False  # A cd into the directory makes relative names safe
+    for argv in simple_commands(command):
+        program, words = argv[0], [word for word in argv[1:] if not word.startswith("-")]
+        for word in words:
+            if word.startswith(("/", "~")):
+                if not _inside(word, directory):
+                    return False
+            elif ("/" in word or program in _FILE_PROGRAMS) and (
+                not moved_in or ".." in word.split("/")
+            ):
+                return False
+        if program == "cd":
+            moved_in = bool(words) and _inside(words[0], directory)
+    return True
+
+
+def step_failed(output) -> bool:
+    """Whether a tool result reports a failure (rich or compact format)"""
+    text = str(getattr(output, "console_text", output)).strip()
+    return (
+        text.startswith(FAILURE_MARKERS)
+        or "VERIFICATION FAILED" in text
+        or '"result":"failed"' in str(output)
+    )
+
+
+# ============================================================================
+# RE-BINDING (fresh observation → arguments)
+# ============================================================================
+
+
+def rebind_command(command: str, present: set) -> str:
+    """
+    Adapt a recorded shell command to the file types present now
+
+    Globs for file types that are gone are dropped from mv/cp. mkdir skips
+    folders that already exist and category folders (Images/, Documents/, ...)
+    for file types that are gone. Commands with quoting or shell operators are
+    replayed unchanged.
+
+    Args:
+        command: Recorded command with the directory already bound
+        present: Extensions in the fresh listing
+
+    Returns:
+        Command to run, or "" to skip the step (nothing left to do)
+    """
+    globs = {ext.lower() for ext in _GLOB_EXTENSION_RE.findall(command)}
+    if globs and not globs & present:
+        return ""
+    if any(operator in command for operator in _SHELL_OPERATORS):
+        return command
+
+    words = command.split()
+    if not words:
+        return command
+    program, args = words[0], words[1:]
+    if program in ("mv", "cp") and len(args) >= 2:
+        sources, target = args[:-1], args[-1]
+        kept = []
+        for arg in sources:
+            match = _GLOB_EXTENSION_RE.search(arg)
+            if arg.startswith("-") or not match or match.group(1).lower() in present:
+                kept.append(arg)
+        if not [arg for arg in kept if not arg.startswith("-")]:
+            return ""
+        return " ".join([program, *kept, target])
+
+    if program == "mkdir":
+        kept = []
+        for arg in args:
+            if not arg.startswith("-") and os.path.isdir(os.path.expanduser(arg)):
+                continue
+            category = FOLDER_CATEGORIES.get(os.path.basename(arg.rstrip("/")))
+            if category and not set(category[1]) & present:
+                continue
+            kept.append(arg)
+        if not [arg for arg in kept if not arg.startswith("-")]:
+            return ""
+        return " ".join([program, *kept])
+
+    return command
+
+
+def rebind_step(step: dict, directory: str, present: set) -> dict:
+    """
+    Bind a recorded step to a directory and the file types present now
+
+    Returns:
+        Step to run ({"name", "args"}), or {} to skip it
+    """
+    args = {name: _from_template(value, directory) for name, value in step["args"].items()}
+    if step["name"] == "execute_terminal_command":
+        args["command"] = rebind_command(args["command"], present)
+        if not args["command"]:
+            return {}
+    elif step["name"] == "verify_expectations":
+        globs = {ext.lower() for ext in _GLOB_EXTENSION_RE.findall(args.get("checks", ""))}
+        if globs and not globs & present:
+            return {}
+    return {"name": step["name"], "args": args}
+
+
+# ============================================================================
+# TRAJECTORY STORE
+# ============================================================================
+
+
+class TrajectoryStore:
+    """
+    Records the tool calls of verified-successful tasks and replays them.
+
+    A trajectory starts with list_directory on the task's directory, changes
+    only files inside it and ends with a passing verify_expectations. Replay
+    checks the target directory exists and every change stays inside it,
+    re-runs that listing, re-binds every later step to the fresh observation
+    and stops at the first divergence (new file types) or failed step, so the
+    model can take over from there.
+
+    Usage:
+        trajectories = TrajectoryStore()
+        trajectories.record(task, steps)          # after a successful run
+        replay = trajectories.replay(task, tools) # before the next one
+    """
+
+    def __init__(self):
+        self.trajectories = _load()
+
+    def record(self, task: str, steps: list) -> bool:
+        """
+        Save a task's tool calls if they form a verified, replayable trajectory
+
+        Args:
+            task: User request
+            steps: [{"name", "args", "output"}] in call order
+
+        Returns:
+            True if the trajectory was recorded
+        """
+        key, directory = task_key(task)
+        if not key or not steps:
+            return False
+        first = steps[0]
+        if first["name"] != "list_directory" or not _same_directory(
+            first["args"].get("directory_path", ""), directory
+        ):
+            return False
+        if any(step_failed(step["output"]) for step in steps):
+            return False
+        if any(step["name"] not in REPLAYABLE_TOOLS | REASONING_TOOLS for step in steps):
+            return False
+
+        replayable = [step for step in steps if step["name"] in REPLAYABLE_TOOLS]
+        changes = [i for i, step in enumerate(replayable) if step["name"] in CHANGING_TOOLS]
+        if not changes:
+            return False
+        # Replayed on another folder later, so every change must stay inside this one
+        if not all(confined(replayable[i], directory) for i in changes):
+            return False
+        # Verified: a passing verify_expectations on the task's directory after the first change
+        verified = any(
+            step["name"] == "verify_expectations"
+            and _same_directory(step["args"].get("directory", ""), directory)
+            and verification_passed(step["output"])
+            for step in replayable[changes[0] :]
+        )
+        if not verified:
+            return False
+
+        existing = self.trajectories.get(key, {})
+        self.trajectories[key] = {
+            "task": task,
+            "extensions": sorted(listing_extensions(str(first["output"]))),
+            "steps": [
+                {
+                    "name": step["name"],
+                    "args": {
+                        name: _to_template(value, directory) for name, value in step["args"].items()
+                    },
+                }
+                for step in replayable
+            ],
+            "recorded_at": time.time(),
+            "replays": existing.get("replays", 0),
+            "handoffs": existing.get("handoffs", 0),
+        }
+        _save(self.trajectories)
+        return True
+
+    def find(self, task: str) -> dict:
+        """Recorded trajectory for a task (any directory), or {}"""
+        key, _ = task_key(task)
+        return self.trajectories.get(key, {}) if key else {}
+
+    def replay(self, task: str, tools: list, on_step=None) -> dict:
+        """
+        Replay the trajectory recorded for a task
+
+        Args:
+            task: User request
+            tools: Tools to execute (looked up by name)
+            on_step: Optional callback(step) after each executed step (for printing)
+
+        Returns:
+            {"completed": bool, "steps": [{"name", "args", "output"}], "reason": str},
+            or {} if no trajectory matches
+        """
+        key, directory = task_key(task)
+        trajectory = self.trajectories.get(key)
+        if not trajectory:
+            return {}
+
+        tools_by_name = {tool.name: tool for tool in tools}
+        executed = []
+        if not os.path.isdir(os.path.expanduser(directory)):
+            return {"completed": False, "steps": [], "reason": f"{directory} is not a folder"}
+
+        def run(step: dict) -> str:
+            try:
+                output: str = tools_by_name[step["name"]].invoke(step["args"])
+            except Exception as e:  # Arguments recorded for an older tool signature
+                output = f"❌ {step['name']} failed: {e}"
+            executed.append({**step, "output": output})
+            if on_step:
+                on_step(executed[-1])
+            return output
+
+        def finish(completed: bool, reason: str) -> dict:
+            trajectory["replays" if completed else "handoffs"] += 1
+            _save(self.trajectories)
+            return {"completed": completed, "steps": executed, "reason": reason}
+
+        # Fresh observation - everything after it is re-bound to what's there now
+        listing = run(rebind_step(trajectory["steps"][0], directory, set()))
+        if step_failed(listing):
+            return finish(False, "listing failed")
+        present = listing_extensions(str(listing))
+        new_types = present - set(trajectory["extensions"])
+        if new_types:
+            return finish(False, f"new file types: {', '.join(sorted(new_types))}")
+
+        for recorded in trajectory["steps"][1:]:
+            step = rebind_step(recorded, directory, present)
+            if not step:
+                continue
+            if step["name"] not in tools_by_name:
+                return finish(False, f"tool {step['name']} unavailable")
+            if step["name"] in CHANGING_TOOLS and not confined(step, directory):
+                return finish(False, f"{step['name']} would reach outside {directory}")
+            output = run(step)
+            if step_failed(output):
+                return finish(False, f"step {len(executed)} ({step['name']}) failed")
+            if step["name"] == "verify_expectations" and not verification_passed(output):
+                return finish(False, "verification did not pass")
+
+        return finish(True, "")
@@ -0,0 +1,301 @@
+"""
+Verification - Directory Snapshots, Diffs and Declarative Checks
+In-process verification for verify_expectations: no shell, shallow "before" snapshots
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from typing import Optional
+
+from src import config
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+# Normalized root → snapshot taken before the current task changed anything
+_baselines: dict[str, dict] = {}
+_lock = threading.Lock()
+
+
+def _root(directory: str) -> str:
+    return os.path.normpath(os.path.expanduser(directory))
+
+
+def snapshot(directory: str, max_depth: int = 0) -> dict:
+    """
+    Cheap manifest of a directory tree
+
+    Args:
+        directory: Root directory
+        max_depth: Levels to descend (default: config.VERIFY_MAX_DEPTH; 1 = root only)
+
+    Returns:
+        {"root": path, "entries": {relative path: (size, mtime_ns, is_dir)},
+         "scanned": {relative folders whose contents were fully listed ("" = root)}}
+    """
+    root = _root(directory)
+    max_depth = max_depth or config.VERIFY_MAX_DEPTH
+    entries: dict[str, tuple] = {}
+    scanned = set()
+    pending = [("", 1)]
+    while pending and len(entries) < config.VERIFY_MAX_ENTRIES:
+        prefix, depth = pending.pop()
+        try:
+            with os.scandir(os.path.join(root, prefix)) as scan:
+                for entry in scan:
+                    relative = f"{prefix}{entry.name}"
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        stat = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries[relative] = (0 if is_dir else stat.st_size, stat.st_mtime_ns, is_dir)
+                    if is_dir and depth < max_depth:
+                        pending.append((f"{relative}/", depth + 1))
+            scanned.add(prefix.rstrip("/"))
+        except OSError:
+            continue
+    return {"root": root, "entries": entries, "scanned": scanned}
+
+
+def reset():
+    """Forget all baselines (called when a new task starts)"""
+    with _lock:
+        _baselines.clear()
+
+
+def remember(directory: str):
+    """
+    Take the "before" snapshot of a directory, once per task
+
+    Called by the tools that look at or change a directory (list_directory,
+    organize_directory, plan_task), so a later verification can diff against it.
+    Only the folder's own entries are recorded - one scandir, however big the
+    tree below it is; subfolders get their own snapshot when they are listed.
+    """
+    root = _root(directory)
+    if not os.path.isdir(root):
+        return
+    with _lock:
+        if root in _baselines:
+            return
+    manifest = snapshot(root, max_depth=1)
+    with _lock:
+        _baselines.setdefault(root, manifest)
+
+
+def baseline(directory: str) -> dict:
+    """
+    "Before" snapshot covering a directory, merged from every remembered snapshot
+    of it, of a parent (re-rooted) and of its subfolders
+
+    Returns:
+        Snapshot, or {} if nothing was remembered for this task
+    """
+    root = _root(directory)
+    entries: dict[str, tuple] = {}
+    scanned: set = set()
+    with _lock:
+        for base, manifest in _baselines.items():
+            if base == root or root.startswith(base.rstrip(os.sep) + os.sep):
+                prefix = "" if base == root else os.path.relpath(root, base).replace(os.sep, "/")
+                prefix = f"{prefix}/" if prefix else ""
+                for path, info in manifest["entries"].items():
+                    if path.startswith(prefix):
+                        entries.setdefault(path[len(prefix) :], info)
+                for folder in manifest["scanned"]:
+                    if f"{folder}/".startswith(prefix):
+                        scanned.add(folder[len(prefix) :])
+            elif base.startswith(root.rstrip(os.sep) + os.sep):
+                prefix = os.path.relpath(base, root).replace(os.sep, "/")
+                for path, info in manifest["entries"].items():
+                    entries.setdefault(f"{prefix}/{path}", info)
+                scanned.update(f"{prefix}/{folder}".rstrip("/") for folder in manifest["scanned"])
+    if not scanned:
+        return {}
+    return {"root": root, "entries": entries, "scanned": scanned}
+
+
+def _known_before(path: str, before: dict) -> bool:
+    """
+    Whether the "before" snapshot can tell if a path existed
+
+    True if the nearest ancestor that already existed (or the root) was
+    listed - a path under a folder that wasn't listed may have been there all along.
+    """
+    parent = path.rpartition("/")[0]
+    while parent and parent not in before["entries"]:
+        parent = parent.rpartition("/")[0]
+    return parent in before.get("scanned", {parent})
+
+
+def diff(before: dict, after: dict) -> dict:
+    """
+    Compare two snapshots of the same root
+
+    Returns:
+        {"added": [paths], "removed": [paths], "modified": [paths]} (sorted) - only
+        paths the "before" snapshot covered (see _known_before)
+    """
+    old, new = before["entries"], after["entries"]
+    return {
+        "added": sorted(path for path in set(new) - set(old) if _known_before(path, before)),
+        "removed": sorted(set(old) - set(new)),
+        "modified": sorted(
+            path for path in set(old) & set(new) if not old[path][2] and old[path] != new[path]
+        ),
+    }
+
+
+# ============================================================================
+# CHECKS (declarative predicates)
+# ============================================================================
+#
+#   count <glob> [in <dir>] <op> <n>     count *.jpg in Images == 8
+#   none <glob> [in <dir>]               none *.pdf          (no *.pdf left)
+#   any <glob> [in <dir>]                any *.png in Images
+#   exists <path> / missing <path>       exists Images
+#   added|removed|modified <glob> [in <dir>] <op> <n>   removed *.jpg == 8
+#
+# Globs are case-insensitive and match one directory level ("**/x" = any depth).
+
+_OPS = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">=": lambda a, b: a >= b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    "<": lambda a, b: a < b,
+}
+
+_TARGET = r"(?:of )?(?P<glob>\S+)(?: (?:left |remaining )?in (?P<dir>.+?))?"
+_COMPARE = r" ?(?P<op>==|!=|>=|<=|>|<|=) ?(?P<n>\d+)"
+
+_CHECK_PATTERNS = [
+    ("count", re.compile(rf"count {_TARGET}{_COMPARE}", re.IGNORECASE)),
+    ("none", re.compile(rf"(?:none|no) {_TARGET}(?: left)?", re.IGNORECASE)),
+    ("any", re.compile(rf"(?:any|some) {_TARGET}", re.IGNORECASE)),
+    ("exists", re.compile(r"exists (?P<path>.+)", re.IGNORECASE)),
+    ("missing", re.compile(r"missing (?P<path>.+)", re.IGNORECASE)),
+    (
+        "changed",
+        re.compile(rf"(?P<kind>added|removed|modified) {_TARGET}{_COMPARE}", re.IGNORECASE),
+    ),
+]
+
+CHECK_SYNTAX = (
+    "count <glob> [in <dir>] == N; none <glob> [in <dir>]; any <glob> [in <dir>]; "
+    "exists <path>; missing <path>; added|removed|modified <glob> [in <dir>] == N"
+)
+
+
+def _matches(paths, pattern: str, folder: str) -> list:
+    """Paths inside a folder (relative to the snapshot root) matching a glob"""
+    prefix = f"{folder}/" if folder else ""
+    any_depth = pattern.startswith("**/")
+    pattern = pattern[3:] if any_depth else pattern
+    pattern = pattern.lower()
+    found = []
+    for path in paths:
+        if not path.startswith(prefix):
+            continue
+        relative = path[len(prefix) :]
+        if any_depth:
+            relative = relative.rsplit("/", 1)[-1]
+        elif "/" in relative and "/" not in pattern:
+            continue
+        if fnmatch.fnmatchcase(relative.lower(), pattern):
+            found.append(path)
+    return found
+
+
+def _folder(root: str, folder: str) -> str:
+    """Folder of an "in <dir>" clause, relative to the snapshot root ("" = root)"""
+    if not folder:
+        return ""
+    folder = folder.strip().rstrip("/")
+    path = _root(folder) if folder.startswith(("~", "/")) else os.path.join(root, folder)
+    if path == root or (folder == os.path.basename(root) and not os.path.isdir(path)):
+        return ""
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def evaluate(check: str, after: dict, changes: dict, before: Optional[dict] = None) -> dict:
+    """
+    Evaluate one check against the current snapshot and the diff
+
+    Args:
+        check: Predicate text (see CHECK_SYNTAX)
+        after: Snapshot taken now
+        changes: diff(before, after), or {} without a baseline
+        before: The baseline, to tell which folders the diff covers
+
+    Returns:
+        {"check", "ok": True/False/None (None = can't tell), "actual"}
+    """
+    text = check.strip().rstrip(".")
+    files = [path for path, info in after["entries"].items() if not info[2]]
+    for kind, pattern in _CHECK_PATTERNS:
+        found = pattern.fullmatch(text)
+        if not found:
+            continue
+        groups = found.groupdict()
+
+        if kind in ("exists", "missing"):
+            path = groups["path"].strip().rstrip("/")
+            full = _root(path) if path.startswith(("~", "/")) else os.path.join(after["root"], path)
+            exists = os.path.exists(full)
+            return {
+                "check": text,
+                "ok": exists if kind == "exists" else not exists,
+                "actual": "exists" if exists else "missing",
+            }
+
+        folder = _folder(after["root"], groups.get("dir") or "")
+        if kind == "changed":
+            if not changes:
+                return {"check": text, "ok": None, "actual": "no before-snapshot for this task"}
+            if before and not _known_before(f"{folder}/", before):
+                return {"check": text, "ok": None, "actual": f"{folder} wasn't listed beforehand"}
+            paths = changes[groups["kind"].lower()]
+        else:
+            paths = files
+        count = len(_matches(paths, groups["glob"], folder))
+
+        if kind == "none":
+            return {"check": text, "ok": count == 0, "actual": count}
+        if kind == "any":
+            return {"check": text, "ok": count > 0, "actual": count}
+        op = "==" if groups["op"] == "=" else groups["op"]
+        return {"check": text, "ok": _OPS[op](count, int(groups["n"])), "actual": count}
+
+    return {"check": text, "ok": None, "actual": f"unknown check (use: {CHECK_SYNTAX})"}
+
+
+def verify(directory: str, checks: list) -> dict:
+    """
+    Snapshot a directory and evaluate checks against it and the task's changes
+
+    Args:
+        directory: Root the checks are relative to
+        checks: Predicate strings
+
+    Returns:
+        {"root", "results": [...], "result": "passed"|"failed"|"inconclusive",
+         "changes": diff or {}}
+    """
+    after = snapshot(directory)
+    before = baseline(directory)
+    changes = diff(before, after) if before else {}
+    results = [evaluate(check, after, changes, before) for check in checks if check.strip()]
+
+    if any(result["ok"] is False for result in results):
+        verdict = "failed"
+    elif not results or any(result["ok"] is None for result in results):
+        verdict = "inconclusive"
+    else:
+        verdict = "passed"
+    return {"root": after["root"], "results": results, "result": verdict, "changes": changes}
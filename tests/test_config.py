@@ -0,0 +1,18 @@
+"""
+Settings missing from an older config.py fall back to config.example.py
+"""
+
+import src
+from src import config, motion
+from src.input_backend import RecordingBackend
+
+
+def test_missing_settings_get_the_example_defaults(monkeypatch):
+    monkeypatch.delattr(config, "MOUSE_MOTION_MODE")
+    monkeypatch.setattr(config, "MOUSE_MAX_STEPS", 5)
+
+    src._apply_config_defaults()
+
+    assert config.MOUSE_MOTION_MODE == "human"
+    assert config.MOUSE_MAX_STEPS == 5  # The user's own value wins
+    assert motion.move(300, 200, backend=RecordingBackend(start=(0, 0)))["mode"] == "human"
@@ -0,0 +1,100 @@
+"""
+Text search inside files on a temporary tree (literal/regex, skipped files, match cap, ranking)
+"""
+
+import re
+
+import pytest
+
+from src import content_search
+from src.content_search import read_lines, search_files
+
+TREE = {
+    "notes.txt": "Buy milk\nTODO: call the bank\n",
+    "a/b/deep.md": "nothing here\nlast todo of the day\n",
+    "a/report.md": "Quarterly report\nTotal: 42\n",
+    "a/data.bin": b"TODO\0\x01\x02",
+    ".git/config": "TODO in git metadata\n",
+    "node_modules/pkg/index.js": "// TODO: dependency code\n",
+}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    for name, content in TREE.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    return tmp_path
+
+
+def test_literal_search_is_case_insensitive_and_ranked_by_depth(tree):
+    result = search_files(str(tree), "todo")
+
+    assert [(m["path"], m["line"]) for m in result["matches"]] == [
+        ("notes.txt", 2),
+        ("a/b/deep.md", 2),
+    ]
+    assert result["matches"][0]["snippet"] == "TODO: call the bank"
+    assert result["skipped"] == {"binary": 1}
+    assert not result["truncated"]
+
+
+def test_literal_query_is_not_a_regex(tree):
+    assert search_files(str(tree), "Total.*")["matches"] == []
+    assert len(search_files(str(tree), "Total.*", regex=True)["matches"]) == 1
+
+
+def test_case_sensitive(tree):
+    result = search_files(str(tree), "TODO", case_sensitive=True)
+
+    assert [m["path"] for m in result["matches"]] == ["notes.txt"]
+
+
+def test_max_matches_stops_the_search(tmp_path):
+    for i in range(200):
+        (tmp_path / f"file{i:03}.txt").write_text("needle\n" * 3)
+
+    result = search_files(str(tmp_path), "needle", max_matches=5, workers=2)
+
+    assert len(result["matches"]) == 5
+    assert result["truncated"]
+    assert result["files_scanned"] < 200
+
+
+def test_include_glob(tree):
+    result = search_files(str(tree), "o", include="*.md")
+
+    assert {m["path"] for m in result["matches"]} == {"a/report.md", "a/b/deep.md"}
+
+
+def test_bad_input(tree):
+    with pytest.raises(re.error):
+        search_files(str(tree), "(", regex=True)
+    with pytest.raises(NotADirectoryError):
+        search_files(str(tree / "notes.txt"), "milk")
+
+
+def test_read_lines_stops_early(tmp_path):
+    path = tmp_path / "log.txt"
+    path.write_text("".join(f"line {i}\n" for i in range(1000)))
+
+    lines, truncated = read_lines(str(path), 3)
+
+    assert lines == ["line 0\n", "line 1\n", "line 2\n"]
+    assert truncated
+    assert read_lines(str(path), 1000) == (read_lines(str(path), 2000)[0], False)
+
+
+def test_long_lines_are_read_in_pieces(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_search, "MAX_LINE_CHARS", 10)
+    path = tmp_path / "minified.js"
+    path.write_text("x" * 30 + "needle\nneedle\n")
+
+    assert len(list(content_search.stream_lines(str(path)))) == 5
+    result = search_files(str(tmp_path), "needle")
+    # Pieces of one long line keep its line number
+    assert [m["line"] for m in result["matches"]] == [1, 2]
@@ -0,0 +1,148 @@
+"""
+Element locator on synthetic screens (no display needed)
+"""
+
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src import input_backend
+from src.agent_tools import locate_on_screen
+from src.element_locator import ElementLocator
+from src.input_backend import RecordingBackend
+
+SCREEN = (1920, 1080)
+
+# name → (left, top, width, height) on the synthetic screen
+ICONS = {
+    "save": (100, 200, 96, 32),
+    "cancel": (900, 500, 64, 64),
+    "search": (1500, 80, 180, 36),
+    "trash": (300, 800, 48, 48),
+    "settings": (1200, 900, 90, 30),
+}
+
+
+def icon(rng, width: int, height: int) -> np.ndarray:
+    """Blocky random pattern (survives the pyramid's downsampling)"""
+    blocks = rng.integers(0, 256, (height // 4 + 1, width // 4 + 1), dtype=np.uint8)
+    return np.kron(blocks, np.ones((4, 4), dtype=np.uint8))[:height, :width]
+
+
+def make_screen(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    y, x = np.mgrid[0 : SCREEN[1], 0 : SCREEN[0]]
+    pixels = (80 + 60 * np.sin(x / 300) * np.cos(y / 200)).astype(np.uint8)
+    for left, top, width, height in ICONS.values():
+        pixels[top : top + height, left : left + width] = icon(rng, width, height)
+    return pixels
+
+
+@pytest.fixture
+def screen():
+    return make_screen()
+
+
+@pytest.fixture
+def locator(screen):
+    library = ElementLocator(template_dir="/nonexistent")
+    for name, (left, top, width, height) in ICONS.items():
+        library.register(name, screen[top : top + height, left : left + width])
+    return library
+
+
+@pytest.fixture
+def backend(screen):
+    image = Image.fromarray(screen)
+    recording = RecordingBackend(screen=SCREEN, frames=lambda clock: image)
+    previous = input_backend.set_backend(recording)
+    yield recording
+    input_backend.set_backend(previous)
+
+
+def test_finds_every_template_in_one_capture(locator, backend):
+    results = locator.locate(list(ICONS), backend=backend)
+
+    assert backend.count("screenshot") == 1
+    for name, (left, top, width, height) in ICONS.items():
+        assert results[name]["found"], name
+        assert results[name]["box"] == (left, top, width, height)
+        assert (results[name]["x"], results[name]["y"]) == (left + width // 2, top + height // 2)
+
+
+def test_template_captured_at_twice_the_resolution(locator, screen):
+    left, top, width, height = ICONS["search"]
+    retina = Image.fromarray(screen[top : top + height, left : left + width]).resize(
+        (width * 2, height * 2), Image.Resampling.BILINEAR
+    )
+    locator.register("search@2x", retina)
+
+    found = locator.match(Image.fromarray(screen), ["search@2x"])["search@2x"]
+
+    assert found["found"] and found["scale"] == 0.5
+    assert found["box"] == pytest.approx((left, top, width, height), abs=1)
+
+
+def test_region_results_are_in_screen_coordinates(locator, backend):
+    results = locator.locate(["cancel", "save"], region="800,400,400,300", backend=backend)
+
+    assert (results["cancel"]["x"], results["cancel"]["y"]) == (932, 532)
+    assert not results["save"]["found"]
+
+
+def test_retina_frames_are_converted_to_points(locator, screen):
+    frame = Image.fromarray(screen)
+    retina = ElementLocator(template_dir="/nonexistent")
+    retina.templates = locator.templates
+    backend = RecordingBackend(screen=(960, 540), frames=lambda clock: frame)
+
+    found = retina.locate(["trash"], backend=backend)["trash"]
+
+    assert (found["x"], found["y"]) == ((300 + 24) / 2, (800 + 24) / 2)
+
+
+def test_pyramid_is_cached_per_frame(locator, screen):
+    frame = Image.fromarray(screen)
+    locator.match(frame, ["save"])
+    pyramid = locator.pyramid(frame)
+
+    locator.match(frame, ["cancel", "trash"])
+
+    assert locator.pyramid(frame) is pyramid
+    assert locator.pyramid(Image.fromarray(screen)) is not pyramid
+
+
+def test_flat_templates_are_rejected(locator):
+    with pytest.raises(ValueError):
+        locator.register("blank", np.full((20, 20), 200, dtype=np.uint8))
+
+
+def test_templates_load_from_the_library_folder(tmp_path, screen, backend):
+    left, top, width, height = ICONS["settings"]
+    Image.fromarray(screen[top : top + height, left : left + width]).save(tmp_path / "gear.png")
+    library = ElementLocator(template_dir=str(tmp_path))
+
+    assert library.names() == ["gear"]
+    assert library.locate(["gear", "missing"], backend=backend)["missing"]["error"]
+
+
+def test_tool_reports_click_points(locator, backend, monkeypatch):
+    monkeypatch.setattr("src.agent_tools.locator", locator)
+
+    result = locate_on_screen.invoke({"targets": "save, nothing"})
+
+    assert "🎯 save at (148, 216)" in result
+    assert "❔ nothing: unknown template" in result
+
+
+def test_several_templates_in_tens_of_milliseconds(locator, screen):
+    locator.match(Image.fromarray(screen), list(ICONS))  # Template FFTs are built once
+
+    start = time.perf_counter()
+    results = locator.match(Image.fromarray(screen), list(ICONS))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    assert all(found["found"] for found in results.values())
+    assert elapsed_ms < 250
@@ -0,0 +1,77 @@
+"""
+Bulk organization by file type: only needed folders, conflict-safe names, dry runs
+"""
+
+from src.agent_tools import FOLDER_CATEGORIES
+from src.file_organizer import organize
+
+
+def make_files(folder, names):
+    for name in names:
+        (folder / name).write_text(name)
+
+
+def test_sorts_files_into_needed_folders_only(tmp_path):
+    make_files(tmp_path, ["a.jpg", "b.PNG", "c.pdf", "d.xyz", "README"])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES)
+
+    assert sorted(manifest["created"]) == ["Documents", "Images"]
+    assert manifest["moved"] == {"Images": 2, "Documents": 1}
+    assert manifest["unmatched"] == {".xyz": 1}
+    assert manifest["errors"] == {}
+    assert sorted(p.name for p in (tmp_path / "Images").iterdir()) == ["a.jpg", "b.PNG"]
+    assert not (tmp_path / "Videos").exists()
+    assert (tmp_path / "d.xyz").exists() and (tmp_path / "README").exists()
+
+
+def test_existing_names_are_never_overwritten(tmp_path):
+    (tmp_path / "Images").mkdir()
+    make_files(tmp_path / "Images", ["a.jpg", "a (1).jpg"])
+    make_files(tmp_path, ["a.jpg"])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES)
+
+    assert manifest["created"] == []
+    assert manifest["renamed"] == {"a.jpg": "Images/a (2).jpg"}
+    assert (tmp_path / "Images" / "a.jpg").read_text() == "a.jpg"
+    assert (tmp_path / "Images" / "a (2).jpg").exists()
+
+
+def test_names_differing_only_in_case_are_conflicts(tmp_path):
+    (tmp_path / "Images").mkdir()
+    make_files(tmp_path / "Images", ["A.jpg"])
+    make_files(tmp_path, ["a.jpg"])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES)
+
+    assert manifest["renamed"] == {"a.jpg": "Images/a (1).jpg"}
+    assert (tmp_path / "Images" / "A.jpg").read_text() == "A.jpg"
+
+
+def test_dry_run_changes_nothing(tmp_path):
+    make_files(tmp_path, ["a.jpg", "b.mp3"])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES, dry_run=True)
+
+    assert manifest["moved"] == {"Images": 1, "Audio": 1}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.jpg", "b.mp3"]
+
+
+def test_file_in_the_way_of_a_folder(tmp_path):
+    make_files(tmp_path, ["Images", "a.jpg"])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES)
+
+    assert "Images" in manifest["errors"]
+    assert (tmp_path / "a.jpg").exists()
+
+
+def test_many_files_in_parallel_chunks(tmp_path):
+    make_files(tmp_path, [f"photo{i:04}.jpg" for i in range(1000)])
+
+    manifest = organize(str(tmp_path), FOLDER_CATEGORIES, max_workers=4)
+
+    assert manifest["moved"] == {"Images": 1000}
+    assert len(list((tmp_path / "Images").iterdir())) == 1000
+    assert [p.name for p in tmp_path.iterdir()] == ["Images"]
@@ -0,0 +1,80 @@
+"""
+gui_sequence runs headless against the recording input backend
+"""
+
+import json
+
+import pytest
+
+from src import input_backend
+from src.agent_tools import gui_sequence
+
+
+@pytest.fixture
+def backend():
+    recording = input_backend.RecordingBackend(start=(0, 0))
+    previous = input_backend.set_backend(recording)
+    yield recording
+    input_backend.set_backend(previous)
+
+
+def run(actions: list) -> str:
+    return gui_sequence.invoke({"actions": json.dumps(actions)})
+
+
+def test_runs_actions_in_order_with_one_result(backend):
+    result = run(
+        [
+            {"action": "click", "x": 640, "y": 400},
+            {"action": "type", "text": "hello", "interval": 0},
+            {"action": "key", "key": "enter"},
+            {"action": "hotkey", "keys": ["command", "s"]},
+            {"action": "wait", "seconds": 0.5, "pause": 0},
+            {"action": "move", "x": 10, "y": 10, "fast": True},
+        ]
+    )
+
+    assert result.startswith("🖱️ Ran 6 GUI actions")
+    actions = [action for _, action, _ in backend.events if action != "move_to"]
+    assert actions == ["click", "write", "press", "hotkey"]
+    assert backend.events[-1][1:] == ("move_to", (10, 10))
+    assert ("write", ("hello",)) in [event[1:] for event in backend.events]
+    assert backend.position() == (10, 10)
+
+
+def test_timing_is_exact_on_the_virtual_clock(backend):
+    run(
+        [
+            {"action": "key", "key": "tab", "pause": 0.2},
+            {"action": "wait", "seconds": 1.5, "pause": 0},
+            {"action": "type", "text": "abcd", "interval": 0.25},
+        ]
+    )
+
+    assert backend.clock == pytest.approx(0.2 + 1.5 + 4 * 0.25)
+
+
+@pytest.mark.parametrize(
+    "actions, problem",
+    [
+        ([{"action": "type", "text": "sudo shutdown -h now"}], "unsafe input blocked"),
+        ([{"action": "drag", "x": 1}], "unknown action"),
+        ([{"action": "type"}], "missing text"),
+        ([{"action": "click", "x": 5}], "both x and y"),
+        ([{"action": "wait", "seconds": "soon"}], "non-negative number"),
+        ([{"action": "wait", "seconds": 60}], "seconds must be at most 10"),
+        ([{"action": "click", "pause": 3600}], "pause must be at most 10"),
+        ([{"action": "key", "key": "down", "times": 100000}], "times must be at most 50"),
+        ([{"action": "click", "clicks": 500}], "clicks must be at most 3"),
+        ([{"action": "type", "text": "hi", "interval": 30}], "interval must be at most 1"),
+    ],
+)
+def test_nothing_runs_when_any_action_is_invalid(backend, actions, problem):
+    result = run([{"action": "key", "key": "enter"}, *actions])
+
+    assert problem in result
+    assert backend.events == []
+
+
+def test_rejects_non_json(backend):
+    assert gui_sequence.invoke({"actions": "click then type"}).startswith("❌")
@@ -0,0 +1,79 @@
+"""
+Token-budgeted history: bounded model input, verbatim recent turns, rolling summary
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
+from langgraph.graph.message import REMOVE_ALL_MESSAGES
+
+from src.history_manager import SUMMARY_ID, HistoryManager, _message_tokens
+
+SYSTEM_PROMPT = "You are a desktop assistant. Use the tools to act on the user's computer."
+
+
+def make_turn(i: int) -> list:
+    """A request, a tool call with a long listing, and the answer"""
+    listing = " ".join(f"photo_{i}_{n}.jpg" for n in range(40))
+    return [
+        HumanMessage(f"Task {i}: list the photos in folder {i}"),
+        AIMessage(
+            "",
+            tool_calls=[
+                {"name": "list_directory", "args": {"directory_path": f"~/f{i}"}, "id": f"c{i}"}
+            ],
+        ),
+        ToolMessage(listing, tool_call_id=f"c{i}"),
+        AIMessage(f"Folder {i} has 40 photos."),
+    ]
+
+
+def apply(messages: list, update: dict) -> list:
+    """What the graph's add_messages reducer does with the hook's update"""
+    if "messages" not in update:
+        return messages
+    assert update["messages"][0] == RemoveMessage(id=REMOVE_ALL_MESSAGES)
+    return list(update["messages"][1:])
+
+
+def test_input_stays_within_budget_over_many_turns():
+    hook = HistoryManager(SYSTEM_PROMPT, max_tokens=1500, keep_turns=3, summary_max_tokens=300)
+    turns = [make_turn(i) for i in range(30)]
+    messages: list = []
+
+    for n, turn in enumerate(turns):
+        # With the current one, the last keep_turns turns are sent word for word
+        finished = [
+            message for old in turns[max(0, n - hook.keep_turns + 1) : n] for message in old
+        ]
+        for message in turn:
+            messages.append(message)
+            if isinstance(message, AIMessage) and not message.tool_calls:
+                continue  # The model just answered - next call comes with the next turn
+            update = hook({"messages": messages})
+            model_input = update["llm_input_messages"]
+            assert sum(_message_tokens(m) for m in model_input) <= hook.max_tokens
+            assert all(message in model_input for message in finished)
+            messages = apply(messages, update)
+
+    update = hook({"messages": [*messages, HumanMessage("Task 30: thanks")]})
+    model_input = update["llm_input_messages"]
+
+    recent = [message for turn in turns[-(hook.keep_turns - 1) :] for message in turn]
+    assert model_input[-len(recent) - 1 : -1] == recent
+    # Older ones live on in the summary, stored once at the start of the thread
+    assert "Earlier in this conversation" in model_input[0].content
+    assert "Task 0:" not in model_input[0].content  # Trimmed to summary_max_tokens
+    first_kept = next(m.content for m in model_input if isinstance(m, HumanMessage))
+    newest_folded = int(first_kept.split(":")[0].split()[1]) - 1
+    assert f"Task {newest_folded}:" in model_input[0].content
+    # The thread was rewritten (RemoveMessage(REMOVE_ALL_MESSAGES) in apply) to match
+    assert messages[0].id == SUMMARY_ID
+    assert messages[1:] == model_input[1:-1]
+
+
+def test_short_history_is_left_alone():
+    hook = HistoryManager(SYSTEM_PROMPT, max_tokens=2000, keep_turns=3)
+
+    update = hook({"messages": make_turn(0)})
+
+    assert "messages" not in update
+    assert update["llm_input_messages"][1:] == make_turn(0)
@@ -0,0 +1,59 @@
+"""
+Fast-path grammar: which commands run a tool directly and which go to the model
+"""
+
+import pytest
+
+from src.intent_router import match
+
+
+@pytest.mark.parametrize(
+    "prompt, intent, args",
+    [
+        ("list files in Downloads", "list_directory", {"directory_path": "~/Downloads"}),
+        ("show me my desktop folder", "list_directory", {"directory_path": "~/Desktop"}),
+        ("what's in ~/projects/app", "list_directory", {"directory_path": "~/projects/app"}),
+        (
+            "Please list the contents of documents.",
+            "list_directory",
+            {"directory_path": "~/Documents"},
+        ),
+        ("where am i", "get_current_directory", {}),
+        ("which apps are running?", "check_running_apps", {}),
+        ("take a screenshot", "take_screenshot", {"save": True}),
+        ("what's the screen size", "get_screen_info", {}),
+        ("open chrome", "open_app", {"app_name": "Google Chrome"}),
+        ("launch the vs code app", "open_app", {"app_name": "Visual Studio Code"}),
+        ("go to github.com", "open_url", {"url": "https://github.com"}),
+        ("visit bbc.co.uk/news", "open_url", {"url": "https://bbc.co.uk/news"}),
+        ("open www.example.xyz", "open_url", {"url": "https://www.example.xyz"}),
+        ("open https://intranet.local/wiki", "open_url", {"url": "https://intranet.local/wiki"}),
+    ],
+)
+def test_direct_commands(prompt, intent, args):
+    matched = match(prompt)
+
+    assert matched is not None
+    assert (matched[0], matched[2]) == (intent, args)
+
+
+@pytest.mark.parametrize(
+    "prompt",
+    [
+        # File names are not websites
+        "open report.pdf",
+        "open main.py",
+        "open notes.md",
+        "go to backup.zip",
+        # Chained, qualified or referring back
+        "open chrome and go to gmail",
+        "list downloads then delete the installers",
+        "open it",
+        # Unknown folders and apps
+        "list files in my secret stash",
+        "open some random tool",
+        "",
+    ],
+)
+def test_everything_else_goes_to_the_model(prompt):
+    assert match(prompt) is None
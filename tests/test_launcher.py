@@ -0,0 +1,195 @@
+"""
+Launcher readiness detection with fake platform backends and process lists
+"""
+
+import subprocess
+import sys
+import time
+
+import pytest
+
+from src import config
+from src import launcher as launcher_module
+from src.agent_tools import open_app
+from src.launcher import Launcher, LinuxLauncher, MacLauncher
+
+
+def python(code: str) -> list:
+    return [sys.executable, "-c", code]
+
+
+class FakeBackend:
+    name = "fake"
+
+    def __init__(self, command=None, windows=None, opener=True):
+        self.command = command or python("pass")
+        self.windows = list(windows) if windows is not None else None
+        self.opener = opener
+
+    def resolve(self, app_name: str) -> dict:
+        return {"name": app_name, "command": self.command, "opener": self.opener}
+
+    def url_command(self, url: str) -> list:
+        return self.command
+
+    def window_count(self, app_name: str):
+        if self.windows is None:
+            return None
+        return self.windows.pop(0) if len(self.windows) > 1 else self.windows[0]
+
+
+class FakeProcesses:
+    """App shows up as running after `appears_after` checks (never if None)"""
+
+    def __init__(self, appears_after=None):
+        self.appears_after = appears_after
+        self.checks = 0
+
+    def is_running(self, app_name: str, max_age: float = None) -> bool:
+        self.checks += 1
+        return self.appears_after is not None and self.checks > self.appears_after
+
+
+@pytest.fixture(autouse=True)
+def fast_polling(monkeypatch):
+    monkeypatch.setattr(config, "LAUNCH_POLL_S", 0.01)
+
+
+def make(tmp_path, backend, processes) -> Launcher:
+    return Launcher(backend, processes, times_file=tmp_path / "launch_times.json")
+
+
+def test_ready_when_the_process_appears_and_latency_is_recorded(tmp_path):
+    launcher = make(tmp_path, FakeBackend(), FakeProcesses(appears_after=4))
+
+    launch = launcher.open_app("Notes").wait(5)
+
+    assert (launch.state, launch.signal) == ("ready", "process")
+    times = launcher.launch_times()["Notes"]
+    assert times["launches"] == 1 and times["last_s"] == launch.ready_s
+
+
+def test_window_beats_process_where_windows_can_be_counted(tmp_path):
+    processes = FakeProcesses(appears_after=3)
+    launcher = make(tmp_path, FakeBackend(windows=[0, 0, 1]), processes)
+
+    launch = launcher.open_app("Notes").wait(5)
+
+    assert (launch.state, launch.signal) == ("ready", "window")
+
+
+def test_process_counts_when_no_window_matches(tmp_path):
+    launcher = make(tmp_path, FakeBackend(windows=[0]), FakeProcesses(appears_after=2))
+
+    launch = launcher.open_app("Notes").wait(5)
+
+    assert (launch.state, launch.signal) == ("ready", "process")
+
+
+def test_launch_does_not_block_on_the_launch_command(tmp_path):
+    slow_app = FakeBackend(python("import time; time.sleep(5)"), opener=False)
+    launcher = make(tmp_path, slow_app, FakeProcesses(appears_after=1))
+
+    start = time.monotonic()
+    launch = launcher.open_app("Slow")
+    returned = time.monotonic() - start
+
+    assert returned < 1.0
+    assert launch.wait(5).state == "ready" and launch.ready_s < 2.0
+
+
+def test_failed_opener_reports_its_error(tmp_path):
+    failing = FakeBackend(
+        python("import sys; sys.stderr.write('Unable to find application named Nope'); sys.exit(1)")
+    )
+    launch = make(tmp_path, failing, FakeProcesses()).open_app("Nope").wait(5)
+
+    assert launch.state == "failed"
+    assert "Unable to find application" in launch.error
+
+
+def test_times_out_if_nothing_appears(tmp_path):
+    launch = make(tmp_path, FakeBackend(), FakeProcesses()).open_app("Ghost", timeout=0.2).wait(5)
+
+    assert launch.state == "timeout"
+    assert make(tmp_path, FakeBackend(), FakeProcesses()).launch_times() == {}
+
+
+def test_already_running_app_is_ready_at_once(tmp_path):
+    launch = make(tmp_path, FakeBackend(), FakeProcesses(appears_after=0)).open_app("Finder")
+
+    assert launch.done and launch.signal == "already running"
+
+
+def test_url_is_ready_once_the_opener_hands_it_over(tmp_path):
+    launch = make(tmp_path, FakeBackend(), FakeProcesses()).open_url("https://example.com").wait(5)
+
+    assert (launch.state, launch.signal) == ("ready", "opened")
+
+
+def test_mac_window_count_passes_the_name_as_an_argument(monkeypatch):
+    commands = []
+
+    def run(command, **kwargs):
+        commands.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout="2\n")
+
+    monkeypatch.setattr(launcher_module.subprocess, "run", run)
+    name = 'Finder"\ndo shell script "touch /tmp/pwned'
+
+    assert MacLauncher().window_count(name) == 2
+    [command] = commands
+    assert command[-1] == name
+    assert all(name not in arg for arg in command[:-1])
+
+
+def test_linux_backend_launches_desktop_entries(tmp_path, monkeypatch):
+    (tmp_path / "org.gnome.TextEditor.desktop").write_text(
+        "[Desktop Entry]\nType=Application\nName=Text Editor\nExec=gnome-text-editor %U\n"
+    )
+    backend = LinuxLauncher(app_dirs=[str(tmp_path)])
+
+    monkeypatch.setattr(launcher_module.shutil, "which", lambda name: None)
+    assert backend.resolve("text editor")["command"] == ["gnome-text-editor"]
+    with pytest.raises(ValueError):
+        backend.resolve("photoshop")
+
+    monkeypatch.setattr(launcher_module.shutil, "which", lambda name: f"/usr/bin/{name}")
+    with pytest.raises(ValueError):  # On PATH, but not an app
+        backend.resolve("xkill")
+    target = backend.resolve("gnome-text-editor")
+    assert target == {
+        "name": "Text Editor",
+        "command": ["gtk-launch", "org.gnome.TextEditor"],
+        "opener": True,
+    }
+
+
+def test_linux_windows_are_matched_by_wm_class(tmp_path, monkeypatch):
+    (tmp_path / "firefox.desktop").write_text(
+        "[Desktop Entry]\nType=Application\nName=Firefox Web Browser\n"
+        "Exec=/usr/lib/firefox/firefox %u\nStartupWMClass=firefox\n"
+    )
+    wmctrl = (
+        "0x03a00003  0 Navigator.firefox     laptop Mozilla Firefox\n"
+        "0x04200004  0 gnome-terminal-server.Gnome-terminal  laptop firefox - Terminal\n"
+    )
+    monkeypatch.setattr(launcher_module.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(
+        launcher_module.subprocess,
+        "run",
+        lambda command, **kwargs: subprocess.CompletedProcess(command, 0, wmctrl, ""),
+    )
+    backend = LinuxLauncher(app_dirs=[str(tmp_path)])
+
+    name = backend.resolve("firefox")["name"]
+
+    assert name == "Firefox Web Browser"
+    assert backend.window_count(name) == 1  # Not the terminal whose title says firefox
+
+
+def test_open_app_tool_reports_readiness(tmp_path, monkeypatch):
+    fake = make(tmp_path, FakeBackend(), FakeProcesses(appears_after=2))
+    monkeypatch.setattr("src.agent_tools.launcher", fake)
+
+    assert open_app.invoke({"app_name": "Calculator"}).startswith("Calculator opened (ready in")
@@ -0,0 +1,41 @@
+"""
+Offline benchmark of mouse motion modes on the recording backend
+(run `python -m src.motion` for the full table)
+"""
+
+import numpy as np
+
+from src import config, motion
+from src.input_backend import RecordingBackend
+
+
+def test_modes_beat_the_legacy_spline_motion():
+    results = motion.benchmark(moves=100)
+
+    assert results["human"]["move_s"] <= config.MOUSE_MOVE_BUDGET_S + 0.01
+    assert results["human"]["move_s"] < results["legacy"]["move_s"] / 3
+    assert results["human"]["compute_ms"] < results["legacy"]["compute_ms"]
+    assert results["fast"]["events"] == 1
+    assert results["fast"]["move_s"] < results["human"]["move_s"]
+    assert results["human"]["landed"] == results["fast"]["landed"] == 1.0
+
+
+def test_path_is_scaled_and_rotated_onto_the_move():
+    path = motion.plan_path((100, 500), (400, 100), rng=np.random.default_rng(1))
+
+    assert tuple(path[-1]) == (400, 100)
+    assert 2 <= len(path) <= config.MOUSE_MAX_STEPS
+    # Stays near the straight line between the points
+    assert path[:, 0].min() > 0 and path[:, 1].max() < 600
+
+
+def test_short_move_uses_part_of_the_budget():
+    backend = RecordingBackend(start=(0, 0))
+
+    short = motion.move(30, 40, mode="human", backend=backend)
+    clock = backend.clock
+    long = motion.move(1900, 1000, mode="human", backend=backend)
+
+    assert short["duration_s"] < long["duration_s"] <= config.MOUSE_MOVE_BUDGET_S
+    assert clock < config.MOUSE_MOVE_BUDGET_S / 2
+    assert backend.position() == (1900, 1000)
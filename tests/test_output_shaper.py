@@ -0,0 +1,47 @@
+"""
+Tool output compaction: elision notes count the original lines
+"""
+
+import re
+
+import pytest
+
+from src import config
+from src.output_shaper import shape_output
+
+
+@pytest.fixture(autouse=True)
+def small_budget(monkeypatch):
+    monkeypatch.setattr(config, "TOOL_OUTPUT_BUDGETS", {})
+    monkeypatch.setattr(config, "DEFAULT_TOOL_OUTPUT_BUDGET", 200)
+
+
+def kept_ranges(shaped: str) -> list:
+    note = shaped.splitlines()[-1]
+    return [tuple(map(int, r)) for r in re.findall(r"(\d+)-(\d+)", note.split(" of ")[0])]
+
+
+def test_ranges_refer_to_original_lines():
+    lines = [f"line {i}" for i in range(1, 11)] + ["same"] * 50 + [f"end {i}" for i in range(200)]
+    shaped = shape_output("some_tool", "\n".join(lines))
+
+    note = shaped.splitlines()[-1]
+    assert f" of {len(lines)}," in note
+    (head_start, head_end), (tail_start, tail_end) = kept_ranges(shaped)
+    assert head_start == 1 and tail_end == len(lines)
+    assert shaped.splitlines()[-2] == lines[-1]
+    elided = int(re.search(r"elided (\d+)[;)]", note).group(1))
+    assert head_end + elided + (tail_end - tail_start + 1) == len(lines)
+    assert f"[{elided} lines elided" in shaped
+
+
+def test_empty_tail_has_no_range():
+    # The last line alone (symbols cost a token each) is too big for the tail budget
+    lines = [f"line {i}" for i in range(100)] + ["!" * 5000]
+    shaped = shape_output("some_tool", "\n".join(lines))
+
+    note = shaped.splitlines()[-1]
+    assert kept_ranges(shaped)[0][0] == 1
+    assert len(kept_ranges(shaped)) == 1
+    assert "of 101," in note
+    assert "102-" not in note
@@ -0,0 +1,130 @@
+"""
+Structured plans: DAG validation, parallel execution, expected outcomes and skipped dependents
+"""
+
+import time
+
+import pytest
+
+from src.agent_tools import (
+    FOLDER_CATEGORIES,
+    execute_terminal_command,
+    list_directory,
+    organize_directory,
+)
+from src.plan_executor import build_organize_plan, run_plan, validate_plan
+
+PLAN_TOOLS = {
+    tool.name: tool for tool in [execute_terminal_command, list_directory, organize_directory]
+}
+
+
+class FakeTool:
+    def __init__(self, name: str, output: str = "✅ ok", delay: float = 0.0):
+        self.name = name
+        self.output = output
+        self.delay = delay
+        self.calls = []
+
+    def invoke(self, args: dict) -> str:
+        self.calls.append(args)
+        time.sleep(self.delay)
+        return self.output
+
+
+def step(step_id: str, depends_on: tuple = (), expect: dict = None) -> dict:
+    return {
+        "id": step_id,
+        "tool": "execute_terminal_command",
+        "args": {"command": step_id},
+        "depends_on": list(depends_on),
+        "expect": expect or {},
+    }
+
+
+@pytest.mark.parametrize(
+    "plan, problem",
+    [
+        ({"steps": []}, "no steps"),
+        ({"steps": [step("a"), step("a")]}, "unique id"),
+        ({"steps": [{**step("a"), "tool": "clear_memory"}]}, "can't run in a plan"),
+        ({"steps": [step("a", ["missing"])]}, "unknown dependencies"),
+        ({"steps": [step("a", ["b"]), step("b", ["a"]), step("c")]}, "cycle"),
+    ],
+)
+def test_invalid_plans_are_rejected(plan, problem):
+    assert problem in validate_plan(plan)
+    assert run_plan(plan, {})["status"] == "invalid"
+
+
+def test_independent_steps_run_in_parallel():
+    tool = FakeTool("execute_terminal_command", delay=0.2)
+    plan = {"steps": [step("a"), step("b"), step("c"), step("d", ["a", "b", "c"])]}
+
+    start = time.perf_counter()
+    result = run_plan(plan, {tool.name: tool}, max_workers=3)
+    elapsed = time.perf_counter() - start
+
+    assert result["status"] == "done"
+    assert [call["command"] for call in tool.calls][-1] == "d"  # Waited for its dependencies
+    assert elapsed < 0.6  # Two waves, not four sequential steps
+
+
+def test_failed_step_skips_only_its_dependents(tmp_path):
+    tool = FakeTool("execute_terminal_command")
+    plan = {
+        "steps": [
+            step("mkdir", expect={"is_dir": str(tmp_path / "never-created")}),
+            step("move", ["mkdir"]),
+            step("after-move", ["move"]),
+            step("independent"),
+        ]
+    }
+
+    result = run_plan(plan, {tool.name: tool})
+
+    statuses = {s["id"]: s["status"] for s in result["steps"]}
+    assert result["status"] == "failed"
+    assert statuses == {
+        "mkdir": "failed",
+        "move": "skipped",
+        "after-move": "skipped",
+        "independent": "ok",
+    }
+    assert "never-created is not a directory" in result["steps"][0]["detail"]
+    assert [call["command"] for call in tool.calls] == ["mkdir", "independent"]
+
+
+def test_tool_errors_fail_the_step():
+    tool = FakeTool("execute_terminal_command", output="⚠️ Command failed with exit code 1")
+
+    result = run_plan({"steps": [step("a")]}, {tool.name: tool})
+
+    assert result["steps"][0]["status"] == "failed"
+
+
+def test_organize_plan_sorts_a_folder(tmp_path):
+    for name in ["a.jpg", "B.JPG", "c.pdf", "notes.xyz"]:
+        (tmp_path / name).write_text("x")
+
+    plan = build_organize_plan(str(tmp_path), [".jpg", ".pdf", ".xyz"], FOLDER_CATEGORIES)
+    result = run_plan(plan, PLAN_TOOLS)
+
+    assert result["status"] == "done", result["steps"]
+    assert plan["unplanned"] == [".xyz"]
+    assert sorted(p.name for p in (tmp_path / "Images").iterdir()) == ["B.JPG", "a.jpg"]
+    assert [p.name for p in (tmp_path / "Documents").iterdir()] == ["c.pdf"]
+    assert (tmp_path / "notes.xyz").exists()
+
+
+def test_organize_plan_never_overwrites(tmp_path):
+    (tmp_path / "Images").mkdir()
+    (tmp_path / "Images" / "a.jpg").write_text("kept")
+    (tmp_path / "a.jpg").write_text("moved")
+
+    plan = build_organize_plan(str(tmp_path), [".jpg"], FOLDER_CATEGORIES)
+    result = run_plan(plan, PLAN_TOOLS)
+
+    assert result["status"] == "done", result["steps"]
+    assert (tmp_path / "Images" / "a.jpg").read_text() == "kept"
+    assert (tmp_path / "Images" / "a (1).jpg").read_text() == "moved"
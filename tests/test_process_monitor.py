@@ -0,0 +1,147 @@
+"""
+Running-app snapshots from fake process lists (macOS bundles and Linux desktop entries)
+"""
+
+import os
+
+import pytest
+
+from src import process_monitor
+from src.process_monitor import ProcessMonitor
+
+MAC_PROCESSES = [
+    {"pid": 10, "name": "Safari", "exe": "/Applications/Safari.app/Contents/MacOS/Safari"},
+    {
+        "pid": 11,
+        "name": "Google Chrome Helper",
+        "exe": "/Applications/Google Chrome.app/Contents/Frameworks/Google Chrome Framework"
+        ".framework/Helpers/Google Chrome Helper.app/Contents/MacOS/Google Chrome Helper",
+    },
+    {
+        "pid": 12,
+        "name": "Google Chrome",
+        "exe": "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+    },
+    {"pid": 13, "name": "launchd", "exe": "/sbin/launchd"},
+]
+
+DESKTOP_FILES = {
+    "firefox.desktop": "[Desktop Entry]\nType=Application\nName=Firefox\nName[de]=Feuerfuchs\n"
+    "Exec=env MOZ_ENABLE_WAYLAND=1 /usr/lib/firefox/firefox %u\n",
+    "code.desktop": "[Desktop Entry]\nType=Application\nName=Visual Studio Code\nExec=/usr/share/code/code --unity-launch %F\n"
+    "[Desktop Action new-empty-window]\nName=New Empty Window\nExec=/usr/share/code/code --new-window\n",
+    "htop.desktop": "[Desktop Entry]\nType=Application\nName=Htop\nExec=htop\nTerminal=true\n",
+    "hidden.desktop": "[Desktop Entry]\nType=Application\nName=Daemon\nExec=daemon\nNoDisplay=true\n",
+    "meld.desktop": "[Desktop Entry]\nType=Application\nName=Meld\nExec=python3 /usr/bin/meld %F\n",
+    "tool.desktop": "[Desktop Entry]\nType=Application\nName=Tool\nExec=java -jar /opt/tool/tool.jar\n",
+    "calc.desktop": "[Desktop Entry]\nType=Application\nName=Calculator\n"
+    "Exec=/usr/bin/flatpak run --branch=stable org.gnome.Calculator\n",
+    "studio.desktop": "[Desktop Entry]\nType=Application\nName=Studio\n"
+    "Exec=/opt/studio/bin/studio.sh\nStartupWMClass=Studio-Main\n",
+}
+
+
+@pytest.fixture
+def app_dir(tmp_path):
+    for filename, text in DESKTOP_FILES.items():
+        (tmp_path / filename).write_text(text)
+    return str(tmp_path)
+
+
+class FakeProcesses:
+    def __init__(self, processes):
+        self.processes = processes
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return [{"cmdline": [], "create_time": 100.0 + p["pid"], **p} for p in self.processes]
+
+
+def test_mac_bundles_group_helpers_under_their_app():
+    monitor = ProcessMonitor(FakeProcesses(MAC_PROCESSES), platform="darwin")
+
+    apps = monitor.apps()
+
+    assert sorted(apps) == ["Google Chrome", "Safari"]
+    assert apps["Google Chrome"] == {"pids": [11, 12], "started": 111.0}
+    assert monitor.is_running("safari.app")
+
+
+def test_linux_desktop_apps_by_exec_line(app_dir):
+    processes = [
+        {"pid": 1, "name": "firefox", "exe": "/usr/lib/firefox/firefox"},
+        {"pid": 2, "name": "code", "exe": "/usr/share/code/code"},
+        {"pid": 3, "name": "htop", "exe": "/usr/bin/htop"},
+        {"pid": 4, "name": "daemon", "exe": None},
+        {"pid": 5, "name": "bash", "exe": "/usr/bin/bash"},
+    ]
+    monitor = ProcessMonitor(FakeProcesses(processes), platform="linux", app_dirs=[app_dir])
+
+    assert sorted(monitor.apps()) == ["Firefox", "Visual Studio Code"]
+
+
+def test_interpreters_and_launchers_are_looked_through(app_dir):
+    assert process_monitor.desktop_apps([app_dir])["org.gnome.Calculator"] == "Calculator"
+    processes = [
+        {
+            "pid": 1,
+            "name": "python3",
+            "exe": "/usr/bin/python3.12",
+            "cmdline": ["python3", "-m", "src.main_agent"],
+        },
+        {
+            "pid": 2,
+            "name": "python3",
+            "exe": "/usr/bin/python3.12",
+            "cmdline": ["python3", "/usr/bin/meld"],
+        },
+        {
+            "pid": 3,
+            "name": "java",
+            "exe": "/usr/lib/jvm/bin/java",
+            "cmdline": ["java", "-jar", "/opt/tool/tool.jar"],
+        },
+        {"pid": 4, "name": "java", "exe": "/usr/lib/jvm/bin/java", "cmdline": ["java", "-version"]},
+        {"pid": 5, "name": "studio-main", "exe": "/opt/studio/jbr/bin/java", "cmdline": []},
+    ]
+    monitor = ProcessMonitor(FakeProcesses(processes), platform="linux", app_dirs=[app_dir])
+
+    assert monitor.apps() == {
+        "Meld": {"pids": [2], "started": 102.0},
+        "Tool": {"pids": [3], "started": 103.0},
+        "Studio": {"pids": [5], "started": 105.0},
+    }
+
+
+def test_snapshot_is_cached_for_the_ttl():
+    source = FakeProcesses(MAC_PROCESSES)
+    monitor = ProcessMonitor(source, platform="darwin")
+
+    monitor.apps()
+    monitor.apps()
+    assert source.calls == 1
+
+    monitor.apps(max_age=0)
+    assert source.calls == 2
+
+
+def test_changes_report_started_and_exited_apps():
+    source = FakeProcesses(MAC_PROCESSES)
+    monitor = ProcessMonitor(source, platform="darwin")
+    monitor.changes()
+
+    source.processes = [
+        MAC_PROCESSES[0],
+        {"pid": 20, "name": "Notes", "exe": "/System/Applications/Notes.app/Contents/MacOS/Notes"},
+    ]
+    changes = monitor.changes(max_age=0)
+
+    assert changes == {"started": ["Notes"], "exited": ["Google Chrome"], "running": 2}
+    assert monitor.changes(max_age=0)["started"] == []
+
+
+def test_real_snapshot_sees_this_process():
+    pids = {process["pid"] for process in process_monitor.psutil_processes()}
+
+    assert os.getpid() in pids
@@ -0,0 +1,43 @@
+"""
+Regression benchmark for the fixed per-request prompt overhead
+(compressed system prompt + tool schemas sent with every model call)
+"""
+
+import pytest
+
+from src.cost_optimizer import compress_prompt, estimate_tokens
+from src.main_agent import LOCAL_MODEL_PROMPT, SYSTEM_PROMPT, prompt_bundle
+
+# Maximum tokens of fixed overhead per request. Raise deliberately, never by accident.
+# 5000 → 6300: six new tools (organize_directory, execute_plan, gui_sequence,
+# wait_for_screen_stable, locate_on_screen, search_content) add ~1200 tokens of schemas
+# to the full bundle; cloud models are only bound the subset tool_selector picks per step
+MAX_OVERHEAD_TOKENS = {
+    "groq": 6300,
+    "gemini": 6300,
+    "ollama": 1300,
+}
+
+
+@pytest.mark.parametrize("provider", sorted(MAX_OVERHEAD_TOKENS))
+def test_prompt_overhead_within_budget(provider):
+    bundle = prompt_bundle(provider)
+
+    assert bundle["overhead_tokens"] <= MAX_OVERHEAD_TOKENS[provider], (
+        f"{provider} prompt overhead grew to {bundle['overhead_tokens']} tokens "
+        f"(budget {MAX_OVERHEAD_TOKENS[provider]}) - trim prompts/tool docstrings"
+    )
+    assert bundle["system_tokens"] <= bundle["original_system_tokens"]
+
+
+def test_bundle_is_cached_per_version():
+    assert prompt_bundle("groq") is prompt_bundle("groq")
+
+
+@pytest.mark.parametrize("prompt", [SYSTEM_PROMPT, LOCAL_MODEL_PROMPT])
+def test_compression_keeps_instructions(prompt):
+    compressed = compress_prompt(prompt)
+
+    assert estimate_tokens(compressed) <= estimate_tokens(prompt)
+    for tool_name in ["list_directory", "execute_terminal_command"]:
+        assert tool_name in compressed
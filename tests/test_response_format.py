@@ -0,0 +1,76 @@
+"""
+Compact tool responses: JSON for the model, the rich rendering for the console
+"""
+
+import json
+
+import pytest
+
+from src import config, response_format
+from src.agent_tools import debug_last_error
+from src.output_shaper import shape_tool
+from src.response_format import ToolResponse, respond
+
+
+@pytest.fixture(autouse=True)
+def mode(monkeypatch):
+    """Restore the module-level mode after each test"""
+    monkeypatch.setattr(response_format, "_mode", "rich")
+
+
+def test_rich_mode_returns_the_rich_text():
+    response_format._mode = "rich"
+
+    result = respond({"ok": True}, "✅ All good")
+
+    assert result == "✅ All good"
+    assert not isinstance(result, ToolResponse)
+
+
+def test_compact_mode_returns_json_carrying_the_rich_text():
+    response_format._mode = "compact"
+
+    result = respond({"ok": True, "files": ["ä.txt"]}, "✅ All good")
+
+    assert isinstance(result, ToolResponse)
+    assert result == '{"ok":true,"files":["ä.txt"]}'
+    assert result.console_text == "✅ All good"
+    assert json.loads(result) == {"ok": True, "files": ["ä.txt"]}
+
+
+def test_tool_response_behaves_as_a_string():
+    result = ToolResponse("{}", "rich")
+
+    assert str(result) == "{}" and result + "!" == "{}!"
+    assert getattr(result, "console_text", result) == "rich"
+
+
+def test_mode_follows_the_provider(monkeypatch):
+    monkeypatch.setattr(config, "RESPONSE_FORMAT", {"groq": "compact", "gemini": "rich"})
+
+    response_format.set_provider("groq")
+    assert response_format.get_mode() == "compact"
+
+    response_format.set_provider("gemini")
+    assert response_format.get_mode() == "rich"
+
+    response_format.set_provider("ollama")  # Not listed
+    assert response_format.get_mode() == "rich"
+
+
+def test_debug_last_error_is_valid_json_in_compact_mode():
+    response_format._mode = "compact"
+    args = {
+        "error_message": "Permission denied",
+        "command_that_failed": "mkdir ~/Desktop/Images",
+        "context": "organizing files",
+    }
+
+    message = shape_tool(debug_last_error).invoke(
+        {"type": "tool_call", "name": "debug_last_error", "args": args, "id": "1"}
+    )
+
+    data = json.loads(message.content)
+    assert data["error"] == "Permission denied"
+    assert data["strategies"] and data["next"]
+    assert message.artifact.startswith("\n🐛 ERROR DEBUGGING REPORT")  # Printed for the user
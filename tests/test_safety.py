@@ -0,0 +1,87 @@
+"""
+Safety check on a corpus of allowed and blocked commands (tests/data/safety_corpus.jsonl),
+plus the cost of checking megabyte payloads
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src import safety
+
+CORPUS = Path(__file__).parent / "data" / "safety_corpus.jsonl"
+MAX_COLD_MS_PER_MB = 500.0
+MAX_CACHED_US = 50.0
+
+
+def load_corpus() -> list:
+    with open(CORPUS) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.parametrize(
+    "case", load_corpus(), ids=lambda case: f"{case['kind']}:{case['text'][:40]}"
+)
+def test_corpus(case):
+    reason = safety.check(case["text"], case["kind"])
+    assert bool(reason) == case["blocked"], reason or "allowed"
+
+
+@pytest.mark.parametrize(
+    "command, reason",
+    [
+        ("rm  -rf ~", "rm -rf"),
+        ("rm -fr build", "rm -rf"),
+        ("sudo rm a.txt", "sudo rm"),
+        ("dd if=/dev/zero of=/dev/sda", "dd to a disk device"),
+        (":(){ :|:& };:", "fork bomb"),
+    ],
+)
+def test_reason_names_the_rule(command, reason):
+    assert safety.check(command, "command") == reason
+
+
+def test_command_lines_are_judged_by_argv_and_scanned_as_text():
+    # Quoting hides the program from the text scan, not from the argv...
+    assert not safety.is_safe("r''m -rf ~", "command")
+    assert safety.is_safe("r''m -rf ~", "text")
+    # ...and the text scan still catches what the argv split doesn't follow
+    assert not safety.is_safe("echo 'rm -rf /'", "command")
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "if true; then rm -rf ~; fi",
+        "while true; do reboot; done",
+        "find ~ -exec rm -rf {} +",
+        "watch rm -rf ~",
+        "python3 -c 'import os; os.system(\"rm -rf ~\")'",
+    ],
+)
+def test_compound_commands_are_judged_by_argv(command):
+    assert any(safety.judge_argv(argv) for argv in safety.simple_commands(command))
+
+
+def test_unknown_kind_is_rejected():
+    with pytest.raises(ValueError):
+        safety.check("ls", "sql")
+
+
+def test_megabyte_payload():
+    line = "Dear team, the information in the form should halt nothing; see format_notes.txt\n"
+    payload = line * (2**20 // len(line))
+
+    start = time.perf_counter()
+    assert safety.check(payload) == ""
+    cold_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    assert safety.check(payload) == ""
+    cached_us = (time.perf_counter() - start) * 1e6
+
+    assert safety.check(payload + "rm -rf ~\n") == "rm -rf"
+    assert cold_ms < MAX_COLD_MS_PER_MB
+    assert cached_us < MAX_CACHED_US
@@ -0,0 +1,73 @@
+"""
+Screen capture on synthetic frames (run `python -m src.screen_capture` for the full table)
+"""
+
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from src import input_backend, screen_capture
+from src.agent_tools import take_screenshot
+from src.input_backend import RecordingBackend
+
+
+@pytest.fixture
+def backend():
+    screen = screen_capture.synthetic_screen((1600, 1000))
+    recording = RecordingBackend(screen=(1600, 1000), frames=lambda clock: screen)
+    previous = input_backend.set_backend(recording)
+    yield recording
+    input_backend.set_backend(previous)
+
+
+def test_capture_downscales_and_encodes(backend):
+    frame = screen_capture.capture(max_width=800, fmt="jpeg")
+
+    assert frame["source_size"] == (1600, 1000)
+    assert frame["size"] == (800, 500)
+    assert Image.open(io.BytesIO(frame["data"])).format == "JPEG"
+
+
+def test_region_capture(backend):
+    frame = screen_capture.capture("100, 50, 400, 300", max_width=0, fmt="webp")
+
+    assert frame["region"] == (100, 50, 400, 300)
+    assert frame["size"] == (400, 300)
+    assert backend.events[-1][1:] == ("screenshot", ((100, 50, 400, 300),))
+
+
+@pytest.mark.parametrize("region", ["10,10,0,5", "a,b,c,d", "1,2,3"])
+def test_bad_regions_are_rejected(region):
+    with pytest.raises(ValueError):
+        screen_capture.parse_region(region)
+
+
+def test_buffer_keeps_the_last_frames(backend):
+    buffer = screen_capture.FrameBuffer(size=3)
+    for _ in range(5):
+        buffer.capture(max_width=200)
+
+    assert len(buffer) == 3
+    assert [frame["number"] for frame in buffer.frames()] == [3, 4, 5]
+    assert buffer.latest()["number"] == 5
+
+
+def test_tool_saves_only_on_request(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(screen_capture.config, "SCREENSHOT_DIR", str(tmp_path))
+
+    assert "Saved" not in take_screenshot.invoke({})
+    assert os.listdir(tmp_path) == []
+
+    result = take_screenshot.invoke({"save": True, "filename": "login.png"})
+    assert result.endswith(os.path.join(str(tmp_path), "login.jpg"))
+
+
+def test_compact_modes_beat_the_full_png():
+    rows = {row["mode"]: row for row in screen_capture.benchmark(rounds=1, size=(1440, 900))}
+
+    legacy = rows["legacy (full png)"]
+    for mode in ("jpeg 1280", "webp 1280"):
+        assert rows[mode]["kb"] < legacy["kb"] / 5
+        assert rows[mode]["ms"] < legacy["ms"]
@@ -0,0 +1,103 @@
+"""
+wait_for_screen_stable against a synthetic frame source on the virtual clock
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from src import input_backend, screen_capture, screen_wait
+from src.agent_tools import click_mouse, wait_for_screen_stable
+from src.input_backend import RecordingBackend
+
+SIZE = (640, 400)
+
+
+def animation(settles_at: float, region: tuple = (0, 0, 640, 400)):
+    """A bar that moves across `region` until `settles_at` seconds, then stays put"""
+    base = np.full((SIZE[1], SIZE[0]), 40, dtype=np.uint8)
+    left, top, width, height = region
+
+    def frames(clock):
+        pixels = base.copy()
+        x = left + int(min(clock, settles_at) * 400) % (width - 40)
+        pixels[top : top + height, x : x + 40] = 230
+        return Image.fromarray(pixels)
+
+    return frames
+
+
+@pytest.fixture
+def backend():
+    recording = RecordingBackend(screen=SIZE)
+    previous = input_backend.set_backend(recording)
+    yield recording
+    input_backend.set_backend(previous)
+
+
+def test_returns_soon_after_the_screen_settles(backend):
+    backend.frames = animation(settles_at=0.8)
+
+    result = screen_wait.wait_for_stable(timeout=5)
+
+    assert result["stable"] and result["changed"]
+    assert 0.8 + 0.3 <= result["waited_s"] <= 0.8 + 0.3 + 0.2
+
+
+def test_samples_go_through_the_frame_buffer(backend):
+    start = screen_capture.frame_buffer.latest()
+    start_number = start["number"] if start else 0
+
+    result = screen_wait.wait_for_stable(timeout=5)
+
+    latest = screen_capture.frame_buffer.latest()
+    assert latest["number"] - start_number == result["samples"]
+    assert (
+        latest["format"] == "png"
+        and latest["size"][0] <= screen_wait.config.SCREEN_STABLE_SAMPLE_WIDTH
+    )
+
+
+def test_still_screen_needs_only_the_stable_window(backend):
+    result = screen_wait.wait_for_stable(timeout=5)
+
+    assert result["stable"] and not result["changed"]
+    assert result["waited_s"] == pytest.approx(0.3, abs=0.11)
+
+
+def test_times_out_while_the_screen_keeps_changing(backend):
+    backend.frames = animation(settles_at=99)
+
+    result = screen_wait.wait_for_stable(timeout=1.0)
+
+    assert not result["stable"]
+    assert result["waited_s"] == pytest.approx(1.0, abs=0.11)
+
+
+def test_changes_outside_the_region_are_ignored(backend):
+    backend.frames = animation(settles_at=99, region=(0, 0, 640, 100))
+
+    result = screen_wait.wait_for_stable(region="0,200,640,200", timeout=5)
+
+    assert result["stable"] and result["waited_s"] < 0.5
+
+
+def test_require_change_waits_for_the_change_to_start(backend):
+    still = animation(settles_at=0)
+    moving = animation(settles_at=1.5)
+    backend.frames = lambda clock: still(clock) if clock < 0.6 else moving(clock)
+
+    result = screen_wait.wait_for_stable(require_change=True, timeout=5)
+
+    assert result["stable"] and result["changed"]
+    assert result["waited_s"] >= 1.5 + 0.3
+
+
+def test_tools_wait_for_the_screen_only_when_asked(backend):
+    backend.frames = animation(settles_at=0.5)
+
+    start = backend.now()
+    assert "settled" not in click_mouse.invoke({})
+    assert backend.now() - start <= 0.3
+    assert "settled after" in click_mouse.invoke({"wait": True})
+    assert wait_for_screen_stable.invoke({"timeout": 2}).startswith("⏳ Screen stable")
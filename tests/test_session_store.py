@@ -0,0 +1,134 @@
+"""
+Named sessions on a SQLite checkpointer: records, retention, and resuming after a restart
+"""
+
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from src import session_store
+from src.session_store import STATUS_DONE, STATUS_RUNNING, SessionStore
+
+
+class State(TypedDict):
+    log: Annotated[list, operator.add]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """time.time() that only moves when the test says so"""
+    now = [1_000_000.0]
+    monkeypatch.setattr(session_store.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def db(tmp_path):
+    return tmp_path / "sessions.db"
+
+
+def build(store: SessionStore, tool_calls: list, crash: bool = False):
+    """Two-step graph: a tool call with a side effect, then the answer (which can crash)"""
+
+    def tool(state: State) -> dict:
+        tool_calls.append(len(state["log"]))
+        return {"log": ["tool"]}
+
+    def answer(state: State) -> dict:
+        if crash:
+            raise KeyboardInterrupt  # The process dies before the model answers
+        return {"log": ["answer"]}
+
+    graph = StateGraph(State)
+    graph.add_node("tool", tool)
+    graph.add_node("answer", answer)
+    graph.add_edge(START, "tool")
+    graph.add_edge("tool", "answer")
+    graph.add_edge("answer", END)
+    return graph.compile(checkpointer=store.checkpointer)
+
+
+def thread(session_id: str) -> dict:
+    return {"configurable": {"thread_id": session_id}}
+
+
+def test_touch_and_list_sessions(db, clock):
+    store = SessionStore(db)
+    store.touch("a", prompt="organize the desktop", status=STATUS_RUNNING)
+    clock[0] += 10
+    store.touch("b")
+    clock[0] += 10
+    store.touch("a", status=STATUS_DONE)  # Keeps the prompt
+
+    sessions = store.list_sessions()
+
+    assert [s["session_id"] for s in sessions] == ["a", "b"]
+    assert sessions[0] == {
+        "session_id": "a",
+        "created_at": 1_000_000.0,
+        "updated_at": 1_000_020.0,
+        "last_prompt": "organize the desktop",
+        "status": STATUS_DONE,
+        "checkpoints": 0,
+    }
+    assert store.get("missing") is None
+
+
+def test_delete_removes_the_session_and_its_checkpoints(db):
+    store = SessionStore(db)
+    store.touch("a")
+    build(store, []).invoke({"log": []}, thread("a"))
+    assert store.get("a")["checkpoints"] > 0
+
+    assert store.delete("a") is True
+    assert store.delete("a") is False
+    assert store.list_sessions() == []
+    assert store.checkpointer.get_tuple(thread("a")) is None
+
+
+def test_prune_keeps_the_newest_checkpoints(db):
+    store = SessionStore(db)
+    store.touch("a")
+    graph = build(store, [])
+    for _ in range(4):
+        graph.invoke({"log": []}, thread("a"))
+    before = store.get("a")["checkpoints"]
+
+    deleted = store.prune("a", keep=2)
+
+    assert deleted == before - 2
+    assert store.get("a")["checkpoints"] == 2
+    assert graph.get_state(thread("a")).values["log"][-1] == "answer"  # Latest state intact
+    assert store.prune("a", keep=2) == 0
+
+
+def test_prune_expired_deletes_only_old_sessions(db, clock):
+    store = SessionStore(db)
+    store.touch("old")
+    clock[0] += 40 * 86400
+    store.touch("recent")
+
+    assert store.prune_expired(max_age_days=30) == ["old"]
+    assert [s["session_id"] for s in store.list_sessions()] == ["recent"]
+
+
+def test_interrupted_task_resumes_after_restart_without_repeating_tool_calls(db):
+    tool_calls: list = []
+    store = SessionStore(db)
+    store.touch("a", prompt="organize the desktop", status=STATUS_RUNNING)
+    with pytest.raises(KeyboardInterrupt):
+        build(store, tool_calls, crash=True).invoke({"log": []}, thread("a"))
+    store.conn.close()
+
+    # A new process: fresh connection to the same file
+    restarted = SessionStore(db)
+    graph = build(restarted, tool_calls)
+    assert restarted.get("a")["status"] == STATUS_RUNNING
+    assert graph.get_state(thread("a")).next == ("answer",)
+
+    result = graph.invoke(None, thread("a"))
+
+    assert result["log"] == ["tool", "answer"]
+    assert tool_calls == [0]  # The tool ran once, before the crash
@@ -0,0 +1,97 @@
+"""
+Loop detection: cached read-only repeats, unproductive streaks and the pre-model guard
+"""
+
+import pytest
+from langchain_core.tools import StructuredTool
+
+from src.step_monitor import CACHED_NOTE, LoopDetectedError, StepMonitor
+
+
+def make_tool(name: str, calls: list, output=None):
+    def run(path: str = ""):
+        calls.append((name, path))
+        text = output(len(calls)) if callable(output) else (output or f"{name} {path}")
+        return text, text
+
+    return StructuredTool.from_function(
+        func=run, name=name, description=name, response_format="content_and_artifact"
+    )
+
+
+def invoke(tool, **args):
+    message = tool.invoke({"type": "tool_call", "name": tool.name, "args": args, "id": "1"})
+    return message.content
+
+
+@pytest.fixture
+def monitor():
+    return StepMonitor(max_repeats=3)
+
+
+def test_read_only_repeat_is_served_from_cache(monitor):
+    calls = []
+    listing = monitor.wrap_tool(make_tool("list_directory", calls))
+
+    first = invoke(listing, path="~/Desktop")
+    second = invoke(listing, path="~/Desktop")
+
+    assert len(calls) == 1
+    assert second.startswith(CACHED_NOTE.format(name="list_directory"))
+    assert second.endswith(first)
+    assert monitor.summary()["cache_hits"] == 1
+
+
+def test_a_change_invalidates_the_cache(monitor):
+    calls = []
+    listing = monitor.wrap_tool(make_tool("list_directory", calls))
+    command = monitor.wrap_tool(make_tool("execute_terminal_command", calls, "✅ done"))
+
+    invoke(listing, path="~/Desktop")
+    invoke(command, path="mkdir x")
+    invoke(listing, path="~/Desktop")
+
+    assert [name for name, _ in calls] == [
+        "list_directory",
+        "execute_terminal_command",
+        "list_directory",
+    ]
+
+
+def test_a_failed_change_keeps_the_cache(monitor):
+    calls = []
+    listing = monitor.wrap_tool(make_tool("list_directory", calls))
+    command = monitor.wrap_tool(make_tool("execute_terminal_command", calls, "❌ failed"))
+
+    invoke(listing, path="~/Desktop")
+    invoke(command, path="mkdir /root")
+    invoke(listing, path="~/Desktop")
+
+    assert len(calls) == 2
+
+
+def test_unproductive_repeats_stop_the_next_model_call(monitor):
+    command = monitor.wrap_tool(make_tool("execute_terminal_command", [], "⚠️ exit code 1"))
+    guarded = monitor.guard(lambda state: state)
+
+    invoke(command, path="mv a b")
+    for _ in range(3):
+        assert guarded({}) == {}
+        invoke(command, path="mv a b")
+
+    with pytest.raises(LoopDetectedError) as stopped:
+        guarded({})
+    assert stopped.value.tool_name == "execute_terminal_command"
+    assert monitor.summary(recursion_limit=50)["loops_stopped"] == 1
+
+
+def test_new_results_reset_the_streak(monitor):
+    # Same call, different result each time (e.g. a polling command) - that's progress
+    command = monitor.wrap_tool(make_tool("execute_terminal_command", [], lambda n: f"✅ {n}"))
+    guarded = monitor.guard(lambda state: state)
+
+    for _ in range(6):
+        invoke(command, path="ls")
+        guarded({})
+
+    assert monitor.summary()["repeats"] == 0
@@ -0,0 +1,96 @@
+"""
+Evaluation of the learned task-complexity classifier on the held-out labelled set
+(tests/data/task_tiers.jsonl; run `python -m src.task_classifier` for the full report)
+"""
+
+import time
+
+import pytest
+
+from src import task_classifier
+from src.cost_optimizer import detect_task_complexity
+
+MIN_ACCURACY = 0.85
+MAX_LATENCY_MS = 1.0
+MAX_TRAIN_S = 2.0
+
+# Unseen phrasings the keyword rules get wrong ("show" → small) or that only look simple
+KEYWORD_TRAPS = [
+    ("show me why the backup keeps failing", "large"),
+    ("show me what went wrong with the backup", "large"),
+    ("copy every PDF to the Documents folder", "medium"),
+    ("list files in Pictures", "small"),
+]
+
+
+@pytest.fixture(autouse=True)
+def seed_only(tmp_path, monkeypatch):
+    """Train on the seed examples only, never on the user's outcome log"""
+    monkeypatch.setattr(task_classifier, "TASK_LOG_FILE", tmp_path / "outcomes.jsonl")
+    task_classifier._classifier["model"] = None
+    yield
+    task_classifier._classifier["model"] = None
+
+
+def test_accuracy_and_latency_on_labelled_set():
+    results = task_classifier.evaluate(task_classifier.load_labelled(task_classifier.EVAL_FILE))
+
+    assert results["accuracy"] >= MIN_ACCURACY
+    assert results["routed_accuracy"] >= results["keyword_accuracy"]
+    assert results["latency_ms"] < MAX_LATENCY_MS
+
+
+def test_held_out_tasks_are_not_seed_examples():
+    seeds = {task.lower() for task, _ in task_classifier.SEED_TASKS}
+    held_out = task_classifier.load_labelled(task_classifier.EVAL_FILE) + KEYWORD_TRAPS
+
+    assert not [task for task, _ in held_out if task.lower() in seeds]
+
+
+@pytest.mark.parametrize("task, tier", KEYWORD_TRAPS)
+def test_routes_keyword_traps(task, tier):
+    assert detect_task_complexity(task) == tier
+
+
+def test_low_confidence_falls_back_to_keywords():
+    assert task_classifier.classify("") == ("medium", 0.0)
+    assert detect_task_complexity("") == "medium"
+
+
+def test_logged_outcomes_become_training_labels():
+    task_classifier.log_outcome("list files", "small", True, model_calls=2)
+    task_classifier.log_outcome("sync photos", "medium", True, model_calls=6)
+    task_classifier.log_outcome("fix the build", "small", False, model_calls=4)
+    task_classifier.log_outcome("fix the build", "medium", True, model_calls=2)
+    task_classifier.log_outcome("impossible", "large", False, model_calls=9)
+
+    assert task_classifier.load_outcomes() == [
+        ("list files", "small"),
+        ("sync photos", "medium"),
+        ("fix the build", "medium"),
+        ("fix the build", "medium"),  # A quick success on medium isn't a small task
+    ]
+
+
+def test_outcomes_update_the_model_without_retraining():
+    model = task_classifier._get_model()
+    task = "defragment the spreadsheet archive"
+    before = task_classifier.classify(task)
+
+    for _ in range(3):
+        task_classifier.log_outcome(task, "medium", False, model_calls=8)
+
+    assert task_classifier._classifier["model"] is model
+    tier, confidence = task_classifier.classify(task)
+    assert tier == "large"
+    assert (tier, confidence) != before
+
+
+def test_training_on_a_full_outcome_log_is_fast():
+    examples = (task_classifier.SEED_TASKS * 30)[:2000]
+
+    start = time.perf_counter()
+    task_classifier.train(examples)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < MAX_TRAIN_S
@@ -0,0 +1,81 @@
+"""
+Text entry (typing vs. clipboard paste, hotkey chords) on the recording backend
+(run `python -m src.text_entry` for the full table)
+"""
+
+import pytest
+
+from src import input_backend, text_entry
+from src.agent_tools import press_key, type_text
+from src.input_backend import RecordingBackend
+
+
+@pytest.fixture
+def backend():
+    recording = RecordingBackend()
+    previous = input_backend.set_backend(recording)
+    yield recording
+    input_backend.set_backend(previous)
+
+
+def test_short_text_is_typed(backend):
+    result = text_entry.enter_text("hello", backend=backend)
+
+    assert result["method"] == "type"
+    assert [event[1:] for event in backend.events] == [("write", ("hello",))]
+
+
+def test_long_text_is_pasted_and_the_clipboard_restored(backend):
+    backend.clipboard = "user's clipboard"
+    text = "x" * 500
+
+    result = text_entry.enter_text(text, backend=backend)
+
+    assert result["method"] == "paste"
+    assert backend.count("write") == 0
+    assert ("hotkey", (text_entry.PASTE_MODIFIER, "v")) in [event[1:] for event in backend.events]
+    assert backend.clipboard == "user's clipboard"
+
+
+def test_non_ascii_text_is_pasted(backend):
+    assert text_entry.enter_text("café ☕", backend=backend)["method"] == "paste"
+
+
+def test_ascii_text_falls_back_to_typing_without_a_clipboard(backend, monkeypatch):
+    def no_clipboard(text):
+        raise RuntimeError("no copy/paste mechanism")
+
+    monkeypatch.setattr(backend, "set_clipboard", no_clipboard)
+
+    result = text_entry.enter_text("y" * 100, backend=backend)
+
+    assert result["method"] == "type"
+    assert backend.count("write") == 1
+
+
+@pytest.mark.parametrize(
+    "keys, chord",
+    [
+        ("cmd+shift+4", ["command", "shift", "4"]),
+        ("Ctrl + C", ["ctrl", "c"]),
+        ("Return", ["enter"]),
+        ("cmd++", ["command", "+"]),
+        ("A", ["A"]),
+    ],
+)
+def test_parse_chord(keys, chord):
+    assert text_entry.parse_chord(keys) == chord
+
+
+def test_tools_use_text_entry(backend):
+    assert press_key.invoke({"key": "cmd+shift+4"}).startswith("⌨️ Pressed 'command+shift+4'")
+    assert type_text.invoke({"text": "z" * 100}).startswith("⌨️ Pasted")
+
+    assert backend.events[0][1:] == ("hotkey", ("command", "shift", "4"))
+
+
+def test_paste_beats_typing_long_text():
+    rows = {(row["chars"], row["method"]): row for row in text_entry.benchmark()}
+
+    assert rows[(10, "auto (type)")]["seconds"] <= rows[(10, "legacy")]["seconds"]
+    assert rows[(2000, "auto (paste)")]["chars_per_s"] > 100 * rows[(2000, "legacy")]["chars_per_s"]
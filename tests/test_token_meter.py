@@ -0,0 +1,93 @@
+"""
+Token accounting: provider usage, local estimates, daily totals on disk
+"""
+
+import json
+import uuid
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, LLMResult
+
+from src import cost_optimizer, token_meter
+from src.token_meter import UsageMeter
+
+
+@pytest.fixture(autouse=True)
+def usage_file(tmp_path, monkeypatch):
+    path = tmp_path / "usage.json"
+    monkeypatch.setattr(token_meter, "USAGE_FILE", path)
+    monkeypatch.setattr(token_meter, "_today", lambda: "2026-01-01")
+    return path
+
+
+def result(message: AIMessage, llm_output=None) -> LLMResult:
+    return LLMResult(generations=[[ChatGeneration(message=message)]], llm_output=llm_output)
+
+
+def call(meter: UsageMeter, response: LLMResult, prompt: str = "list my files"):
+    run_id = uuid.uuid4()
+    meter.on_chat_model_start({}, [[HumanMessage(prompt)]], run_id=run_id, metadata={})
+    meter.on_llm_end(response, run_id=run_id)
+    return meter.calls[-1]
+
+
+@pytest.fixture
+def meter():
+    meter = UsageMeter()
+    meter.start_task("list my files", "groq", "llama-3.1-8b-instant")
+    return meter
+
+
+def test_usage_metadata_is_preferred(meter):
+    usage = {"input_tokens": 812, "output_tokens": 40, "total_tokens": 852}
+    message = AIMessage("done", usage_metadata=usage)
+
+    recorded = call(meter, result(message, {"token_usage": {"prompt_tokens": 1}}))
+
+    assert (recorded["input_tokens"], recorded["output_tokens"]) == (812, 40)
+    assert not recorded["estimated"]
+
+
+def test_token_usage_in_llm_output_is_the_fallback(meter):
+    token_usage = {"prompt_tokens": 300, "completion_tokens": 25}
+
+    recorded = call(meter, result(AIMessage("done"), {"token_usage": token_usage}))
+
+    assert (recorded["input_tokens"], recorded["output_tokens"]) == (300, 25)
+    assert not recorded["estimated"]
+
+
+def test_local_estimate_when_the_provider_reports_nothing(meter):
+    prompt = "Organize the Desktop by file type please"
+    reply = "I moved 12 images into Images."
+
+    recorded = call(meter, result(AIMessage(reply)), prompt)
+
+    assert recorded["estimated"]
+    assert recorded["input_tokens"] == cost_optimizer.estimate_tokens(prompt) + 4
+    assert recorded["output_tokens"] == cost_optimizer.estimate_tokens(reply)
+    assert meter.task_summary()["estimated_calls"] == 1
+
+
+def test_daily_totals_persist_and_roll_over(meter, usage_file, monkeypatch):
+    message = AIMessage(
+        "ok", usage_metadata={"input_tokens": 100, "output_tokens": 10, "total_tokens": 110}
+    )
+    call(meter, result(message))
+    call(meter, result(AIMessage("ok")))  # Estimated
+
+    saved = json.loads(usage_file.read_text())["2026-01-01"]["groq"]
+    assert saved["input_tokens"] > 100 and saved["requests"] == 2
+    assert saved["estimated_requests"] == 1
+
+    monkeypatch.setattr(token_meter, "_today", lambda: "2026-01-02")
+    call(meter, result(message))
+
+    assert token_meter.get_daily_usage()["groq"] == {
+        "input_tokens": 100,
+        "output_tokens": 10,
+        "requests": 1,
+        "estimated_requests": 0,
+    }
+    assert token_meter.get_daily_usage("2026-01-01")["groq"] == saved
@@ -0,0 +1,46 @@
+"""
+Recovery rate of tool calls written as text, on recorded local-model outputs
+(tests/data/local_model_outputs.jsonl; run `python -m src.tool_call_recovery` for the full report)
+"""
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from src import tool_call_recovery
+from src.main_agent import local_tools
+
+MIN_RECOVERY_RATE = 0.9
+MAX_LATENCY_MS = 1.0
+
+
+def test_recovery_rate_on_recorded_outputs():
+    results = tool_call_recovery.evaluate(
+        tool_call_recovery.load_corpus(tool_call_recovery.CORPUS_FILE), local_tools
+    )
+
+    assert results["recovery_rate"] >= MIN_RECOVERY_RATE
+    assert results["false_positives"] == 0
+    assert results["latency_ms"] < MAX_LATENCY_MS
+
+
+def test_hook_attaches_calls_to_the_same_message():
+    hook = tool_call_recovery.ToolCallRecovery(local_tools)
+    message = AIMessage("execute_terminal_command('mkdir ~/Desktop/Images')", id="ai-1")
+
+    update = hook({"messages": [HumanMessage("make an Images folder"), message]})
+
+    [recovered] = update["messages"]
+    assert recovered.id == "ai-1"
+    assert [(call["name"], call["args"]) for call in recovered.tool_calls] == [
+        ("execute_terminal_command", {"command": "mkdir ~/Desktop/Images"})
+    ]
+    assert (hook.text_answers, hook.recovered) == (1, 1)
+
+
+def test_hook_leaves_real_tool_calls_and_answers_alone():
+    hook = tool_call_recovery.ToolCallRecovery(local_tools)
+    called = AIMessage(
+        "", tool_calls=[{"name": "list_directory", "args": {"directory_path": "~"}, "id": "c1"}]
+    )
+
+    assert hook({"messages": [called]}) == {}
+    assert hook({"messages": [AIMessage("All files are organized.")]}) == {}
@@ -0,0 +1,43 @@
+"""
+Per-step tool subsets chosen from the user request
+"""
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from src.tool_selector import TOOL_INTENTS, select_tool_names
+
+ALL_TOOLS = set().union(*(tools for _, tools in TOOL_INTENTS.values())) | {
+    "list_directory",
+    "execute_terminal_command",
+}
+PLANNING = TOOL_INTENTS["planning"][1]
+
+
+def selected(request: str) -> set:
+    return select_tool_names([HumanMessage(request)], ALL_TOOLS)
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    [
+        "open safari and then go to github",
+        "list all files on my desktop",
+        "read every txt file in downloads",
+        "take a screenshot and click the button",
+    ],
+)
+def test_common_words_dont_bind_planning_tools(request_text):
+    assert not selected(request_text) & PLANNING
+
+
+@pytest.mark.parametrize(
+    "request_text",
+    ["organize my desktop", "plan a cleanup of downloads", "verify the files moved"],
+)
+def test_planning_requests_bind_planning_tools(request_text):
+    assert PLANNING.issubset(selected(request_text))
+
+
+def test_unrecognized_request_binds_everything():
+    assert selected("hmm") == ALL_TOOLS
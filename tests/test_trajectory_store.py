@@ -0,0 +1,155 @@
+"""
+Recording verified tool-call sequences and replaying them on another folder
+"""
+
+import pytest
+
+from src import trajectory_store
+from src.trajectory_store import TrajectoryStore, confined
+
+LISTING = "📄 a.jpg (.jpg, 10 bytes)\n📄 b.jpg (.jpg, 12 bytes)\n📊 File types found: 2 .jpg"
+PASSED = "🔍 VERIFICATION REPORT:\n✅ VERIFICATION PASSED\n   Expected conditions met!"
+FAILED = "🔍 VERIFICATION REPORT:\n❌ VERIFICATION FAILED\n   Expected conditions NOT met!"
+INCONCLUSIVE = "🔍 VERIFICATION REPORT:\n⚠️  VERIFICATION INCONCLUSIVE"
+
+
+class FakeTool:
+    def __init__(self, name: str, output: str, calls: list):
+        self.name = name
+        self.output = output
+        self.calls = calls
+
+    def invoke(self, args: dict) -> str:
+        self.calls.append((self.name, args))
+        return self.output
+
+
+@pytest.fixture(autouse=True)
+def trajectory_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(trajectory_store, "TRAJECTORY_FILE", tmp_path / "trajectories.json")
+
+
+@pytest.fixture
+def folders(tmp_path):
+    recorded, other = tmp_path / "desk", tmp_path / "downloads"
+    recorded.mkdir()
+    other.mkdir()
+    return str(recorded), str(other)
+
+
+def steps_for(directory: str, command: str = "", verify_output: str = PASSED) -> list:
+    command = command or f"mkdir -p {directory}/Images && mv {directory}/*.jpg {directory}/Images/"
+    return [
+        {"name": "list_directory", "args": {"directory_path": directory}, "output": LISTING},
+        {"name": "execute_terminal_command", "args": {"command": command}, "output": "✅ ok"},
+        {
+            "name": "verify_expectations",
+            "args": {
+                "what_to_verify": "jpgs moved",
+                "checks": "none *.jpg",
+                "directory": directory,
+            },
+            "output": verify_output,
+        },
+    ]
+
+
+def fake_tools(calls: list, verify_output: str = PASSED) -> list:
+    return [
+        FakeTool("list_directory", LISTING, calls),
+        FakeTool("execute_terminal_command", "✅ ok", calls),
+        FakeTool("verify_expectations", verify_output, calls),
+    ]
+
+
+def test_replays_on_another_folder(folders):
+    recorded, other = folders
+    store = TrajectoryStore()
+    assert store.record(f"organize {recorded} by file type", steps_for(recorded))
+
+    calls = []
+    replay = store.replay(f"organize {other} by file type", fake_tools(calls))
+
+    assert replay["completed"], replay["reason"]
+    assert [name for name, _ in calls] == [
+        "list_directory",
+        "execute_terminal_command",
+        "verify_expectations",
+    ]
+    command = calls[1][1]["command"]
+    assert command == f"mkdir -p {other}/Images && mv {other}/*.jpg {other}/Images/"
+    assert calls[2][1]["directory"] == other
+
+
+@pytest.mark.parametrize("verify_output", [FAILED, INCONCLUSIVE])
+def test_only_a_passing_verification_counts(folders, verify_output):
+    recorded, _ = folders
+    steps = steps_for(recorded, verify_output=verify_output)
+
+    assert not TrajectoryStore().record(f"organize {recorded} by file type", steps)
+
+
+def test_a_listing_is_not_a_verification(folders):
+    recorded, _ = folders
+    steps = steps_for(recorded)[:2] + [
+        {"name": "list_directory", "args": {"directory_path": recorded}, "output": LISTING}
+    ]
+
+    assert not TrajectoryStore().record(f"organize {recorded} by file type", steps)
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "mv {dir}/*.jpg ~/Pictures/",  # Moves files out of the task's folder
+        "mkdir Images && mv *.jpg Images",  # Relative to wherever the agent runs
+        "rm -rf {dir}/../other",
+    ],
+)
+def test_changes_outside_the_folder_are_not_recorded(folders, command):
+    recorded, _ = folders
+    steps = steps_for(recorded, command=command.format(dir=recorded))
+
+    assert not TrajectoryStore().record(f"organize {recorded} by file type", steps)
+
+
+def test_replay_checks_the_target_folder(folders, tmp_path):
+    recorded, _ = folders
+    store = TrajectoryStore()
+    store.record(f"organize {recorded} by file type", steps_for(recorded))
+
+    calls = []
+    replay = store.replay(f"organize {tmp_path}/missing by file type", fake_tools(calls))
+
+    assert not replay["completed"]
+    assert "not a folder" in replay["reason"]
+    assert calls == []
+
+
+def test_replay_hands_off_when_verification_fails(folders):
+    recorded, other = folders
+    store = TrajectoryStore()
+    store.record(f"organize {recorded} by file type", steps_for(recorded))
+
+    replay = store.replay(f"organize {other} by file type", fake_tools([], FAILED))
+
+    assert not replay["completed"]
+
+
+@pytest.mark.parametrize(
+    "command, inside",
+    [
+        ("mkdir -p /data/desk/Images", True),
+        ("cd /data/desk && mv *.jpg Images/", True),
+        ("mv /data/desk/*.jpg /data/desk/Images/", True),
+        ("mv /data/desk/*.jpg /data/Images/", False),
+        ("mv /data/desk/../*.jpg /data/desk/Images/", False),
+        ("cd /data/desk && mv ../*.jpg Images/", False),
+        ("mv *.jpg Images", False),
+        ("ls -la", False),
+    ],
+)
+def test_confined(command, inside):
+    step = {"name": "execute_terminal_command", "args": {"command": command}}
+
+    assert confined(step, "/data/desk") == inside
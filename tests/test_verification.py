@@ -0,0 +1,96 @@
+"""
+Shallow "before" snapshots, diffs limited to what they cover, and declarative checks
+"""
+
+import pytest
+
+from src import verification
+
+
+@pytest.fixture(autouse=True)
+def fresh_task():
+    verification.reset()
+    yield
+    verification.reset()
+
+
+@pytest.fixture
+def desk(tmp_path):
+    for name in ["a.jpg", "b.jpg", "c.pdf"]:
+        (tmp_path / name).write_text(name)
+    old = tmp_path / "Old"
+    old.mkdir()
+    (old / "x.jpg").write_text("x")
+    deep = tmp_path / "Projects"
+    for i in range(50):
+        folder = deep / f"p{i}" / "src"
+        folder.mkdir(parents=True)
+        (folder / "main.py").write_text("")
+    return tmp_path
+
+
+def test_remember_lists_only_the_folder_itself(desk):
+    verification.remember(str(desk))
+
+    before = verification.baseline(str(desk))
+    assert set(before["entries"]) == {"a.jpg", "b.jpg", "c.pdf", "Old", "Projects"}
+    assert before["scanned"] == {""}
+
+
+def test_moves_into_a_new_folder_are_diffed(desk):
+    verification.remember(str(desk))
+    (desk / "Images").mkdir()
+    for name in ["a.jpg", "b.jpg"]:
+        (desk / name).rename(desk / "Images" / name)
+
+    report = verification.verify(
+        str(desk), ["removed *.jpg == 2", "added *.jpg in Images == 2", "none *.jpg"]
+    )
+
+    assert report["result"] == "passed", report["results"]
+    assert report["changes"]["added"] == ["Images", "Images/a.jpg", "Images/b.jpg"]
+
+
+def test_unlisted_subfolders_are_not_reported_as_added(desk):
+    verification.remember(str(desk))
+
+    before = verification.baseline(str(desk))
+    report = verification.verify(str(desk), ["added *.jpg in Old == 0"])
+
+    # Old's contents weren't snapshotted beforehand, so nothing there counts as added...
+    assert verification.diff(before, verification.snapshot(str(desk)))["added"] == []
+    # ...and a check about Old's changes can't be decided
+    assert report["result"] == "inconclusive"
+
+
+def test_listing_a_subfolder_adds_it_to_the_baseline(desk):
+    verification.remember(str(desk))
+    verification.remember(str(desk / "Old"))
+    (desk / "Old" / "y.jpg").write_text("y")
+
+    report = verification.verify(str(desk), ["added *.jpg in Old == 1", "count *.jpg in Old == 2"])
+
+    assert report["result"] == "passed", report["results"]
+
+
+def test_no_baseline_means_change_checks_are_inconclusive(desk):
+    report = verification.verify(str(desk), ["added *.jpg == 1"])
+
+    assert report["result"] == "inconclusive"
+    assert report["changes"] == {}
+
+
+@pytest.mark.parametrize(
+    "check, ok",
+    [
+        ("count *.jpg == 2", True),
+        ("count *.JPG >= 3", False),
+        ("any *.pdf", True),
+        ("none *.pdf", False),
+        ("count **/main.py == 50", False),  # Deeper than VERIFY_MAX_DEPTH
+        ("exists Old/x.jpg", True),
+        ("missing Images", True),
+    ],
+)
+def test_checks(desk, check, ok):
+    assert verification.verify(str(desk), [check])["results"][0]["ok"] == ok